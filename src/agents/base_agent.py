@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
 class Agent(ABC):
@@ -18,6 +18,7 @@ class Agent(ABC):
         self.name = name
         self.tools: Dict[str, Any] = tools
         self.memory = memory
+        self._pending_memories: List[Tuple[str, str, Any]] = []
 
     @abstractmethod
     def perceive(self, input_data: Any) -> Any:
@@ -61,13 +62,29 @@ class Agent(ABC):
 
     def remember(self, step: str, result: Any) -> Any:
         """
-        Persist the outcome of an action to memory.
+        Queue the outcome of an action for persistence to memory.
+
+        Records are buffered and written together by flush_memories(), so a
+        run costs one transaction instead of one per step.
 
         :param step: The action that was executed.
         :param result: The result of the action.
         """
         if self.memory:
-            self.memory.store(self.name, step, result)
+            self._pending_memories.append((self.name, step, result))
+
+    def flush_memories(self) -> None:
+        """
+        Persist all buffered memories in a single batch.
+        """
+        if not self._pending_memories:
+            return
+        records, self._pending_memories = self._pending_memories, []
+        if hasattr(self.memory, "store_many"):
+            self.memory.store_many(records)
+        else:
+            for agent_id, step, content in records:
+                self.memory.store(agent_id, step, content)
 
     def achieve_goal(self, input_data: Any) -> None:
         """
@@ -79,8 +96,11 @@ class Agent(ABC):
         plan_steps = self.plan(observation)
         context: Dict[str, Any] = {"observation": observation}
 
-        for step in plan_steps:
-            result = self.act(step, context)
-            self.remember(step, result)
-            # context = {**context, step: result} TODO: think(self, context: Dict[…]) should return an updated context
-            context = self.think(result)
+        try:
+            for step in plan_steps:
+                result = self.act(step, context)
+                self.remember(step, result)
+                # context = {**context, step: result} TODO: think(self, context: Dict[…]) should return an updated context
+                context = self.think(result)
+        finally:
+            self.flush_memories()
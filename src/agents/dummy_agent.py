@@ -1,17 +1,31 @@
-from typing import Dict, List, Any
+import os
+from typing import Dict, Sequence, Any
 from src.config.logger import logger
 
 from src.agents.base_agent import Agent
 
+# Fixed plan and result format shared by every DummyAgent
+_DUMMY_PLAN = ("dummy_step1", "dummy_step2", "dummy_step3")
+_DUMMY_RESULT_FMT = "result_of_%s"
+
 
 class DummyAgent(Agent):
     """
     A simple agent for testing purposes.
     It returns a fixed plan and logs each action it "executes."
+
+    Set the DUMMY_AGENT_PRINT environment variable to also print each
+    executed action to stdout. With ``no_log=True`` the agent does no logging
+    or printing at all, so it can serve as an empty baseline when measuring
+    the orchestrator's own overhead.
     """
 
     def __init__(
-        self, name: str = "DummyAgent", tools: Dict[str, Any] = None, memory: Any = None
+        self,
+        name: str = "DummyAgent",
+        tools: Dict[str, Any] = None,
+        memory: Any = None,
+        no_log: bool = False,
     ) -> None:
         """
         Initialize the DummyAgent.
@@ -19,33 +33,46 @@ class DummyAgent(Agent):
         :param name: Unique identifier for the agent (defaults to "DummyAgent").
         :param tools: Optional tools mapping (ignored here).
         :param memory: Optional memory store (ignored here).
+        :param no_log: Skip all logging and printing.
         """
         super().__init__(name=name, tools=tools or {}, memory=memory)
+        self._noop = no_log
+        self.print_actions = not no_log and bool(os.environ.get("DUMMY_AGENT_PRINT"))
 
     def perceive(self, input_data: Any) -> Any:
         """
         Simply returns the raw input data.
         """
-        logger.info(f"{self.name} perceived input: {input_data}")
+        if self._noop:
+            return input_data
+        logger.info("{} perceived input: {}", self.name, input_data)
         return input_data
 
-    def plan(self, observation: Any) -> List[str]:
+    def plan(self, observation: Any) -> Sequence[str]:
         """
         Returns a dummy list of steps regardless of observation.
         """
-        logger.info(f"{self.name} planning based on observation: {observation}")
-        return ["dummy_step1", "dummy_step2", "dummy_step3"]
+        if self._noop:
+            return _DUMMY_PLAN
+        logger.info("{} planning based on observation: {}", self.name, observation)
+        return list(_DUMMY_PLAN)
 
     def act(self, action: str, context: Dict[str, Any]) -> Any:
         """
-        Logs and prints the action name, returns a dummy result string.
+        Logs (and optionally prints) the action name, returns a dummy result
+        string.
 
         :param action: The name of the action to "execute".
         :param context: The current context dict (observation + past results).
         :return: A string indicating a dummy result.
         """
-        logger.info(f"{self.name} executing action: {action} with context: {context}")
-        result = f"result_of_{action}"
-        logger.info(f"{self.name} executed action: {action} -> {result}")
-        print(f"{self.name} executed action: {action} -> {result}")
+        if self._noop:
+            return _DUMMY_RESULT_FMT % action
+        logger.info(
+            "{} executing action: {} with context: {}", self.name, action, context
+        )
+        result = _DUMMY_RESULT_FMT % action
+        logger.info("{} executed action: {} -> {}", self.name, action, result)
+        if self.print_actions:
+            print(f"{self.name} executed action: {action} -> {result}")
         return result
@@ -1,11 +1,76 @@
+from dataclasses import asdict, dataclass, fields
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
 from src.chains.analysis_chain import AnalysisChain
 from src.config.logger import logger
 from src.config.settings import LangChainSettings
-from src.llm.surveillance_llm import create_surveillance_llm
+from src.llm.surveillance_llm import SurveillanceLLM, get_shared_surveillance_llm
+from src.memory.enrich_cache import EnrichmentCache
 from src.memory.store import MemoryStore
+from src.tools.io_tools import resolve_path
+
+# Outputs copied from the chain result into the response when present
+_OPTIONAL_RESULT_KEYS: FrozenSet[str] = frozenset(
+    {
+        "heatmap_path",
+        "hotspots_path",
+        "stats",
+        "pie_chart_path",
+        "zone_sensitivity_chart",
+        "sensitivity_reasons_chart",
+        "hotspots_chart",
+    }
+)
+
+# Every key of a successful analyze() response, in order; outputs that were
+# not produced are None
+_RESPONSE_KEYS: Tuple[str, ...] = (
+    "success",
+    "path",
+    "element_count",
+    "cache_hit",
+    "enriched_path",
+    "geojson_path",
+    "heatmap_path",
+    "hotspots_path",
+    "stats",
+    "pie_chart_path",
+    "zone_sensitivity_chart",
+    "sensitivity_reasons_chart",
+    "hotspots_chart",
+    "visualization_errors",
+    "partial_success",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AnalyzeOptions:
+    """Visualization options for a single analyze() call."""
+
+    generate_geojson: bool = True
+    generate_heatmap: bool = False
+    generate_hotspots: bool = False
+    compute_stats: bool = True
+    generate_chart: bool = False
+    plot_zone_sensitivity: bool = False
+    plot_sensitivity_reasons: bool = False
+    plot_hotspots: bool = False
+
+    @classmethod
+    def from_input(cls, input_data: Dict[str, Any]) -> "AnalyzeOptions":
+        """
+        Pick the visualization options out of an analyze() input dict.
+
+        :param input_data: The analyze() input
+        :return: Options with defaults for anything not given
+        """
+        return cls(**{k: input_data.get(k, d) for k, d in _OPTION_DEFAULTS.items()})
+
+
+# Visualization options accepted by analyze() and their defaults
+_OPTION_DEFAULTS: Dict[str, bool] = {f.name: f.default for f in fields(AnalyzeOptions)}
 
 
 class SurveillanceAnalyzerAgent:
@@ -44,17 +109,39 @@ class SurveillanceAnalyzerAgent:
         self.memory = memory
         self.settings = settings or LangChainSettings()
 
-        # Create LLM for enrichment
-        self.llm = create_surveillance_llm(self.settings)
+        # The LLM and chain are built on first use (see the properties below)
+        logger.info("Initialized {} with LangChain analysis pipeline", self.name)
+
+    @cached_property
+    def llm(self) -> SurveillanceLLM:
+        """
+        The process-wide LLM for this agent's settings, fetched on first use.
+
+        :return: Shared SurveillanceLLM instance
+        """
+        return get_shared_surveillance_llm(self.settings)
 
-        # Create analysis chain
-        self.chain = AnalysisChain(
+    @cached_property
+    def chain(self) -> AnalysisChain:
+        """
+        The analysis chain, built on first use.
+
+        :return: Configured AnalysisChain
+        """
+        chain = AnalysisChain(
             llm=self.llm,
-            memory=memory,
-            agent_name=name,
+            memory=self.memory,
+            agent_name=self.name,
+            concurrency=self.settings.enrich_concurrency,
+            batch_size=self.settings.enrich_batch_size,
+            enrich_cache=(
+                EnrichmentCache(self.memory.engine)
+                if isinstance(self.memory, MemoryStore)
+                else None
+            ),
         )
-
-        logger.info(f"Initialized {self.name} with LangChain analysis pipeline")
+        logger.debug("Built analysis chain for {}", self.name)
+        return chain
 
     def analyze(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -73,76 +160,112 @@ class SurveillanceAnalyzerAgent:
         :return: Dictionary with analysis results and output paths
         """
         # Extract path and validate
-        path = Path(input_data["path"]).expanduser().resolve()
-        if not path.exists():
-            error_msg = f"File not found: {path}"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "path": str(path),
-            }
+        path, error = self._check_input(input_data)
+        if error is not None:
+            return error
 
-        logger.info(f"Starting analysis for {path.name}")
-
-        # Extract visualization options
-        options = {
-            "generate_geojson": input_data.get("generate_geojson", True),
-            "generate_heatmap": input_data.get("generate_heatmap", False),
-            "generate_hotspots": input_data.get("generate_hotspots", False),
-            "compute_stats": input_data.get("compute_stats", True),
-            "generate_chart": input_data.get("generate_chart", False),
-            "plot_zone_sensitivity": input_data.get("plot_zone_sensitivity", False),
-            "plot_sensitivity_reasons": input_data.get(
-                "plot_sensitivity_reasons", False
-            ),
-            "plot_hotspots": input_data.get("plot_hotspots", False),
+        logger.info("Starting analysis for {}", path.name)
+
+        # Run core pipeline (Load → Enrich → Save → GeoJSON)
+        result = self.chain.invoke({"path": str(path)})
+        return self._finish(path, AnalyzeOptions.from_input(input_data), result)
+
+    def analyze_batch(
+        self, inputs: List[Dict[str, Any]], max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several surveillance data files, running their pipelines
+        concurrently.
+
+        Each input takes the same parameters as analyze(). Missing files
+        produce error results without stopping the rest of the batch;
+        visualizations are still generated per file.
+
+        :param inputs: List of analyze() input dictionaries
+        :param max_concurrency: Maximum number of pipelines run at once
+        :return: Analysis results, in input order
+        """
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+        pending: List[Tuple[int, Path]] = []
+        for i, input_data in enumerate(inputs):
+            path, error = self._check_input(input_data)
+            if error is not None:
+                responses[i] = error
+            else:
+                pending.append((i, path))
+
+        logger.info("Starting batch analysis of {} files", len(pending))
+
+        results = self.chain.batch(
+            [{"path": str(path)} for _, path in pending],
+            max_concurrency=max_concurrency,
+        )
+        for (i, path), result in zip(pending, results):
+            options = AnalyzeOptions.from_input(inputs[i])
+            responses[i] = self._finish(path, options, result)
+        return responses
+
+    @staticmethod
+    def _check_input(
+        input_data: Dict[str, Any],
+    ) -> Tuple[Path, Optional[Dict[str, Any]]]:
+        """
+        Resolve the input path and check that the file exists.
+
+        :param input_data: The analyze() input
+        :return: (resolved path, error response or None if the file exists)
+        """
+        path = resolve_path(input_data["path"])
+        if path.exists():
+            return path, None
+
+        error_msg = f"File not found: {path}"
+        logger.error(error_msg)
+        return path, {
+            "success": False,
+            "error": error_msg,
+            "path": str(path),
         }
 
-        try:
-            # Run core pipeline (Load → Enrich → Save → GeoJSON)
-            result = self.chain.invoke({"path": str(path)})
+    def _finish(
+        self, path: Path, options: AnalyzeOptions, result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generate the requested visualizations for a pipeline result and build
+        the analyze() response.
 
-            if not result.get("success", True):
-                return result
+        :param path: Resolved input path
+        :param options: Visualization options
+        :param result: Result of the core pipeline
+        :return: Dictionary with analysis results and output paths
+        """
+        if not result.get("success", True):
+            return result
 
+        try:
             # Generate requested visualizations with error recovery
-            result = self.chain.generate_visualizations(result, options)
+            result = self.chain.generate_visualizations(result, asdict(options))
 
-            # Build response
-            response = {
-                "success": True,
-                "path": str(path),
-                "element_count": result.get("element_count", 0),
-                "cache_hit": result.get("cache_hit", False),
-                "enriched_path": result.get("enriched_path"),
-                "geojson_path": result.get("geojson_path"),
-            }
+            # Build response on a fixed set of keys
+            response = dict.fromkeys(_RESPONSE_KEYS)
+            response["success"] = True
+            response["path"] = str(path)
+            response["element_count"] = result.get("element_count", 0)
+            response["cache_hit"] = result.get("cache_hit", False)
+            response["enriched_path"] = result.get("enriched_path")
+            response["geojson_path"] = result.get("geojson_path")
 
             # Add optional outputs
-            if "heatmap_path" in result:
-                response["heatmap_path"] = result["heatmap_path"]
-            if "hotspots_path" in result:
-                response["hotspots_path"] = result["hotspots_path"]
-            if "stats" in result:
-                response["stats"] = result["stats"]
-            if "pie_chart_path" in result:
-                response["pie_chart_path"] = result["pie_chart_path"]
-            if "zone_sensitivity_chart" in result:
-                response["zone_sensitivity_chart"] = result["zone_sensitivity_chart"]
-            if "sensitivity_reasons_chart" in result:
-                response["sensitivity_reasons_chart"] = result[
-                    "sensitivity_reasons_chart"
-                ]
-            if "hotspots_chart" in result:
-                response["hotspots_chart"] = result["hotspots_chart"]
+            response.update(
+                (k, result[k]) for k in _OPTIONAL_RESULT_KEYS & result.keys()
+            )
 
             # Add visualization errors if any
             if "visualization_errors" in result:
                 response["visualization_errors"] = result["visualization_errors"]
                 response["partial_success"] = True
 
-            logger.info(f"Analysis completed for {path.name}")
+            logger.info("Analysis completed for {}", path.name)
             return response
 
         except Exception as e:
@@ -189,8 +312,8 @@ def create_analyzer_agent(
             memory = MemoryStore(db_url=db_settings.url)
 
         agent = SurveillanceAnalyzerAgent(name, memory, settings)
-        logger.info(f"Created SurveillanceAnalyzerAgent: {name}")
+        logger.info("Created SurveillanceAnalyzerAgent: {}", name)
         return agent
     except Exception as e:
-        logger.error(f"Failed to create SurveillanceAnalyzerAgent: {e}")
+        logger.error("Failed to create SurveillanceAnalyzerAgent: {}", e)
         raise
@@ -1,19 +1,26 @@
 """Route Finder Agent for computing low-surveillance walking routes."""
 
-import hashlib
-import json
+import os
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import xxhash
 
 from src.agents.base_agent import Agent
 from src.config.logger import logger
 from src.config.models.route_models import RouteMetrics, RouteRequest, RouteResult
 from src.config.settings import RouteSettings
 from src.memory.store import MemoryStore
+from src.tools.io_tools import city_slug
 from src.tools.routing_tools import (
+    CameraArrays,
+    build_camera_index,
     build_pedestrian_graph,
     build_route_geojson,
-    compute_exposure_for_path,
+    compute_exposure_for_paths,
     generate_candidate_paths,
     load_camera_points,
     render_route_map,
@@ -22,6 +29,88 @@ from src.tools.routing_tools import (
 
 Tool = Callable[..., Any]
 
+# Numeric part of a route cache key: start/end coordinates, max_candidates
+# and buffer_radius_m
+_ROUTE_KEY_STRUCT = struct.Struct("<ddddqd")
+
+
+def route_cache_key(request: RouteRequest, settings: RouteSettings) -> str:
+    """
+    Derive the cache key (and route id) for a route request.
+
+    The hash is fed the encoded city and country followed by the packed
+    numeric parameters, so no float-to-string formatting is involved.
+
+    :param request: The route request.
+    :param settings: Route computation settings that affect the result.
+    :return: 16-char hex digest of the request parameters.
+    """
+    blob = b"\0".join(
+        (
+            request.city.encode(),
+            (request.country or "").encode(),
+            _ROUTE_KEY_STRUCT.pack(
+                request.start_lat,
+                request.start_lon,
+                request.end_lat,
+                request.end_lon,
+                settings.max_candidates,
+                settings.buffer_radius_m,
+            ),
+        )
+    )
+    return xxhash.xxh3_64_hexdigest(blob)
+
+
+@dataclass(slots=True)
+class RouteContext:
+    """
+    State of one route request, filled in by perceive() and the actions.
+
+    Fields after cached_result start empty and are set by the action that
+    produces them.
+    """
+
+    city: str
+    country: Optional[str]
+    start_lat: float
+    start_lon: float
+    end_lat: float
+    end_lon: float
+    cameras_geojson_path: Path
+    route_geojson_path: Path
+    route_map_path: Path
+    cache_key: str
+    cache_hit: bool = False
+    cached_result: Optional[Dict[str, Any]] = None
+    cameras: Optional[List[Tuple[float, float]]] = None
+    camera_index: Optional[CameraArrays] = None
+    graph: Any = None
+    start_node: Optional[int] = None
+    end_node: Optional[int] = None
+    candidate_paths: Optional[List[List[int]]] = None
+    baseline_metrics: Optional[RouteMetrics] = None
+    best_path: Optional[List[int]] = None
+    best_metrics: Optional[RouteMetrics] = None
+
+
+# Number of cache-hit route results kept in process per agent
+_ROUTE_RESULT_CACHE_SIZE = 128
+
+
+def _both_mtimes(a: Path, b: Path) -> Optional[Tuple[float, float]]:
+    """
+    Stat two files once each, stopping at the first missing file.
+
+    :param a: First path.
+    :param b: Second path.
+    :return: The (a, b) modification times, or None if either file is missing.
+    """
+    try:
+        return os.stat(a).st_mtime, os.stat(b).st_mtime
+    except FileNotFoundError:
+        return None
+
 
 class RouteFinderAgent(Agent):
     """
@@ -58,31 +147,82 @@ class RouteFinderAgent(Agent):
             "snap_start": snap_to_graph,
             "snap_end": snap_to_graph,
             "generate_paths": generate_candidate_paths,
-            "compute_exposure": compute_exposure_for_path,
+            "compute_exposure_batch": compute_exposure_for_paths,
             "build_geojson": build_route_geojson,
             "render_map": render_route_map,
         }
         super().__init__(name=name, tools=tools or default_tools, memory=memory)
         self.settings = settings
+        # Camera points and their arrays by GeoJSON path, with the
+        # file's mtime so an updated file is reloaded
+        self._camera_index_cache: Dict[str, Tuple[float, Any, Any]] = {}
+        # Pedestrian graphs by (city, country, network_type); the tool keeps
+        # its own on-disk cache, this avoids reloading it on every request
+        self._graph_cache: Dict[Tuple[str, Optional[str], str], Any] = {}
+        # Recent cache-hit results by cache key, with the mtimes of their
+        # files; least recently used first
+        self._route_result_cache: OrderedDict[
+            str, Tuple[Tuple[float, float], Dict[str, Any]]
+        ] = OrderedDict()
+
+    def _cached_route_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached route whose output files still exist.
+
+        Results are kept in process after the first hit and reused while the
+        files' mtimes are unchanged, so repeated requests skip the memory
+        lookup and the metrics parsing.
 
-    def perceive(self, input_data: RouteRequest) -> Dict[str, Any]:
+        :param cache_key: Route cache key.
+        :return: Cached route paths and metrics, or None on a miss.
+        """
+        recent = self._route_result_cache.get(cache_key)
+        if recent is not None:
+            mtimes, cached_result = recent
+            if (
+                _both_mtimes(
+                    cached_result["route_geojson_path"], cached_result["route_map_path"]
+                )
+                == mtimes
+            ):
+                self._route_result_cache.move_to_end(cache_key)
+                logger.debug(f"Cache hit for route request: {cache_key}")
+                return cached_result
+            del self._route_result_cache[cache_key]
+
+        entry = self.memory.get_cache(self.name, "route_cache", cache_key)
+        if entry is None:
+            return None
+        cached_geojson = Path(entry["route_geojson_path"])
+        cached_map = Path(entry["route_map_path"])
+        # Verify files still exist
+        mtimes = _both_mtimes(cached_geojson, cached_map)
+        if mtimes is None:
+            return None
+
+        cached_result = {
+            "route_geojson_path": cached_geojson,
+            "route_map_path": cached_map,
+            "metrics": RouteMetrics(**entry["metrics"]),
+        }
+        self._route_result_cache[cache_key] = (mtimes, cached_result)
+        if len(self._route_result_cache) > _ROUTE_RESULT_CACHE_SIZE:
+            self._route_result_cache.popitem(last=False)
+        logger.debug(f"Cache hit for route request: {cache_key}")
+        return cached_result
+
+    def perceive(self, input_data: RouteRequest) -> RouteContext:
         """
         Process route request and check for cached results.
 
         :param input_data: RouteRequest with city, coordinates, and optional data path.
-        :return: Enriched observation with cache status and file paths.
+        :return: Route context with cache status and file paths.
         """
         # Create cache key from request parameters
-        cache_key_input = (
-            f"{input_data.city}_{input_data.country}_"
-            f"{input_data.start_lat}_{input_data.start_lon}_"
-            f"{input_data.end_lat}_{input_data.end_lon}_"
-            f"{self.settings.max_candidates}_{self.settings.buffer_radius_m}"
-        )
-        cache_key = hashlib.sha256(cache_key_input.encode()).hexdigest()[:16]
+        cache_key = route_cache_key(input_data, self.settings)
 
-        # Always derive city_slug for output paths
-        city_slug = input_data.city.lower().replace(" ", "_")
+        # Always derive the city slug for output paths
+        slug = city_slug(input_data.city)
 
         # Determine data path
         if input_data.data_path:
@@ -90,11 +230,11 @@ class RouteFinderAgent(Agent):
         else:
             # Use default pipeline output location
             cameras_geojson_path = (
-                Path("overpass_data") / city_slug / f"{city_slug}_enriched.geojson"
+                Path("overpass_data") / slug / f"{slug}_enriched.geojson"
             )
 
         # Setup output paths
-        output_dir = Path("overpass_data") / city_slug / "routes"
+        output_dir = Path("overpass_data") / slug / "routes"
         route_geojson_path = output_dir / f"route_{cache_key}.geojson"
         route_map_path = output_dir / f"route_{cache_key}.html"
 
@@ -103,49 +243,34 @@ class RouteFinderAgent(Agent):
         cached_result = None
 
         if self.memory:
-            for mem in self.memory.load(self.name):
-                if mem.step == "route_cache" and mem.content.startswith(cache_key):
-                    # Parse cached content: cache_key|route_geojson|route_map|metrics_json
-                    parts = mem.content.split("|", 3)
-                    if len(parts) == 4:
-                        _, cached_geojson, cached_map, metrics_json = parts
-
-                        # Verify files still exist
-                        if Path(cached_geojson).exists() and Path(cached_map).exists():
-                            cache_hit = True
-                            cached_result = {
-                                "route_geojson_path": Path(cached_geojson),
-                                "route_map_path": Path(cached_map),
-                                "metrics": RouteMetrics(**json.loads(metrics_json)),
-                            }
-                            logger.debug(f"Cache hit for route request: {cache_key}")
-                            break
-
-        observation = {
-            "city": input_data.city,
-            "country": input_data.country,
-            "start_lat": input_data.start_lat,
-            "start_lon": input_data.start_lon,
-            "end_lat": input_data.end_lat,
-            "end_lon": input_data.end_lon,
-            "cameras_geojson_path": cameras_geojson_path,
-            "route_geojson_path": route_geojson_path,
-            "route_map_path": route_map_path,
-            "cache_key": cache_key,
-            "cache_hit": cache_hit,
-            "cached_result": cached_result,
-        }
+            cached_result = self._cached_route_result(cache_key)
+            cache_hit = cached_result is not None
+
+        observation = RouteContext(
+            city=input_data.city,
+            country=input_data.country,
+            start_lat=input_data.start_lat,
+            start_lon=input_data.start_lon,
+            end_lat=input_data.end_lat,
+            end_lon=input_data.end_lon,
+            cameras_geojson_path=cameras_geojson_path,
+            route_geojson_path=route_geojson_path,
+            route_map_path=route_map_path,
+            cache_key=cache_key,
+            cache_hit=cache_hit,
+            cached_result=cached_result,
+        )
 
         return observation
 
-    def plan(self, observation: Dict[str, Any]) -> List[str]:
+    def plan(self, observation: RouteContext) -> List[str]:
         """
         Determine action sequence based on cache status.
 
         :param observation: Output from perceive().
         :return: List of action names to execute.
         """
-        if observation["cache_hit"]:
+        if observation.cache_hit:
             # Skip computation, just return cached result
             return []
 
@@ -161,7 +286,7 @@ class RouteFinderAgent(Agent):
             "render_map",
         ]
 
-    def act(self, action: str, context: Dict[str, Any]) -> Any:
+    def act(self, action: str, context: RouteContext) -> Any:
         """
         Execute a routing action using the appropriate tool.
 
@@ -171,83 +296,101 @@ class RouteFinderAgent(Agent):
         :raises ValueError: If action is not recognized.
         """
         if action == "load_cameras":
-            cameras_path = context["cameras_geojson_path"]
-            cameras = self.tools["load_cameras"](cameras_path)
-            context["cameras"] = cameras
+            cameras_path = context.cameras_geojson_path
+            try:
+                mtime = Path(cameras_path).stat().st_mtime
+            except OSError:
+                mtime = None
+            cached = self._camera_index_cache.get(str(cameras_path))
+            if cached is not None and mtime is not None and cached[0] == mtime:
+                _, cameras, camera_index = cached
+                logger.debug(f"Reusing {len(cameras)} cameras from {cameras_path}")
+            else:
+                cameras = self.tools["load_cameras"](cameras_path)
+                camera_index = build_camera_index(cameras)
+                if mtime is not None:
+                    self._camera_index_cache[str(cameras_path)] = (
+                        mtime,
+                        cameras,
+                        camera_index,
+                    )
+            context.cameras = cameras
+            context.camera_index = camera_index
             return cameras
 
         elif action == "build_graph":
-            graph = self.tools["build_graph"](
-                context["city"],
-                context["country"],
-                self.settings,
+            graph_key = (
+                context.city,
+                context.country,
+                self.settings.network_type,
             )
-            context["graph"] = graph
+            graph = self._graph_cache.get(graph_key)
+            if graph is None:
+                graph = self.tools["build_graph"](
+                    context.city,
+                    context.country,
+                    self.settings,
+                )
+                self._graph_cache[graph_key] = graph
+            else:
+                logger.debug(f"Reusing pedestrian graph for {context.city}")
+            context.graph = graph
             return graph
 
         elif action == "snap_start":
             start_node = self.tools["snap_start"](
-                context["graph"],
-                context["start_lat"],
-                context["start_lon"],
+                context.graph,
+                context.start_lat,
+                context.start_lon,
                 self.settings,
             )
-            context["start_node"] = start_node
+            context.start_node = start_node
             return start_node
 
         elif action == "snap_end":
             end_node = self.tools["snap_end"](
-                context["graph"],
-                context["end_lat"],
-                context["end_lon"],
+                context.graph,
+                context.end_lat,
+                context.end_lon,
                 self.settings,
             )
-            context["end_node"] = end_node
+            context.end_node = end_node
             return end_node
 
         elif action == "generate_paths":
             candidate_paths = self.tools["generate_paths"](
-                context["graph"],
-                context["start_node"],
-                context["end_node"],
+                context.graph,
+                context.start_node,
+                context.end_node,
                 self.settings.max_candidates,
             )
-            context["candidate_paths"] = candidate_paths
+            context.candidate_paths = candidate_paths
             logger.info(f"Generated {len(candidate_paths)} candidate paths")
             return candidate_paths
 
         elif action == "score_paths":
-            # Score all candidate paths and select the best one
-            # Performance optimization: Build camera GeoDataFrame once
-            import geopandas as gpd
-            from shapely.geometry import Point
-
-            cameras = context["cameras"]
-            if len(cameras) > 0:
-                camera_gdf = gpd.GeoDataFrame(
-                    geometry=[Point(lon, lat) for lat, lon in cameras],
-                    crs="EPSG:4326",
-                )
-                logger.debug(f"Built spatial index for {len(cameras)} cameras")
-            else:
-                camera_gdf = None
-
-            scored_paths = []
-
-            for i, path in enumerate(context["candidate_paths"]):
-                metrics = self.tools["compute_exposure"](
-                    context["graph"],
-                    path,
-                    context["cameras"],
-                    self.settings,
-                    camera_gdf,  # Reuse pre-built GeoDataFrame
-                )
+            # Score all candidate paths and select the best one, reusing the
+            # camera index built when the cameras were loaded
+            camera_index = context.camera_index
+            if camera_index is None:
+                camera_index = build_camera_index(context.cameras)
+
+            candidate_paths = context.candidate_paths
+
+            # Score every candidate in one call sharing the camera arrays
+            metrics_list = self.tools["compute_exposure_batch"](
+                context.graph,
+                candidate_paths,
+                context.cameras,
+                self.settings,
+                camera_index,
+            )
 
-                # Compute baseline for comparison (only for first path)
-                if i == 0:
-                    context["baseline_metrics"] = metrics
+            # The first (shortest) path is the baseline for comparison
+            context.baseline_metrics = metrics_list[0]
 
-                scored_paths.append((path, metrics))
+            scored_paths = list(zip(candidate_paths, metrics_list))
+            for i, metrics in enumerate(metrics_list):
                 logger.debug(
                     f"Path {i + 1}: length={metrics.length_m:.1f}m, "
                     f"exposure={metrics.exposure_score:.2f} cameras/km"
@@ -259,13 +402,13 @@ class RouteFinderAgent(Agent):
             )
 
             # Enrich best metrics with baseline comparison
-            best_metrics.baseline_length_m = context["baseline_metrics"].length_m
-            best_metrics.baseline_exposure_score = context[
-                "baseline_metrics"
-            ].exposure_score
+            best_metrics.baseline_length_m = context.baseline_metrics.length_m
+            best_metrics.baseline_exposure_score = (
+                context.baseline_metrics.exposure_score
+            )
 
-            context["best_path"] = best_path
-            context["best_metrics"] = best_metrics
+            context.best_path = best_path
+            context.best_metrics = best_metrics
 
             logger.info(
                 f"Selected route: {best_metrics.length_m:.1f}m, "
@@ -277,37 +420,37 @@ class RouteFinderAgent(Agent):
 
         elif action == "build_geojson":
             geojson_path = self.tools["build_geojson"](
-                context["graph"],
-                context["best_path"],
-                context["best_metrics"],
-                context["cameras"],
-                context["city"],
-                context["route_geojson_path"],
+                context.graph,
+                context.best_path,
+                context.best_metrics,
+                context.cameras,
+                context.city,
+                context.route_geojson_path,
                 self.settings,
             )
             return geojson_path
 
         elif action == "render_map":
             map_path = self.tools["render_map"](
-                context["route_geojson_path"],
-                context["cameras_geojson_path"],
-                context["route_map_path"],
+                context.route_geojson_path,
+                context.cameras_geojson_path,
+                context.route_map_path,
             )
             return map_path
 
         else:
             raise ValueError(f"Unknown action: {action}")
 
-    def think(self, intermediate: Any) -> Dict[str, Any]:
+    def think(self, intermediate: Any) -> Any:
         """
         Update context between actions.
 
         :param intermediate: Result from the last action.
-        :return: Updated context dict.
+        :return: Updated context.
         """
-        # The context dict is being mutated in act(), so we just return it
+        # The RouteContext is being mutated in act(), so we just return it
         # This follows the pattern where context accumulates results
-        if isinstance(intermediate, dict):
+        if isinstance(intermediate, (RouteContext, dict)):
             return intermediate
         return {"result": intermediate}
 
@@ -321,14 +464,14 @@ class RouteFinderAgent(Agent):
         observation = self.perceive(input_data)
 
         # Check for cache hit
-        if observation["cache_hit"]:
-            cached = observation["cached_result"]
+        if observation.cache_hit:
+            cached = observation.cached_result
             return RouteResult(
-                route_id=observation["cache_key"],
+                route_id=observation.cache_key,
                 city=input_data.city,
                 route_geojson_path=cached["route_geojson_path"],
                 route_map_path=cached["route_map_path"],
-                metrics=cached["metrics"],
+                metrics=cached["metrics"].model_copy(),
                 from_cache=True,
             )
 
@@ -343,21 +486,23 @@ class RouteFinderAgent(Agent):
 
         # Cache the result
         if self.memory:
-            metrics_json = context["best_metrics"].model_dump_json()
-            cache_content = (
-                f"{context['cache_key']}|"
-                f"{context['route_geojson_path']}|"
-                f"{context['route_map_path']}|"
-                f"{metrics_json}"
+            self.memory.put_cache(
+                self.name,
+                "route_cache",
+                context.cache_key,
+                {
+                    "route_geojson_path": str(context.route_geojson_path),
+                    "route_map_path": str(context.route_map_path),
+                    "metrics": context.best_metrics.model_dump(mode="json"),
+                },
             )
-            self.memory.store(self.name, "route_cache", cache_content)
 
         # Build final result
         return RouteResult(
-            route_id=context["cache_key"],
+            route_id=context.cache_key,
             city=input_data.city,
-            route_geojson_path=context["route_geojson_path"],
-            route_map_path=context["route_map_path"],
-            metrics=context["best_metrics"],
+            route_geojson_path=context.route_geojson_path,
+            route_map_path=context.route_map_path,
+            metrics=context.best_metrics,
             from_cache=False,
         )
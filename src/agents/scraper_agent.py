@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import tempfile
+from datetime import timedelta
+
+import orjson
 from pathlib import Path
 from typing import Dict, List, Any, Callable
 from src.agents.base_agent import Agent
 from src.config.logger import logger
-from src.utils.db import summarize, query_hash, payload_hash
-from src.utils.overpass import build_query, run_query
-from src.tools.io_tools import save_overpass_dump
+from src.utils.db import summarize, query_hash, file_hash
+from src.utils.overpass import build_query, run_query, stream_query_to_file
+from src.tools.io_tools import city_slug, save_overpass_dump
 from src.memory.store import MemoryStore
 
 Tool = Callable[..., Any]
 
+# How long a query known to match nothing is answered without a round-trip;
+# new cameras get mapped, so the marker has to expire
+EMPTY_RESULT_TTL = timedelta(days=7)
+
 
 class ScraperAgent(Agent):
     """
@@ -30,6 +38,7 @@ class ScraperAgent(Agent):
         default_tools: Dict[str, Tool] = {
             "run_query": run_query,
             "save_json": save_overpass_dump,
+            "stream_query": stream_query_to_file,
         }
         super().__init__(name=name, tools=tools or default_tools, memory=memory)
 
@@ -44,7 +53,7 @@ class ScraperAgent(Agent):
         country = input_data.get("country")  # new, optional
         query = build_query(city, country=country)
         base = Path(input_data.get("overpass_dir", "overpass_data"))
-        city_dir = base / city.lower().replace(" ", "_")
+        city_dir = base / city_slug(city)
         city_dir.mkdir(parents=True, exist_ok=True)
 
         return {"city": city, "country": country, "query": query, "city_dir": city_dir}
@@ -57,6 +66,116 @@ class ScraperAgent(Agent):
         """
         return ["run_query", "save_json"]
 
+    def _load_cached(self, context: Dict[str, Any]) -> Dict[str, Any] | None:
+        """
+        Serve the query from a previously saved dump if its bytes are unchanged,
+        or as an empty result if it is known to match nothing.
+        :param context: The run context; updated with the cached data on a hit.
+        :return: The cached Overpass data, or None on a miss.
+        """
+        if not self.memory:
+            return None
+        q_hash = query_hash(context["query"])
+        # a query known to return nothing needs no round-trip at all
+        if (
+            self.memory.get_cache(self.name, "empty", q_hash, max_age=EMPTY_RESULT_TTL)
+            is not None
+        ):
+            data: Dict[str, Any] = {"elements": []}
+            context.update(
+                {
+                    "cache_hit": True,
+                    "data": data,
+                    "cached_path": None,
+                    "elements_count": 0,
+                    "empty": True,
+                }
+            )
+            return data
+        entry = self.memory.get_cache(self.name, "cache", q_hash)
+        if entry is None:
+            return None
+        filepath = Path(entry["path"])
+        if not filepath.exists():
+            return None
+        # cache hit: verify the bytes before parsing them
+        raw = filepath.read_bytes()
+        if file_hash(raw) != entry.get("file_hash"):
+            return None
+        data = orjson.loads(raw)
+        elements = len(data.get("elements", []))
+        # make sure steps down the line have what they need
+        context.update(
+            {
+                "cache_hit": True,
+                "data": data,
+                "cached_path": str(filepath),
+                "elements_count": elements,
+                "empty": elements == 0,
+            }
+        )
+        return data
+
+    @staticmethod
+    def _dump_path(context: Dict[str, Any]) -> Path:
+        """
+        :param context: The run context.
+        :return: Where the city's Overpass dump is saved.
+        """
+        return context["city_dir"] / f"{city_slug(context['city'])}.json"
+
+    def _fetch(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the Overpass query. With a `stream_query` tool the response is
+        streamed to a uniquely named partial file next to the final dump and
+        hashed on the way, so `save_json` only has to rename it.
+        :param context: The run context; records the partial file and its hash.
+        :return: The Overpass data.
+        :raises RuntimeError: If the streamed response is not valid JSON.
+        """
+        stream = self.tools.get("stream_query")
+        if stream is None:
+            return self.tools["run_query"](context["query"])
+        out_path = self._dump_path(context)
+        # a unique name keeps concurrent runs for the same city apart
+        with tempfile.NamedTemporaryFile(
+            dir=out_path.parent,
+            prefix=f"{out_path.name}.",
+            suffix=".part",
+            delete=False,
+        ) as tmp:
+            part = Path(tmp.name)
+        try:
+            path, digest = stream(context["query"], part)
+            data = orjson.loads(Path(path).read_bytes())
+        except orjson.JSONDecodeError as e:
+            part.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"Overpass returned invalid JSON for {context['city']}"
+            ) from e
+        except Exception:
+            part.unlink(missing_ok=True)
+            raise
+        context.update({"fetched_path": Path(path), "fetched_hash": digest})
+        return data
+
+    @staticmethod
+    def _record_fetch(context: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """
+        Store freshly fetched Overpass data in the run context.
+        :param context: The run context.
+        :param data: The Overpass response.
+        """
+        elements = len(data.get("elements", []))
+        context.update(
+            {
+                "cache_hit": False,
+                "data": data,
+                "elements_count": elements,
+                "empty": elements == 0,
+            }
+        )
+
     def act(self, action: str, context: Dict[str, Any]) -> Any:
         """
         Map action name to the corresponding tool and return its result.
@@ -69,64 +188,49 @@ class ScraperAgent(Agent):
             raise ValueError(f"No tool named '{action}' found.")
 
         if action == "run_query":
-            q_hash = query_hash(context["query"])
-            # Look for a cache entry
-            if self.memory:
-                for m in self.memory.load(self.name):
-                    if m.step == "cache" and m.content.startswith(q_hash):
-                        _, fp, p_hash = m.content.split("|")
-                        filepath = Path(fp)
-                        if filepath.exists():
-                            # cache hit
-                            with filepath.open(encoding="utf-8") as f:
-                                data = json.load(f)
-                            # double-check integrity
-                            if payload_hash(data) == p_hash:
-                                elements = len(data.get("elements", []))
-                                # make sure steps down the line have what they need
-                                context.update(
-                                    {
-                                        "cache_hit": True,
-                                        "data": data,
-                                        "cached_path": str(filepath),
-                                        "elements_count": elements,
-                                        "empty": elements == 0,
-                                    }
-                                )
-                                return data
-            # otherwise run the query
-            data = self.tools[action](context["query"])
-            elements = len(data.get("elements", []))
-            context.update(
-                {
-                    "cache_hit": False,
-                    "data": data,
-                    "elements_count": elements,
-                    "empty": elements == 0,
-                }
-            )
+            data = self._load_cached(context)
+            if data is None:
+                data = self._fetch(context)
+                self._record_fetch(context, data)
             return data
 
         if action == "save_json":
             # skip if the query returns empty
             if context.get("empty", False):
-                # remember so that we don't re-fetch
-                self.remember(
-                    "empty",
-                    f"{context['city']}|{context.get('country')}|{query_hash(context['query'])}",
-                )
+                # remember so that we don't re-fetch until the marker expires
+                if not context.get("cache_hit") and self.memory:
+                    self.memory.put_cache(
+                        self.name,
+                        "empty",
+                        query_hash(context["query"]),
+                        {"city": context["city"], "country": context.get("country")},
+                    )
+                if context.get("fetched_path"):
+                    context["fetched_path"].unlink(missing_ok=True)
                 return "NO_DATA"
             # skip if served from cache
             if context.get("cache_hit"):
                 return context["cached_path"]
 
-            city_key = context["city"].lower().replace(" ", "_")
-            out_path = context["city_dir"] / f"{city_key}.json"
-            saved = self.tools["save_json"](context["data"], context["city"], out_path)
+            out_path = self._dump_path(context)
+            if context.get("fetched_path"):
+                # the response is already on disk and hashed; just publish it
+                saved = context["fetched_path"].replace(out_path)
+                f_hash = context["fetched_hash"]
+            else:
+                # hash the bytes we write rather than reading the file back
+                raw = orjson.dumps(context["data"], option=orjson.OPT_INDENT_2)
+                f_hash = file_hash(raw)
+                saved = self.tools["save_json"](raw, context["city"], out_path)
 
             q_hash = query_hash(context["query"])
-            p_hash = payload_hash(context["data"])
-            self.remember("cache", f"{q_hash}|{saved}|{p_hash}")
+            if self.memory:
+                self.memory.put_cache(
+                    self.name,
+                    "cache",
+                    q_hash,
+                    {"path": str(saved), "file_hash": f_hash},
+                )
             return str(saved)
 
         raise NotImplementedError(action)
@@ -144,11 +248,108 @@ class ScraperAgent(Agent):
         # From here on context is shared and every stage can read or extend.
         context: Dict[str, Any] = {**observation}
 
-        for step in plan_steps:
-            result = self.act(step, context)
-            self.remember(step, summarize(result))
-            context[step] = result
+        try:
+            for step in plan_steps:
+                self._record_step(context, step, self.act(step, context))
+        finally:
+            self.flush_memories()
 
+        return self._finish(context)
+
+    async def achieve_goal_many(
+        self, inputs: List[Dict[str, Any]], max_concurrency: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several scrapes concurrently, overlapping the Overpass round-trips.
+        Blocking steps run in worker threads and at most `max_concurrency`
+        fetches are in flight, keeping within the Overpass slot limit. Cache
+        hits take no slot.
+        The memories of all runs are written in a single transaction. A failed
+        run does not stop the others; it yields an error context instead.
+        :param inputs: One `achieve_goal()` input per city.
+        :param max_concurrency: Maximum number of concurrent Overpass requests.
+        :return: The final context of every run, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        try:
+            # let every run finish so its memories make it into the batch
+            results = await asyncio.gather(
+                *(self._process_one(input_data, semaphore) for input_data in inputs),
+                return_exceptions=True,
+            )
+        finally:
+            # one transaction for the memories of the whole batch
+            self.flush_memories()
+        contexts = []
+        for input_data, result in zip(inputs, results):
+            if isinstance(result, Exception):
+                contexts.append(self._error_context(input_data, result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                contexts.append(result)
+        return contexts
+
+    async def _process_one(
+        self, input_data: Dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of `achieve_goal()` for a single city. Memories are
+        left buffered for `achieve_goal_many()` to flush.
+        :param input_data: The user raw input.
+        :param semaphore: Limits the number of concurrent Overpass requests.
+        :return: The final context dictionary produced by the run.
+        """
+        # geocoding, cache lookups and file writes all block, so they run in
+        # worker threads too; the Overpass fetch is throttled here, while
+        # build_query serialises and spaces out the Nominatim requests
+        observation = await asyncio.to_thread(self.perceive, input_data)
+        context: Dict[str, Any] = {**observation}
+        data = await asyncio.to_thread(self._load_cached, context)
+        if data is None:
+            async with semaphore:
+                data = await asyncio.to_thread(self._fetch, context)
+            self._record_fetch(context, data)
+        self._record_step(context, "run_query", data)
+
+        saved = await asyncio.to_thread(self.act, "save_json", context)
+        self._record_step(context, "save_json", saved)
+        return self._finish(context)
+
+    def _record_step(self, context: Dict[str, Any], step: str, result: Any) -> None:
+        """
+        Remember the outcome of a step and expose it to the steps after it.
+        :param context: The run context.
+        :param step: The step name.
+        :param result: What the step returned.
+        """
+        self.remember(step, summarize(result))
+        context[step] = result
+
+    @staticmethod
+    def _error_context(input_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """
+        Build the context reported for a run that raised.
+        :param input_data: The user raw input of the run.
+        :param error: The exception it raised.
+        :return: An error context.
+        """
+        city = input_data.get("city")
+        logger.error(f"[ScraperAgent] Scrape failed for {city}: {error}")
+        return {
+            "city": city,
+            "country": input_data.get("country"),
+            "success": False,
+            "error": str(error),
+        }
+
+    @staticmethod
+    def _finish(context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Warn about cities without surveillance objects.
+        :param context: The final run context.
+        :return: The same context.
+        """
         if context.get("empty"):
             logger.warning(
                 f"[ScraperAgent] WARNING: 0 surveillance objects found for "
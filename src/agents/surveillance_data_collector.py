@@ -1,17 +1,156 @@
+import asyncio
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Tuple, Union
 
+import orjson
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain_core.prompts import PromptTemplate
 
 from src.config.logger import logger
 from src.config.settings import LangChainSettings
-from src.llm.surveillance_llm import create_surveillance_llm
+from src.llm.surveillance_llm import (
+    SurveillanceLLM,
+    get_shared_surveillance_llm,
+    settings_key,
+)
 from src.memory.store import MemoryStore
+from src.tools.io_tools import city_slug
+from src.utils.db import file_hash, query_hash
+from src.utils.elements import Elements, sidecar_path
+from src.utils.overpass import build_query
+from src.prompts.prompt_template import SCRAPER_PROMPT_v2
 from src.tools.surveillance_data_collector_tools import (
     create_surveillance_data_collector_tools,
 )
 
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; only in-process writers are serialized
+    fcntl = None
+
+# Number of scrape responses remembered per collector
+_SCRAPE_CACHE_SIZE = 128
+
+# Number of (settings, memory) executor bundles shared between collectors
+_EXECUTOR_POOL_SIZE = 8
+
+# Natural-language task handed to the ReAct agent for one city
+_AGENT_INPUT_TMPL = (
+    "Collect surveillance camera data for {city}{country_info}. "
+    "Save to directory: {city_dir}"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_prompt_template() -> PromptTemplate:
+    """
+    Build the simplified scraper agent prompt template once per process.
+
+    :return: Configured PromptTemplate for the agent
+    """
+    return PromptTemplate(
+        template=SCRAPER_PROMPT_v2,
+        input_variables=["input", "tools", "tool_names", "agent_scratchpad"],
+    )
+
+
+def _handle_cache_step(response: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """
+    Record a check_query_cache observation in the scrape response.
+
+    :param response: Scrape response, updated in place
+    :param result: Decoded tool observation
+    """
+    if result.get("cache_hit"):
+        response["cache_hit"] = True
+        response["cached_path"] = result.get("filepath")
+        response["elements_count"] = result.get("elements_count", 0)
+        if "elements_npz" in result:
+            response["elements_path"] = result["elements_npz"]
+
+
+def _handle_save_step(response: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """
+    Record a save_overpass_data observation in the scrape response.
+
+    :param response: Scrape response, updated in place
+    :param result: Decoded tool observation
+    """
+    response["cache_hit"] = False
+    response["empty"] = result.get("empty", False)
+    if not result.get("empty"):
+        response["filepath"] = result.get("filepath")
+        response["elements_count"] = result.get("elements_count", 0)
+        if "elements_npz" in result:
+            response["elements_path"] = result["elements_npz"]
+
+
+def _handle_batch_step(response: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """
+    Fold the results of a batch observation into the scrape response.
+
+    :param response: Scrape response, updated in place
+    :param result: Decoded tool observation
+    """
+    for item in result.get("results", []):
+        handler = _STEP_HANDLERS.get(item.get("tool_name"))
+        if handler is not None and isinstance(item.get("result"), dict):
+            handler(response, item["result"])
+
+
+# Tool name -> handler folding that tool's observation into the response
+_STEP_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {
+    "check_query_cache": _handle_cache_step,
+    "save_overpass_data": _handle_save_step,
+    "batch": _handle_batch_step,
+}
+
+
+class _ExecutorBundle(NamedTuple):
+    """Agent components that can be shared between collector instances."""
+
+    llm: SurveillanceLLM
+    tools: List[Any]
+    prompt: PromptTemplate
+    agent: Any
+    executor: AgentExecutor
+
+
+_EXECUTOR_POOL: "OrderedDict[Tuple[str, int], _ExecutorBundle]" = OrderedDict()
+_EXECUTOR_POOL_LOCK = threading.Lock()
+
+# Serializes checkpoint appends from the worker threads of one process
+_CHECKPOINT_LOCK = threading.Lock()
+
+
+def _normalize(value: Optional[str]) -> str:
+    """
+    Normalize a free-text request field for cache lookups.
+
+    :param value: City or country name as given by the caller
+    :return: Case-folded, whitespace-collapsed NFKC form ("" for None)
+    """
+    if not value:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+
+
+def _checkpoint_key(city: str, country: Optional[str]) -> Tuple[str, str]:
+    """
+    Key of a batch checkpoint row, so same-named cities in different
+    countries are resumed separately.
+
+    :param city: City name
+    :param country: Optional country name
+    :return: Normalized (city, country) tuple
+    """
+    return _normalize(city), _normalize(country)
+
 
 class SurveillanceDataCollector:
     """
@@ -44,187 +183,496 @@ class SurveillanceDataCollector:
         self.memory = memory
         self.settings = settings or LangChainSettings()
 
-        # Create LLM
-        self.llm = create_surveillance_llm(self.settings)
+        # Responses of completed scrapes, keyed by the normalized request
+        self._scrape_cache: OrderedDict[Tuple[str, str, str], Dict[str, Any]] = (
+            OrderedDict()
+        )
+
+        # The LLM, tools and executor are fetched on first use (see below)
+        logger.info("Initialized {}", self.name)
+
+    @cached_property
+    def _bundle(self) -> _ExecutorBundle:
+        """
+        Reuse the LLM, tools and executor of collectors with the same
+        settings and memory store instead of rebuilding them.
+
+        :return: The pooled executor bundle
+        """
+        bundle = self._get_executor_bundle(self.settings, self.memory)
+        logger.debug("{} ready with {} simplified tools", self.name, len(bundle.tools))
+        return bundle
+
+    @cached_property
+    def llm(self) -> SurveillanceLLM:
+        """The shared LLM backing the agent."""
+        return self._bundle.llm
+
+    @cached_property
+    def tools(self) -> List[Any]:
+        """Surveillance data collection tools with memory access."""
+        return self._bundle.tools
+
+    @cached_property
+    def prompt(self) -> PromptTemplate:
+        """The ReAct prompt template."""
+        return self._bundle.prompt
+
+    @cached_property
+    def agent(self) -> Any:
+        """The ReAct agent."""
+        return self._bundle.agent
+
+    @cached_property
+    def executor(self) -> AgentExecutor:
+        """The agent executor with tight error handling."""
+        return self._bundle.executor
+
+    @classmethod
+    def _get_executor_bundle(
+        cls, settings: LangChainSettings, memory: MemoryStore
+    ) -> _ExecutorBundle:
+        """
+        Fetch the shared executor bundle for settings and memory, building it once.
+
+        :param settings: LangChain settings for LLM configuration
+        :param memory: Memory store the tools read from and write to
+        :return: The pooled executor bundle
+        """
+        key = (settings_key(settings), id(memory))
+        with _EXECUTOR_POOL_LOCK:
+            bundle = _EXECUTOR_POOL.get(key)
+            if bundle is None:
+                bundle = _EXECUTOR_POOL[key] = cls._build_executor_bundle(
+                    settings, memory
+                )
+                if len(_EXECUTOR_POOL) > _EXECUTOR_POOL_SIZE:
+                    _EXECUTOR_POOL.popitem(last=False)
+            _EXECUTOR_POOL.move_to_end(key)
+        return bundle
+
+    @classmethod
+    def _build_executor_bundle(
+        cls, settings: LangChainSettings, memory: MemoryStore
+    ) -> _ExecutorBundle:
+        """
+        Build the LLM, tools, prompt, ReAct agent and executor for a collector.
+
+        :param settings: LangChain settings for LLM configuration
+        :param memory: Memory store the tools read from and write to
+        :return: A new executor bundle
+        """
+        llm = get_shared_surveillance_llm(settings)
 
         # Create surveillance data collection tools with memory access
-        self.tools = create_surveillance_data_collector_tools(memory)
+        tools = create_surveillance_data_collector_tools(memory)
 
         # Load simplified prompt template
-        self.prompt = self._load_prompt_template()
+        prompt = _get_prompt_template()
 
         # Create ReAct agent with simplified setup
-        self.agent = create_react_agent(
-            llm=self.llm.llm,  # Use the underlying Ollama LLM
-            tools=self.tools,
-            prompt=self.prompt,
+        agent = create_react_agent(
+            llm=llm.llm,  # Use the underlying Ollama LLM
+            tools=tools,
+            prompt=prompt,
         )
 
         # Create agent executor with tight error handling
-        self.executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=self.settings.agent_verbose,
-            max_iterations=self.settings.agent_max_iterations,
-            max_execution_time=self.settings.agent_max_execution_time,
+        executor = AgentExecutor(
+            agent=agent,
+            tools=tools,
+            verbose=settings.agent_verbose,
+            max_iterations=settings.agent_max_iterations,
+            max_execution_time=settings.agent_max_execution_time,
             handle_parsing_errors=True,
             return_intermediate_steps=True,
         )
+        return _ExecutorBundle(llm, tools, prompt, agent, executor)
 
-        logger.info(f"Initialized {self.name} with {len(self.tools)} simplified tools")
+    def scrape(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Scrape surveillance data for a city using the simplified agent.
 
-    @staticmethod
-    def _load_prompt_template() -> PromptTemplate:
+        :param input_data: Dict with 'city', optional 'country', 'overpass_dir'
+        :return: Dict with scraping results including data, cache status, filepath
         """
-        Load the simplified scraper agent prompt template.
+        city, country, city_dir, cache_key = self._prepare_request(input_data)
+
+        # Serve repeated requests without running the agent again
+        cached = self._cached_scrape(cache_key)
+        if cached is not None:
+            logger.info("Scrape cache hit for {}", city)
+            return cached
+
+        stored = self._stored_scrape(city, country, city_dir)
+        if stored is not None:
+            self._remember_scrape(cache_key, stored)
+            return stored
+
+        try:
+            logger.info("Starting scrape for {}{}", city, self._country_info(country))
+
+            # Execute agent
+            result = self.executor.invoke(self._agent_input(city, country, city_dir))
+
+            response = self._build_response(city, city_dir, result)
+            self._remember_scrape(cache_key, response)
+            logger.info("Scrape completed for {}", city)
+            return response
+
+        except Exception as e:
+            return self._error_response(city, country, city_dir, e)
 
-        :return: Configured PromptTemplate for the agent
+    async def ascrape(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        # Use tested hardcoded template (file loading causes ReAct parsing issues)
-        template = """You are a surveillance data collector. Collect camera data from cities efficiently.
+        Asynchronously scrape surveillance data for a city.
 
-Available tools: {tools}
-Tool names: {tool_names}
+        Same contract as scrape(), but the agent runs on the event loop so
+        several cities can be collected concurrently.
 
-FORMAT: Use this EXACT format:
+        :param input_data: Dict with 'city', optional 'country', 'overpass_dir'
+        :return: Dict with scraping results including data, cache status, filepath
+        """
+        city, country, city_dir, cache_key = self._prepare_request(input_data)
 
-Thought: [your reasoning]
-Action: [exact tool name]
-Action Input: {{"param": "value"}}
-Observation: [result appears automatically]
+        cached = self._cached_scrape(cache_key)
+        if cached is not None:
+            logger.info("Scrape cache hit for {}", city)
+            return cached
 
-Repeat Thought/Action/Action Input/Observation until complete, then:
+        stored = await asyncio.to_thread(self._stored_scrape, city, country, city_dir)
+        if stored is not None:
+            self._remember_scrape(cache_key, stored)
+            return stored
 
-Thought: I have completed the task
-Final Answer: [brief 1-sentence summary with element count and filepath]
+        try:
+            logger.info("Starting scrape for {}{}", city, self._country_info(country))
 
-WORKFLOW:
-1. Build query → 2. Check cache
-   → If cache HIT: STOP. Task complete (data already saved at filepath)
-   → If cache MISS: 3. Download → 4. Save
+            result = await self.executor.ainvoke(
+                self._agent_input(city, country, city_dir)
+            )
 
-RULES:
-- Use exact JSON format: {{"param": "value"}}
-- CRITICAL: If cache hits (cache_hit: true), STOP immediately. Do NOT call save_overpass_data.
-- Cache hit means data is already saved - filepath is in the cache response
-- Only download and save if cache miss (cache_hit: false)
-- Keep Final Answer brief (one sentence)
+            response = self._build_response(city, city_dir, result)
+            self._remember_scrape(cache_key, response)
+            logger.info("Scrape completed for {}", city)
+            return response
 
-Question: {input}
-{agent_scratchpad}"""
+        except Exception as e:
+            return self._error_response(city, country, city_dir, e)
 
-        return PromptTemplate(
-            template=template,
-            input_variables=["input", "tools", "tool_names", "agent_scratchpad"],
+    async def scrape_batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: int = 2,
+        output_jsonl: Optional[Union[str, Path]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape several cities concurrently.
+
+        With ``output_jsonl``, every successful response is appended to the
+        file as soon as it completes, and cities already recorded there are
+        not scraped again, so an interrupted batch resumes where it stopped.
+        Checkpointed rows omit the raw ``data`` payload; it stays on disk at
+        the recorded filepath.
+
+        :param inputs: One scrape() input dict per city
+        :param max_concurrency: Maximum number of cities scraped at once. Each
+            scrape runs its own agent episode, which may send Overpass queries,
+            so the default matches the two Overpass slots per client IP.
+            Nominatim lookups are throttled separately by build_query()
+        :param output_jsonl: Optional checkpoint file of completed responses
+        :return: Scrape results in input order
+        """
+        checkpoint = Path(output_jsonl) if output_jsonl else None
+        done = (
+            await asyncio.to_thread(self._read_checkpoint, checkpoint)
+            if checkpoint
+            else {}
         )
+        if done:
+            logger.info("Resuming batch: {} cities already scraped", len(done))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def guarded(input_data: Dict[str, Any]) -> Dict[str, Any]:
+            country = input_data.get("country")
+            previous = done.get(_checkpoint_key(input_data["city"], country))
+            if previous is not None:
+                return previous
+            async with semaphore:
+                response = await self.ascrape(input_data)
+            if checkpoint and response.get("success"):
+                row = {"country": country, **response}
+                await asyncio.to_thread(self._append_checkpoint, checkpoint, row)
+            return response
 
-    def scrape(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return list(await asyncio.gather(*(guarded(i) for i in inputs)))
+
+    @staticmethod
+    def _read_checkpoint(checkpoint: Path) -> Dict[Tuple[str, str], Dict[str, Any]]:
         """
-        Scrape surveillance data for a city using the simplified agent.
+        Load completed responses from a JSONL checkpoint.
+
+        A partial last line left by a crash mid-write is cut off, so new
+        rows are appended on a line of their own.
+
+        :param checkpoint: The checkpoint file
+        :return: Completed responses keyed by normalized (city, country)
+        """
+        done: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if not checkpoint.exists():
+            return done
+        with checkpoint.open("r+b") as fp:
+            content = fp.read()
+            complete = content.rfind(b"\n") + 1
+            if complete < len(content):
+                logger.warning("Discarding partial last line of {}", checkpoint)
+                fp.truncate(complete)
+        for line in content[:complete].splitlines():
+            if line.strip():
+                row = orjson.loads(line)
+                done[_checkpoint_key(row["city"], row.get("country"))] = row
+        return done
+
+    @staticmethod
+    def _append_checkpoint(checkpoint: Path, response: Dict[str, Any]) -> None:
+        """
+        Durably append one completed response to a JSONL checkpoint.
+
+        Blocks on the file lock and fsync, so async callers run it in a
+        worker thread.
+
+        :param checkpoint: The checkpoint file
+        :param response: A successful scrape response
+        """
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        line = orjson.dumps(
+            response,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+        with _CHECKPOINT_LOCK, checkpoint.open("ab") as fp:
+            if fcntl is not None:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                fp.write(line)
+                fp.flush()
+                os.fsync(fp.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _prepare_request(
+        input_data: Dict[str, Any],
+    ) -> Tuple[str, Optional[str], Path, Tuple[str, str, str]]:
+        """
+        Unpack a scrape request and prepare its output directory.
 
         :param input_data: Dict with 'city', optional 'country', 'overpass_dir'
-        :return: Dict with scraping results including data, cache status, filepath
+        :return: (city, country, city_dir, cache_key)
         """
         city = input_data["city"]
         country = input_data.get("country")
         overpass_dir = input_data.get("overpass_dir", "overpass_data")
 
         # Prepare directory structure
-        city_dir = Path(overpass_dir) / city.lower().replace(" ", "_")
+        city_dir = Path(overpass_dir) / city_slug(city)
         city_dir.mkdir(parents=True, exist_ok=True)
 
-        # Build simple input for agent
-        country_info = f" in {country}" if country else ""
-        agent_input = {
-            "input": f"Collect surveillance camera data for {city}{country_info}. Save to directory: {city_dir}"
+        cache_key = (_normalize(city), _normalize(country), str(Path(overpass_dir)))
+        return city, country, city_dir, cache_key
+
+    @staticmethod
+    def _country_info(country: Optional[str]) -> str:
+        """
+        :param country: Optional country name
+        :return: " in <country>" suffix for messages, or "" without a country
+        """
+        return f" in {country}" if country else ""
+
+    def _agent_input(
+        self, city: str, country: Optional[str], city_dir: Path
+    ) -> Dict[str, str]:
+        """
+        Build the simple natural-language input for the agent.
+
+        :param city: City name
+        :param country: Optional country name
+        :param city_dir: Directory the data is saved to
+        :return: Input for the ReAct agent
+        """
+        mapping = {
+            "city": city,
+            "country_info": self._country_info(country),
+            "city_dir": city_dir,
+        }
+        return {"input": _AGENT_INPUT_TMPL.format_map(mapping)}
+
+    @staticmethod
+    def _build_response(
+        city: str, city_dir: Path, result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build the scrape response from the agent's final answer and tool calls.
+
+        :param city: City name
+        :param city_dir: Directory the data is saved to
+        :param result: Raw executor result
+        :return: Scrape response dict
+        """
+        # Extract results
+        final_answer = result.get("output", "")
+        intermediate_steps = result.get("intermediate_steps", [])
+
+        # Parse results from intermediate steps to build response
+        response = {
+            "city": city,
+            "city_dir": str(city_dir),
+            "agent_output": final_answer,
+            "success": True,
         }
 
-        try:
-            logger.info(f"Starting scrape for {city}{country_info}")
+        # Try to extract key information from steps
+        for action, observation in intermediate_steps:
+            handler = _STEP_HANDLERS.get(action.tool)
+            if handler is None:
+                continue
+            try:
+                # tools answer with JSON text (str or raw bytes) or a dict
+                result = (
+                    orjson.loads(observation)
+                    if isinstance(observation, (str, bytes, bytearray, memoryview))
+                    else observation
+                )
+                handler(response, result)
+            except (orjson.JSONDecodeError, AttributeError):
+                logger.warning(
+                    "Could not parse {} result: {}", action.tool, observation
+                )
 
-            # Execute agent
-            result = self.executor.invoke(agent_input)
-
-            # Extract results
-            final_answer = result.get("output", "")
-            intermediate_steps = result.get("intermediate_steps", [])
-
-            # Parse results from intermediate steps to build response
-            response = {
-                "city": city,
-                "city_dir": str(city_dir),
-                "agent_output": final_answer,
-                "success": True,
-            }
-
-            # Try to extract key information from steps
-            for step in intermediate_steps:
-                action, observation = step
-                tool_name = action.tool
-
-                if tool_name == "check_query_cache":
-                    try:
-                        import json
-
-                        cache_result = (
-                            json.loads(observation)
-                            if isinstance(observation, str)
-                            else observation
-                        )
-                        if cache_result.get("cache_hit"):
-                            response["cache_hit"] = True
-                            response["cached_path"] = cache_result.get("filepath")
-                            response["elements_count"] = cache_result.get(
-                                "elements_count", 0
-                            )
-                            if "data" in cache_result:
-                                response["data"] = cache_result["data"]
-                    except (json.JSONDecodeError, AttributeError):
-                        logger.warning(f"Could not parse cache result: {observation}")
-
-                elif tool_name == "save_overpass_data":
-                    try:
-                        import json
-
-                        save_result = (
-                            json.loads(observation)
-                            if isinstance(observation, str)
-                            else observation
-                        )
-                        response["cache_hit"] = False
-                        response["empty"] = save_result.get("empty", False)
-                        if not save_result.get("empty"):
-                            response["filepath"] = save_result.get("filepath")
-                            response["elements_count"] = save_result.get(
-                                "elements_count", 0
-                            )
-                    except (json.JSONDecodeError, AttributeError):
-                        logger.warning(f"Could not parse save result: {observation}")
-
-            logger.info(f"Scrape completed for {city}")
-            return response
+        return response
+
+    @staticmethod
+    def _error_response(
+        city: str, country: Optional[str], city_dir: Path, e: Exception
+    ) -> Dict[str, Any]:
+        """
+        Log a scrape failure and build the corresponding error response.
+
+        :param city: City name
+        :param country: Optional country name
+        :param city_dir: Directory the data was to be saved to
+        :param e: The exception raised while scraping
+        :return: Error response dict
+        """
+        error_msg = str(e)
+
+        # Detect connection errors to LLM service
+        if "Connection refused" in error_msg or "ConnectionError" in str(type(e)):
+            logger.error(
+                "Scraping failed for {}: Cannot connect to LLM service (Ollama). "
+                "Error: {}. Please ensure Ollama is running and accessible.",
+                city,
+                error_msg,
+            )
+        else:
+            logger.error("Scraping failed for {}: {}", city, error_msg)
+
+        return {
+            "city": city,
+            "country": country,
+            "city_dir": str(city_dir),
+            "success": False,
+            "error": error_msg,
+            "agent_output": f"Error: {error_msg}",
+        }
+
+    def _cached_scrape(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previous scrape response for a normalized request.
+
+        Entries whose data file has since been removed are dropped.
+
+        :param key: Normalized (city, country, overpass_dir) tuple
+        :return: A copy of the cached response, or None on a miss
+        """
+        response = self._scrape_cache.get(key)
+        if response is None:
+            return None
+        filepath = response.get("filepath") or response.get("cached_path")
+        if filepath and not Path(filepath).exists():
+            del self._scrape_cache[key]
+            return None
+        self._scrape_cache.move_to_end(key)
+        return dict(response)
+
+    def _stored_scrape(
+        self, city: str, country: Optional[str], city_dir: Path
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve a scrape from the dump a previous run saved for the same query.
 
+        The query cache lives in the memory store, so this skips both the LLM
+        and the Overpass round-trip across process restarts.
+
+        :param city: City name
+        :param country: Optional country name
+        :param city_dir: Directory the data is saved to
+        :return: A cache-hit scrape response, or None if nothing valid is stored
+        """
+        try:
+            query = build_query(city, country=country)
         except Exception as e:
-            error_msg = str(e)
-
-            # Detect connection errors to LLM service
-            if "Connection refused" in error_msg or "ConnectionError" in str(type(e)):
-                logger.error(
-                    f"Scraping failed for {city}: Cannot connect to LLM service (Ollama). "
-                    f"Error: {error_msg}. "
-                    f"Please ensure Ollama is running and accessible."
-                )
-            else:
-                logger.error(f"Scraping failed for {city}: {error_msg}")
-
-            return {
-                "city": city,
-                "country": country,
-                "city_dir": str(city_dir),
-                "success": False,
-                "error": error_msg,
-                "agent_output": f"Error: {error_msg}",
-            }
+            logger.debug("Could not build query for {}: {}", city, e)
+            return None
+
+        entry = self.memory.get_cache(self.name, "cache", query_hash(query))
+        if entry is None:
+            return None
+        filepath = Path(entry["path"])
+        if not filepath.exists():
+            return None
+        raw = filepath.read_bytes()
+        if file_hash(raw) != entry.get("file_hash"):
+            logger.warning("Cache integrity check failed for {}", filepath)
+            return None
+
+        response = {
+            "city": city,
+            "city_dir": str(city_dir),
+            "agent_output": f"Loaded cached data for {city} from {filepath}",
+            "success": True,
+            "cache_hit": True,
+            "cached_path": str(filepath),
+        }
+        npz_path = sidecar_path(filepath)
+        if npz_path.exists():
+            response["elements_count"] = Elements.count(npz_path)
+            response["elements_path"] = str(npz_path)
+        else:
+            response["elements_count"] = len(orjson.loads(raw).get("elements", []))
+        logger.info("Served {} from the stored Overpass dump", city)
+        return response
+
+    def _remember_scrape(
+        self, key: Tuple[str, str, str], response: Dict[str, Any]
+    ) -> None:
+        """
+        Cache a scrape response if the agent actually produced a result.
+
+        :param key: Normalized (city, country, overpass_dir) tuple
+        :param response: The response returned by scrape()
+        """
+        if not (
+            response.get("filepath")
+            or response.get("cached_path")
+            or response.get("empty")
+        ):
+            return
+        self._scrape_cache[key] = response
+        self._scrape_cache.move_to_end(key)
+        if len(self._scrape_cache) > _SCRAPE_CACHE_SIZE:
+            self._scrape_cache.popitem(last=False)
 
     def achieve_goal(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -234,3 +682,30 @@ Question: {input}
         :return: Dict with scraping results
         """
         return self.scrape(input_data)
+
+
+def scrape_many(
+    collector: SurveillanceDataCollector,
+    inputs: List[Dict[str, Any]],
+    max_concurrency: int = 2,
+    output_jsonl: Optional[Union[str, Path]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape several cities concurrently from synchronous code (e.g. the CLI).
+
+    Runs SurveillanceDataCollector.scrape_batch() on a fresh event loop, so
+    total time tracks the slowest city rather than the sum over cities. Must
+    not be called from a running event loop; await scrape_batch() there.
+
+    :param collector: The collector to scrape with
+    :param inputs: One scrape() input dict per city
+    :param max_concurrency: Maximum number of cities scraped at once; see
+        SurveillanceDataCollector.scrape_batch()
+    :param output_jsonl: Optional checkpoint file of completed responses
+    :return: Scrape results in input order
+    """
+    return asyncio.run(
+        collector.scrape_batch(
+            inputs, max_concurrency=max_concurrency, output_jsonl=output_jsonl
+        )
+    )
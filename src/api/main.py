@@ -6,6 +6,7 @@ middleware, routers, and static file serving.
 
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -31,6 +32,11 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI server starting up")
     logger.info("API documentation available at /docs and /redoc")
 
+    # Request validators are compiled when the models are defined; the
+    # OpenAPI document (every model's JSON schema) is built lazily, so build
+    # it now rather than inside the first /docs or /openapi.json request
+    app.openapi()
+
     yield
 
     # Shutdown
@@ -115,7 +121,7 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str):
             _ = await websocket.receive_text()
 
             # Send current task status
-            task = task_manager.get_task(task_id)
+            task = await asyncio.to_thread(task_manager.get_task, task_id)
             if task:
                 await websocket.send_json(
                     {
@@ -141,11 +147,19 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str):
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
+    # loop/http "auto" pick uvloop and httptools (declared dependencies) and
+    # fall back to asyncio/h11 where they are unavailable, e.g. on Windows.
+    # More than one worker needs TASK_STORE_URL so that workers share tasks.
     uvicorn.run(
-        app,
+        "src.api.main:app",
         host="0.0.0.0",
         port=8080,
         log_level="info",
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
     )
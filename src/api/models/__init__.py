@@ -5,6 +5,7 @@ from src.api.models.requests import (
     AnalyzeRequest,
     RouteComputeRequest,
     PipelineRequest,
+    BatchPipelineRequest,
 )
 from src.api.models.responses import (
     TaskStatus,
@@ -14,6 +15,8 @@ from src.api.models.responses import (
     RouteResponse,
     HealthResponse,
     VersionResponse,
+    CityFileInfo,
+    CityFilesResponse,
 )
 
 __all__ = [
@@ -22,6 +25,7 @@ __all__ = [
     "AnalyzeRequest",
     "RouteComputeRequest",
     "PipelineRequest",
+    "BatchPipelineRequest",
     # Response models
     "TaskStatus",
     "TaskResponse",
@@ -30,4 +34,6 @@ __all__ = [
     "RouteResponse",
     "HealthResponse",
     "VersionResponse",
+    "CityFileInfo",
+    "CityFilesResponse",
 ]
@@ -5,7 +5,7 @@ This module defines the request schemas for all API endpoints, providing
 automatic validation, serialization, and documentation.
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from src.config.pipeline_config import AnalysisScenario
@@ -161,3 +161,31 @@ class PipelineRequest(BaseModel):
         default=None,
         description="Optional routing configuration (enables routing when provided)",
     )
+
+
+class BatchPipelineRequest(BaseModel):
+    """
+    Request model for running the pipeline for several cities at once.
+
+    :param items: One pipeline request per city
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "items": [
+                        {"city": "Lund", "country": "SE", "scenario": "basic"},
+                        {"city": "Malmö", "country": "SE", "scenario": "basic"},
+                    ]
+                }
+            ]
+        }
+    )
+
+    items: List[PipelineRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=32,
+        description="Pipeline requests, run concurrently (at most 32)",
+    )
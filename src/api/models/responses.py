@@ -5,9 +5,10 @@ This module defines the response schemas for all API endpoints, providing
 automatic validation, serialization, and documentation.
 """
 
-from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
 
 
 class TaskStatus(str, Enum):
@@ -56,9 +57,9 @@ class TaskStatusResponse(BaseModel):
     :param progress: Progress percentage (0-100)
     :param result: Task result data (only present when completed)
     :param error: Error message (only present when failed)
-    :param created_at: ISO timestamp when task was created
-    :param started_at: ISO timestamp when task started execution
-    :param completed_at: ISO timestamp when task completed
+    :param created_at: Epoch seconds when task was created
+    :param started_at: Epoch seconds when task started execution
+    :param completed_at: Epoch seconds when task completed
     :param metadata: Additional task metadata
     """
 
@@ -74,12 +75,12 @@ class TaskStatusResponse(BaseModel):
         default=None,
         description="Error message (present when failed)",
     )
-    created_at: str = Field(..., description="ISO timestamp of task creation")
-    started_at: Optional[str] = Field(
+    created_at: float = Field(..., description="ISO timestamp of task creation")
+    started_at: Optional[float] = Field(
         default=None,
         description="ISO timestamp when task started",
     )
-    completed_at: Optional[str] = Field(
+    completed_at: Optional[float] = Field(
         default=None,
         description="ISO timestamp when task completed",
     )
@@ -88,6 +89,18 @@ class TaskStatusResponse(BaseModel):
         description="Additional task metadata",
     )
 
+    @field_serializer(
+        "created_at", "started_at", "completed_at", when_used="json-unless-none"
+    )
+    def _format_timestamp(self, value: float) -> str:
+        """
+        Timestamps are kept as epoch seconds and only formatted for clients.
+
+        :param value: Epoch seconds
+        :return: ISO 8601 timestamp (UTC)
+        """
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+
 
 class RouteMetricsResponse(BaseModel):
     """
@@ -203,3 +216,35 @@ class VersionResponse(BaseModel):
     version: str = Field(..., description="Application version")
     api_version: str = Field(..., description="API version")
     description: str = Field(..., description="Service description")
+
+
+class CityFileInfo(BaseModel):
+    """
+    Metadata of one generated output file.
+
+    :param name: File name
+    :param path: URL path the file is served under
+    :param size_bytes: File size in bytes
+    :param modified: Modification time (seconds since the epoch)
+    :param type: MIME type
+    """
+
+    name: str = Field(..., description="File name")
+    path: str = Field(..., description="URL path of the file")
+    size_bytes: int = Field(..., description="File size in bytes")
+    modified: float = Field(..., description="Modification time (epoch seconds)")
+    type: str = Field(..., description="MIME type")
+
+
+class CityFilesResponse(BaseModel):
+    """
+    Response model for listing a city's output files.
+
+    :param city: City name
+    :param file_count: Number of files listed
+    :param files: File metadata, most recently modified first
+    """
+
+    city: str = Field(..., description="City name")
+    file_count: int = Field(..., description="Number of files listed")
+    files: List[CityFileInfo] = Field(..., description="Files, newest first")
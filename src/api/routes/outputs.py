@@ -6,11 +6,20 @@ with proper validation, MIME types, and error handling.
 """
 
 import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Receive, Scope, Send
 
+from src.api.models.responses import CityFileInfo, CityFilesResponse
 from src.config.logger import logger
 
 router = APIRouter(prefix="/outputs")
@@ -18,6 +27,146 @@ router = APIRouter(prefix="/outputs")
 # Base directory for all outputs
 OUTPUT_BASE_DIR = Path(os.getenv("OVERPASS_DIR", "overpass_data"))
 
+# Behind nginx, hand file bodies to the proxy via X-Accel-Redirect so they are
+# sent with sendfile(2) instead of being streamed through Python
+USE_XACCEL = os.getenv("USE_XACCEL", "") == "1"
+
+# Internal nginx location that aliases OUTPUT_BASE_DIR
+XACCEL_PREFIX = os.getenv("XACCEL_PREFIX", "/_internal/").rstrip("/") + "/"
+
+# Cache-Control sent with every output file; clients revalidate with the ETag
+_CACHE_CONTROL = "public, max-age=60"
+
+# Files larger than this are sent with _LargeFileResponse
+_LARGE_FILE_BYTES = 10 * 1024 * 1024
+
+
+def _single_byte_range(http_range: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header that asks for exactly one satisfiable byte range.
+
+    :param http_range: Value of the Range request header
+    :param file_size: Size of the file being served
+    :return: ``(start, end)`` with ``end`` exclusive, or None for anything else
+        (multiple, malformed or unsatisfiable ranges)
+    """
+    unit, _, spec = http_range.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(file_size - int(last), 0), file_size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, file_size) if last else file_size
+    if start >= end:
+        return None
+    return start, end
+
+
+class _ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse that lets the server copy the file to the socket itself.
+
+    When the ASGI server offers the ``http.response.zerocopysend`` extension,
+    full-body and single-range GET responses hand it an open file (with offset
+    and count) so it can use sendfile(2) instead of Python reading and
+    sending chunks. Everything else (HEAD, stale If-Range, multi-range or
+    invalid ranges, servers without the extension or offering
+    ``http.response.pathsend``) goes through FileResponse unchanged. Only the
+    public ``__call__`` is overridden, so no Starlette internals are relied on.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions", {})
+        if (
+            scope["type"] != "http"
+            or scope["method"].upper() != "GET"
+            or "http.response.zerocopysend" not in extensions
+            or "http.response.pathsend" in extensions
+            or self.status_code != 200
+            or self.stat_result is None
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        http_range = request_headers.get("range")
+        file_size = self.stat_result.st_size
+        if http_range is None:
+            status, headers = self.status_code, self.raw_headers
+            offset, count = 0, file_size
+        else:
+            byte_range = _single_byte_range(http_range, file_size)
+            if_range = request_headers.get("if-range")
+            if byte_range is None or (
+                if_range is not None
+                and if_range
+                not in (self.headers.get("etag"), self.headers.get("last-modified"))
+            ):
+                await super().__call__(scope, receive, send)
+                return
+            start, end = byte_range
+            # Same headers as FileResponse, but only [start, end) leaves the disk
+            range_headers = MutableHeaders(raw=list(self.raw_headers))
+            range_headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+            range_headers["content-length"] = str(end - start)
+            status, headers = 206, range_headers.raw
+            offset, count = start, end - start
+
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        with open(self.path, "rb") as file:
+            await send(
+                {
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": offset,
+                    # Send exactly the Content-Length announced in the headers
+                    "count": count,
+                    "more_body": False,
+                }
+            )
+        if self.background is not None:
+            await self.background()
+
+
+class _LargeFileResponse(_ZeroCopyFileResponse):
+    """
+    FileResponse that reads 1 MiB per chunk instead of 64 KiB.
+
+    Memory per response stays bounded by the chunk size, while a large
+    GeoJSON needs 16x fewer thread-pool reads and ASGI sends.
+    """
+
+    chunk_size = 1024 * 1024
+
+
+# Extensions for which a pre-compressed ``.gz`` companion may exist
+_GZIP_SUFFIXES = frozenset({".json", ".geojson", ".html"})
+
+
+# MIME type of each served file extension (lower case)
+_MIME_TYPES: Mapping[str, str] = MappingProxyType(
+    {
+        ".json": "application/json",
+        ".geojson": "application/geo+json",
+        ".html": "text/html",
+        ".png": "image/png",
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".svg": "image/svg+xml",
+        ".csv": "text/csv",
+        ".txt": "text/plain",
+    }
+)
+
 
 def resolve_city_base(city: str) -> Path:
     """
@@ -25,74 +174,261 @@ def resolve_city_base(city: str) -> Path:
     otherwise fall back to the base directory.
     """
     city_dir = OUTPUT_BASE_DIR / city
-    if city_dir.exists() and city_dir.is_dir():
-        return city_dir
-    return OUTPUT_BASE_DIR
+    # is_dir() is False for missing paths, so one stat answers both questions
+    return city_dir if city_dir.is_dir() else OUTPUT_BASE_DIR
+
 
+@lru_cache(maxsize=8)
+def _resolved_base(base: Path) -> Path:
+    """
+    Resolve the output base directory once rather than on every request.
 
-def validate_path(file_path: Path) -> None:
+    :param base: The configured output base directory
+    :return: Its absolute, symlink-free path
+    """
+    return base.resolve()
+
+
+def validate_path(file_path: Path) -> Tuple[Path, os.stat_result]:
     """
     Validate that a file path is safe and exists.
 
-    Prevents directory traversal attacks and ensures files exist.
+    Prevents directory traversal attacks and ensures files exist. Callers
+    serve the returned resolved path rather than the requested one, so a
+    symlink swapped in after the check is never followed. The stat result
+    is returned so the response can reuse it instead of stat-ing the file
+    again.
 
     :param file_path: Path to validate
+    :return: The resolved path and its stat result
     :raises HTTPException: 400 if path is invalid, 404 if not found
     """
     # Resolve to absolute path to prevent directory traversal
     try:
         resolved = file_path.resolve()
-        base_resolved = OUTPUT_BASE_DIR.resolve()
 
-        # Ensure the resolved path is within the output directory
-        if not str(resolved).startswith(str(base_resolved)):
+        # Ensure the resolved path is within the output directory; unlike a
+        # string prefix test this rejects siblings such as "overpass_data2"
+        if not resolved.is_relative_to(_resolved_base(OUTPUT_BASE_DIR)):
             raise HTTPException(
                 status_code=400,
                 detail="Invalid file path: directory traversal not allowed",
             )
 
-        # Check if file exists
-        if not resolved.exists():
+        # One stat call answers both "exists" and "is a file"
+        try:
+            st = resolved.stat()
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Check if it's a file (not a directory)
-        if not resolved.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise HTTPException(status_code=400, detail="Path is not a file")
 
     except (ValueError, OSError) as e:
         logger.error(f"Path validation error: {e}")
         raise HTTPException(status_code=400, detail="Invalid file path")
 
+    return resolved, st
+
+
+@lru_cache(maxsize=256)
+def _mime_for_suffix(suffix: str) -> str:
+    """
+    :param suffix: File extension as it appears in the name, e.g. ".GeoJSON"
+    :return: MIME type string
+    """
+    return _MIME_TYPES.get(suffix.lower(), "application/octet-stream")
 
-def get_mime_type(file_path: Path) -> str:
+
+def get_mime_type(file_path: Union[Path, str]) -> str:
     """
     Determine MIME type based on file extension.
 
-    :param file_path: Path to file
+    Only the text after the last dot is looked up, taken with a plain string
+    split rather than through PurePath.
+
+    :param file_path: Path to file, or just its name
     :return: MIME type string
     """
-    extension = file_path.suffix.lower()
+    name = file_path.name if isinstance(file_path, Path) else file_path
+    stem, dot, ext = name.rpartition(".")
+    # Like Path.suffix, a leading dot (".env") is not an extension
+    return _mime_for_suffix(dot + ext if stem else "")
 
-    mime_types = {
-        ".json": "application/json",
-        ".geojson": "application/geo+json",
-        ".html": "text/html",
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".svg": "image/svg+xml",
-        ".csv": "text/csv",
-        ".txt": "text/plain",
+
+def _etag(st: os.stat_result) -> str:
+    """
+    :param st: Stat result of an output file
+    :return: Weak validator derived from size and modification time
+    """
+    return f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag.
+
+    :param if_none_match: The request header, if any
+    :param etag: The current ETag of the file
+    :return: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag == "*" or tag.removeprefix("W/") == opaque
+        for tag in (t.strip() for t in if_none_match.split(","))
+    )
+
+
+def _unmodified_since(if_modified_since: Optional[str], st: os.stat_result) -> bool:
+    """
+    Check an If-Modified-Since header against a file's modification time.
+
+    :param if_modified_since: The request header, if any
+    :param st: Stat result of the file
+    :return: True if the file has not changed since the given date
+    """
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return since.tzinfo is not None and int(st.st_mtime) <= since.timestamp()
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    :param accept_encoding: The request's Accept-Encoding header, if any
+    :return: True if gzip is listed without q=0
+    """
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() in ("gzip", "x-gzip"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def _gzip_companion(
+    file_path: Path, st: os.stat_result
+) -> Optional[Tuple[Path, os.stat_result]]:
+    """
+    Find an up-to-date pre-compressed copy of an output file.
+
+    :param file_path: Validated path inside OUTPUT_BASE_DIR
+    :param st: Stat result of file_path
+    :return: (companion path, its stat result), or None if there is no
+             companion or it is older than the file
+    """
+    if file_path.suffix.lower() not in _GZIP_SUFFIXES:
+        return None
+    gz_path = file_path.with_name(file_path.name + ".gz")
+    try:
+        gz_st = gz_path.stat()
+    except OSError:
+        return None
+    if gz_st.st_mtime_ns < st.st_mtime_ns:
+        return None
+    return gz_path, gz_st
+
+
+def file_response(
+    file_path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    request_headers: Optional[Mapping[str, str]] = None,
+    stat_result: Optional[os.stat_result] = None,
+) -> Response:
+    """
+    Build the response for a validated output file.
+
+    When a current ``.gz`` companion exists and the client accepts gzip, the
+    companion is sent with Content-Encoding: gzip instead, so compression
+    costs nothing per request. Clients that already hold the current version
+    (If-None-Match matches the ETag or, without If-None-Match, the file is
+    unchanged since If-Modified-Since) get an empty 304. With USE_XACCEL the
+    body is left empty and nginx serves the file from its internal location;
+    otherwise the server sends it with zero-copy where supported, or it is
+    streamed in chunks by FileResponse, with larger chunks for large files.
+
+    :param file_path: Validated path inside OUTPUT_BASE_DIR
+    :param media_type: MIME type of the file
+    :param filename: Offer the file as a download under this name
+    :param headers: Extra response headers
+    :param request_headers: The request's headers (lower-case names), read
+        for If-None-Match, If-Modified-Since and Accept-Encoding
+    :param stat_result: Stat result from validate_path, to avoid a second stat
+    :return: The response
+    """
+    request_headers = request_headers or {}
+    if_none_match = request_headers.get("if-none-match")
+    # One stat serves the ETag and the response headers
+    st = stat_result if stat_result is not None else file_path.stat()
+    headers = dict(headers or {})
+    # Behind nginx, gzip_static picks the companion itself
+    companion = None if USE_XACCEL else _gzip_companion(file_path, st)
+    if companion is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if _accepts_gzip(request_headers.get("accept-encoding")):
+            # The companion's own stat gives the encoded variant its own ETag
+            file_path, st = companion
+            headers["Content-Encoding"] = "gzip"
+
+    etag = _etag(st)
+    cache_headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": _CACHE_CONTROL,
     }
+    # If-None-Match takes precedence; If-Modified-Since only applies without it
+    if (
+        _etag_matches(if_none_match, etag)
+        if if_none_match
+        else _unmodified_since(request_headers.get("if-modified-since"), st)
+    ):
+        if "Vary" in headers:
+            cache_headers["Vary"] = headers["Vary"]
+        return Response(status_code=304, headers=cache_headers)
+    headers.update(cache_headers)
+
+    if not USE_XACCEL:
+        response_class = (
+            _LargeFileResponse
+            if st.st_size > _LARGE_FILE_BYTES
+            else _ZeroCopyFileResponse
+        )
+        return response_class(
+            path=file_path,
+            media_type=media_type,
+            filename=filename,
+            headers=headers,
+            stat_result=st,
+        )
 
-    return mime_types.get(extension, "application/octet-stream")
+    relative = file_path.resolve().relative_to(_resolved_base(OUTPUT_BASE_DIR))
+    headers["X-Accel-Redirect"] = XACCEL_PREFIX + quote(relative.as_posix())
+    if filename is not None:
+        # Same Content-Disposition as FileResponse would send
+        quoted = quote(filename)
+        if quoted != filename:
+            headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted}"
+        else:
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return Response(media_type=media_type, headers=headers)
 
 
 @router.get("/{city}/geojson")
-async def get_city_geojson(city: str, enriched: bool = True):
+async def get_city_geojson(request: Request, city: str, enriched: bool = True):
     """
     Get GeoJSON file for a city.
 
+    :param request: The incoming request (for conditional and
+        Accept-Encoding headers)
     :param city: City name
     :param enriched: Return enriched GeoJSON (default) or raw scraped data
     :return: GeoJSON file
@@ -104,20 +440,24 @@ async def get_city_geojson(city: str, enriched: bool = True):
     else:
         file_path = base / f"{city}.json"
 
-    validate_path(file_path)
+    resolved, st = validate_path(file_path)
 
-    return FileResponse(
-        path=file_path,
-        media_type=get_mime_type(file_path),
+    return file_response(
+        resolved,
+        get_mime_type(file_path),
         filename=file_path.name,
+        request_headers=request.headers,
+        stat_result=st,
     )
 
 
 @router.get("/{city}/map")
-async def get_city_map(city: str, map_type: str = "heatmap"):
+async def get_city_map(request: Request, city: str, map_type: str = "heatmap"):
     """
     Get interactive map HTML for a city.
 
+    :param request: The incoming request (for conditional and
+        Accept-Encoding headers)
     :param city: City name
     :param map_type: Type of map (heatmap, hotspots)
     :return: HTML map file
@@ -137,20 +477,26 @@ async def get_city_map(city: str, map_type: str = "heatmap"):
         )
 
     file_path = base / map_files[map_type]
-    validate_path(file_path)
+    resolved, st = validate_path(file_path)
 
-    return FileResponse(
-        path=file_path,
-        media_type="text/html",
+    return file_response(
+        resolved,
+        "text/html",
         headers={"Content-Disposition": f"inline; filename={file_path.name}"},
+        request_headers=request.headers,
+        stat_result=st,
     )
 
 
 @router.get("/{city}/route/{route_id}")
-async def get_route_by_id(city: str, route_id: str, filetype: str = "map"):
+async def get_route_by_id(
+    request: Request, city: str, route_id: str, filetype: str = "map"
+):
     """
     Get a specific route by route_id.
 
+    :param request: The incoming request (for conditional and
+        Accept-Encoding headers)
     :param city: City name
     :param route_id: Unique route identifier (hash)
     :param filetype: Output format (map, geojson)
@@ -169,20 +515,24 @@ async def get_route_by_id(city: str, route_id: str, filetype: str = "map"):
             status_code=400, detail="Invalid filetype. Choose from: map, geojson"
         )
 
-    validate_path(file_path)
+    resolved, st = validate_path(file_path)
 
-    return FileResponse(
-        path=file_path,
-        media_type=get_mime_type(file_path),
+    return file_response(
+        resolved,
+        get_mime_type(file_path),
         headers={"Content-Disposition": f"inline; filename={file_path.name}"},
+        request_headers=request.headers,
+        stat_result=st,
     )
 
 
 @router.get("/{city}/charts")
-async def get_city_charts(city: str, chart: str):
+async def get_city_charts(request: Request, city: str, chart: str):
     """
     Get statistics for a city.
 
+    :param request: The incoming request (for conditional and
+        Accept-Encoding headers)
     :param city: City name
     :param chart: The desired chart (privacy, sensitivity)
     :return: Statistics file (PNG chart)
@@ -199,62 +549,78 @@ async def get_city_charts(city: str, chart: str):
             detail="Invalid chart type. Choose from: privacy, sensitivity",
         )
 
-    validate_path(file_path)
+    resolved, st = validate_path(file_path)
 
-    return FileResponse(
-        path=file_path,
-        media_type=get_mime_type(file_path),
+    return file_response(
+        resolved,
+        get_mime_type(file_path),
         filename=file_path.name,
+        request_headers=request.headers,
+        stat_result=st,
     )
 
 
-@router.get("/{city}/list")
-async def list_city_files(city: str):
+@router.get("/{city}/list", response_model=CityFilesResponse)
+async def list_city_files(city: str) -> CityFilesResponse:
     """
     List all available files for a city.
 
+    The response model lets FastAPI serialize straight to JSON bytes through
+    pydantic-core instead of encoding a dict with the stdlib json module.
+
     :param city: City name
     :return: JSON list of available files with metadata
     """
     base = resolve_city_base(city)
     city_files = []
 
-    # Scan output directory for files matching the city name
-    if not base.exists():
-        return JSONResponse(content={"city": city, "files": []})
-
-    for file_path in base.glob(f"{city.lower()}*"):
-        if file_path.is_file():
-            stat = file_path.stat()
+    # One directory scan; is_file() comes from the readdir entry type and
+    # symlinks are neither followed nor listed, so a link cannot expose
+    # metadata of files outside the output directory
+    prefix = city.lower()
+    try:
+        entries = os.scandir(base)
+    except FileNotFoundError:
+        return CityFilesResponse(city=city, file_count=0, files=[])
+    with entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix):
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            # Pre-compressed companions are a transfer detail, not outputs
+            if entry.name.endswith(".gz"):
+                continue
+            st = entry.stat(follow_symlinks=False)
             city_files.append(
-                {
-                    "name": file_path.name,
-                    "path": f"/outputs/{file_path.name}",
-                    "size_bytes": stat.st_size,
-                    "modified": stat.st_mtime,
-                    "type": get_mime_type(file_path),
-                }
+                CityFileInfo(
+                    name=entry.name,
+                    path=f"/outputs/{entry.name}",
+                    size_bytes=st.st_size,
+                    modified=st.st_mtime,
+                    type=get_mime_type(entry.name),
+                )
             )
 
     if not city_files:
         raise HTTPException(status_code=404, detail=f"No files found for city: {city}")
 
-    return JSONResponse(
-        content={
-            "city": city,
-            "file_count": len(city_files),
-            "files": sorted(city_files, key=lambda x: x["modified"], reverse=True),
-        }
+    return CityFilesResponse(
+        city=city,
+        file_count=len(city_files),
+        files=sorted(city_files, key=lambda x: x.modified, reverse=True),
     )
 
 
 @router.get("/file/{filename}")
-async def get_file_by_name(city: str, filename: str):
+async def get_file_by_name(request: Request, city: str, filename: str):
     """
     Get any file by filename from the output directory.
 
     This is a generic endpoint for accessing any generated file.
 
+    :param request: The incoming request (for conditional and
+        Accept-Encoding headers)
     :param city: The name of the city for which the file was generated
     :param filename: Name of the file to retrieve
     :return: Requested file
@@ -266,10 +632,12 @@ async def get_file_by_name(city: str, filename: str):
 
     base = resolve_city_base(city)
     file_path = base / filename
-    validate_path(file_path)
+    resolved, st = validate_path(file_path)
 
-    return FileResponse(
-        path=file_path,
-        media_type=get_mime_type(file_path),
+    return file_response(
+        resolved,
+        get_mime_type(file_path),
         filename=file_path.name,
+        request_headers=request.headers,
+        stat_result=st,
     )
@@ -6,11 +6,16 @@ including scraping, analysis, and optional routing.
 """
 
 import asyncio
-from datetime import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import List, Tuple
+
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 
-from src.api.models.requests import PipelineRequest
-from src.api.models.responses import TaskResponse, TaskStatus
+from src.api.models.requests import BatchPipelineRequest, PipelineRequest
+from src.api.models.responses import TaskResponse, TaskStatus, TaskStatusResponse
 from src.api.services.task_manager import task_manager
 from src.api.services.websocket_manager import ws_manager
 from src.orchestration.langchain_pipeline import create_pipeline
@@ -18,6 +23,49 @@ from src.config.logger import logger
 
 router = APIRouter(prefix="/pipeline")
 
+# Dedicated threads for pipeline runs. A run can take minutes, so running it in
+# the event loop's default executor would starve other asyncio.to_thread users
+# (e.g. scraper fetches) whenever a batch of cities is in progress.
+_PIPELINE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PIPELINE_WORKERS", "0")) or os.cpu_count(),
+    thread_name_prefix="pipeline",
+)
+
+
+def _now_iso() -> str:
+    """
+    :return: Current UTC time as ISO 8601 with millisecond precision
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+async def _broadcast(
+    task_id: str, kind: str, stage: str, progress: int, message: str
+) -> None:
+    """
+    Send a progress message to the WebSocket clients watching a task.
+
+    Nothing is built when no client is connected, which is the common case.
+
+    :param task_id: Task identifier
+    :param kind: Message type (progress, completed, failed, cancelled)
+    :param stage: Pipeline stage
+    :param progress: Progress percentage (0-100)
+    :param message: Human-readable status message
+    """
+    if not ws_manager.get_connection_count(task_id):
+        return
+    await ws_manager.broadcast_progress(
+        task_id,
+        {
+            "type": kind,
+            "stage": stage,
+            "progress": progress,
+            "message": message,
+            "timestamp": _now_iso(),
+        },
+    )
+
 
 async def _check_and_broadcast_cancellation(task_id: str, stage: str) -> bool:
     """
@@ -27,17 +75,10 @@ async def _check_and_broadcast_cancellation(task_id: str, stage: str) -> bool:
     :param stage: Current pipeline stage for logging
     :return: True if task was cancelled, False otherwise
     """
-    if task_manager.is_cancelled(task_id):
+    if await asyncio.to_thread(task_manager.is_cancelled, task_id):
         logger.info(f"Pipeline task {task_id} cancelled at stage: {stage}")
-        await ws_manager.broadcast_progress(
-            task_id,
-            {
-                "type": "cancelled",
-                "stage": "cancelled",
-                "progress": 0,
-                "message": "Pipeline cancelled by user",
-                "timestamp": datetime.now().isoformat(),
-            },
+        await _broadcast(
+            task_id, "cancelled", "cancelled", 0, "Pipeline cancelled by user"
         )
         return True
     return False
@@ -48,25 +89,23 @@ async def execute_pipeline_task(task_id: str, request: PipelineRequest) -> None:
     Execute pipeline in background with real-time progress updates.
 
     This function runs the SurveillancePipeline asynchronously and broadcasts
-    progress updates via WebSocket to connected clients.
+    progress updates via WebSocket to connected clients. Task store calls may
+    hit a database, so they run in worker threads.
 
     :param task_id: Task identifier
     :param request: Pipeline request parameters
     """
     try:
-        task_manager.mark_running(task_id)
+        await asyncio.to_thread(task_manager.mark_running, task_id)
         logger.info(f"Starting pipeline task {task_id} for {request.city}")
 
         # Broadcast initialization
-        await ws_manager.broadcast_progress(
+        await _broadcast(
             task_id,
-            {
-                "type": "progress",
-                "stage": "initializing",
-                "progress": 0,
-                "message": f"Initializing pipeline for {request.city}",
-                "timestamp": datetime.now().isoformat(),
-            },
+            "progress",
+            "initializing",
+            0,
+            f"Initializing pipeline for {request.city}",
         )
 
         # Check for cancellation before starting
@@ -93,16 +132,15 @@ async def execute_pipeline_task(task_id: str, request: PipelineRequest) -> None:
             return
 
         # Broadcast scraping stage
-        task_manager.update_progress(task_id, 20, "Scraping surveillance data...")
-        await ws_manager.broadcast_progress(
+        await asyncio.to_thread(
+            task_manager.update_progress, task_id, 20, "Scraping surveillance data..."
+        )
+        await _broadcast(
             task_id,
-            {
-                "type": "progress",
-                "stage": "scraping",
-                "progress": 20,
-                "message": "Downloading surveillance data from OpenStreetMap",
-                "timestamp": datetime.now().isoformat(),
-            },
+            "progress",
+            "scraping",
+            20,
+            "Downloading surveillance data from OpenStreetMap",
         )
 
         # Create and run pipeline with cancellation support
@@ -118,88 +156,101 @@ async def execute_pipeline_task(task_id: str, request: PipelineRequest) -> None:
             return
 
         # Broadcast analysis stage
-        task_manager.update_progress(task_id, 50, "Analyzing data...")
-        await ws_manager.broadcast_progress(
+        await asyncio.to_thread(
+            task_manager.update_progress, task_id, 50, "Analyzing data..."
+        )
+        await _broadcast(
             task_id,
-            {
-                "type": "progress",
-                "stage": "analyzing",
-                "progress": 50,
-                "message": "Analyzing surveillance infrastructure",
-                "timestamp": datetime.now().isoformat(),
-            },
+            "progress",
+            "analyzing",
+            50,
+            "Analyzing surveillance infrastructure",
         )
 
         # Execute the pipeline in a thread pool to avoid blocking the event loop
         # This allows cancellation checks to respond immediately
-        results = await asyncio.to_thread(pipeline.run, request.city, **run_kwargs)
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            _PIPELINE_POOL, partial(pipeline.run, request.city, **run_kwargs)
+        )
 
         # Check the actual pipeline status and handle accordingly
         status = results.get("status")
 
         if status == "cancelled":
             # Task was cancelled during execution
-            task_manager.mark_cancelled(task_id)
-            await ws_manager.broadcast_progress(
-                task_id,
-                {
-                    "type": "cancelled",
-                    "stage": "cancelled",
-                    "progress": 0,
-                    "message": "Pipeline cancelled by user",
-                    "timestamp": datetime.now().isoformat(),
-                },
+            await asyncio.to_thread(task_manager.mark_cancelled, task_id)
+            await _broadcast(
+                task_id, "cancelled", "cancelled", 0, "Pipeline cancelled by user"
             )
             logger.info(f"Pipeline task {task_id} cancelled")
         elif status in ["failed", "partial"]:
             # Task failed or partially completed
             error_msg = results.get("error", "Unknown error")
-            task_manager.mark_failed(task_id, error_msg)
-            await ws_manager.broadcast_progress(
-                task_id,
-                {
-                    "type": "failed",
-                    "stage": "failed",
-                    "progress": 0,
-                    "message": f"Pipeline {status}: {error_msg}",
-                    "timestamp": datetime.now().isoformat(),
-                },
+            await asyncio.to_thread(task_manager.mark_failed, task_id, error_msg)
+            await _broadcast(
+                task_id, "failed", "failed", 0, f"Pipeline {status}: {error_msg}"
             )
             logger.warning(f"Pipeline task {task_id} {status}: {error_msg}")
         else:
             # Task completed successfully
-            task_manager.mark_completed(task_id, results)
-            await ws_manager.broadcast_progress(
+            await asyncio.to_thread(task_manager.mark_completed, task_id, results)
+            await _broadcast(
                 task_id,
-                {
-                    "type": "completed",
-                    "stage": "completed",
-                    "progress": 100,
-                    "message": "Pipeline completed successfully",
-                    "timestamp": datetime.now().isoformat(),
-                },
+                "completed",
+                "completed",
+                100,
+                "Pipeline completed successfully",
             )
             logger.info(f"Pipeline task {task_id} completed successfully")
 
     except Exception as e:
         logger.error(f"Pipeline task {task_id} failed: {e}")
-        task_manager.mark_failed(task_id, str(e))
+        await asyncio.to_thread(task_manager.mark_failed, task_id, str(e))
 
         # Broadcast failure
-        await ws_manager.broadcast_progress(
-            task_id,
-            {
-                "type": "failed",
-                "stage": "failed",
-                "progress": 0,
-                "message": f"Pipeline failed: {str(e)}",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
+        await _broadcast(task_id, "failed", "failed", 0, f"Pipeline failed: {str(e)}")
+
+
+def _create_pipeline_task(request: PipelineRequest) -> Tuple[str, TaskResponse]:
+    """
+    Register a pipeline task for a request.
+
+    :param request: Pipeline configuration
+    :return: (task_id, task creation response)
+    """
+    task_id = task_manager.create_task(
+        "pipeline",
+        metadata={
+            "city": request.city,
+            "country": request.country,
+            "scenario": request.scenario.value,
+        },
+    )
+    return task_id, TaskResponse(
+        task_id=task_id,
+        status=TaskStatus.PENDING,
+        message=f"Pipeline started for {request.city}",
+    )
+
+
+async def execute_pipeline_batch(tasks: List[Tuple[str, PipelineRequest]]) -> None:
+    """
+    Execute several pipeline tasks concurrently.
+
+    Background tasks run one after another, so a batch is scheduled as a
+    single task that gathers its pipelines; total time then tracks the
+    slowest city rather than the sum over cities.
+
+    :param tasks: (task_id, request) pairs
+    """
+    await asyncio.gather(
+        *(execute_pipeline_task(task_id, request) for task_id, request in tasks)
+    )
 
 
 @router.post("/run", response_model=TaskResponse)
-async def run_pipeline(
+def run_pipeline(
     request: PipelineRequest, background_tasks: BackgroundTasks
 ) -> TaskResponse:
     """
@@ -212,31 +263,49 @@ async def run_pipeline(
     :param background_tasks: FastAPI background tasks handler
     :return: Task creation response with task_id
     """
-    # Create task
-    task_id = task_manager.create_task(
-        "pipeline",
-        metadata={
-            "city": request.city,
-            "country": request.country,
-            "scenario": request.scenario.value,
-        },
-    )
+    task_id, response = _create_pipeline_task(request)
 
     # Schedule background execution
     background_tasks.add_task(execute_pipeline_task, task_id, request)
 
-    return TaskResponse(
-        task_id=task_id,
-        status=TaskStatus.PENDING,
-        message=f"Pipeline started for {request.city}",
+    return response
+
+
+@router.post("/run_batch", response_model=List[TaskResponse])
+def run_pipeline_batch(
+    request: BatchPipelineRequest, background_tasks: BackgroundTasks
+) -> List[TaskResponse]:
+    """
+    Start pipeline executions for several cities that run concurrently.
+
+    Every item gets its own task; track each via GET /api/v1/pipeline/{task_id}.
+
+    :param request: One pipeline configuration per city
+    :param background_tasks: FastAPI background tasks handler
+    :return: Task creation responses, in request order
+    """
+    created = [_create_pipeline_task(item) for item in request.items]
+
+    background_tasks.add_task(
+        execute_pipeline_batch,
+        [(task_id, item) for (task_id, _), item in zip(created, request.items)],
     )
 
+    return [response for _, response in created]
 
-@router.get("/{task_id}")
-async def get_pipeline_status(task_id: str):
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskStatusResponse,
+    response_model_exclude_none=True,
+)
+def get_pipeline_status(task_id: str):
     """
     Get pipeline task status and results.
 
+    Fields that are still null (result, error, started_at, completed_at while
+    the task is pending) are left out, which keeps frequent polls small.
+
     :param task_id: Task identifier
     :return: Task status with results (if completed)
     :raises HTTPException: 404 if task not found
@@ -250,7 +319,7 @@ async def get_pipeline_status(task_id: str):
 
 
 @router.post("/{task_id}/cancel")
-async def cancel_pipeline(task_id: str):
+def cancel_pipeline(task_id: str):
     """
     Cancel a running pipeline task.
 
@@ -282,7 +351,7 @@ async def cancel_pipeline(task_id: str):
 
 
 @router.delete("/{task_id}")
-async def delete_pipeline_task(task_id: str):
+def delete_pipeline_task(task_id: str):
     """
     Delete a pipeline task and its results.
 
@@ -1,15 +1,26 @@
 """
 Task management service for background job tracking.
 
-This module provides in-memory task tracking for asynchronous pipeline operations.
+This module provides task tracking for asynchronous pipeline operations.
 Tasks can be created, updated, and queried by their unique identifiers.
+They are kept in memory by default; set TASK_STORE_URL to a database URL to
+share them between server workers.
 """
 
-from typing import Dict, Any, Optional
+import os
+import time
+from typing import Dict, Any, Optional, Protocol
 from uuid import uuid4
-from datetime import datetime
+
+import orjson
+from sqlalchemy import Engine, delete, update
+from sqlmodel import Session, SQLModel
 
 from src.api.models.responses import TaskStatus
+from src.config.logger import logger
+from src.config.settings import DatabaseSettings
+from src.memory.models import TaskRecord
+from src.utils.db import enable_sqlite_wal, get_engine
 
 
 class Task:
@@ -33,16 +44,17 @@ class Task:
         self.progress = 0
         self.result = None
         self.error = None
-        self.created_at = datetime.now()
-        self.started_at = None
-        self.completed_at = None
+        # Epoch seconds; formatted to ISO 8601 only in API responses
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
         self.metadata: Dict[str, Any] = {}
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert task to dictionary representation.
 
-        :return: Dictionary with all task fields
+        :return: Dictionary with all task fields; timestamps are epoch seconds
         """
         return {
             "id": self.id,
@@ -51,26 +63,186 @@ class Task:
             "progress": self.progress,
             "result": self.result,
             "error": self.error,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat()
-            if self.completed_at
-            else None,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
             "metadata": self.metadata,
         }
 
 
+class TaskStore(Protocol):
+    """Storage backend for tasks, keyed by task ID."""
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """
+        :param task_id: Task identifier
+        :return: The task, or None if unknown
+        """
+        ...
+
+    def put(self, task: Task) -> None:
+        """
+        :param task: Task to add (or replace)
+        """
+        ...
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        :param task_id: Task identifier
+        :param fields: Task attributes to set; ``last_message`` sets that
+            metadata key without rewriting the rest of the metadata
+        :return: True if the task exists
+        """
+        ...
+
+    def delete(self, task_id: str) -> bool:
+        """
+        :param task_id: Task identifier
+        :return: True if the task existed
+        """
+        ...
+
+
+class InMemoryTaskStore:
+    """Tasks in a dict of this process; each server worker has its own."""
+
+    def __init__(self) -> None:
+        self.tasks: Dict[str, Task] = {}
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def put(self, task: Task) -> None:
+        self.tasks[task.id] = task
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        for name, value in fields.items():
+            if name == "last_message":
+                task.metadata = {**task.metadata, "last_message": value}
+            else:
+                setattr(task, name, value)
+        return True
+
+    def delete(self, task_id: str) -> bool:
+        return self.tasks.pop(task_id, None) is not None
+
+
+class DatabaseTaskStore:
+    """
+    Tasks in a SQL table, so every server worker sees the same tasks.
+
+    Updates only write the changed columns instead of the whole task; the
+    last progress message has its own column, so progress updates never
+    read-modify-write the metadata. Calls block on the database, so async
+    code runs them in a worker thread.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """
+        Initialize the store on a database engine.
+
+        :param engine: SQLAlchemy engine
+        """
+        self.engine = engine
+        enable_sqlite_wal(engine)
+        SQLModel.metadata.create_all(engine, tables=[TaskRecord.__table__])
+
+    @staticmethod
+    def _columns(fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :param fields: Task attributes
+        :return: The matching TaskRecord column values
+        """
+        columns = {}
+        for name, value in fields.items():
+            if name == "status":
+                columns["status"] = TaskStatus(value).value
+            elif name == "result":
+                columns["result_json"] = (
+                    None if value is None else orjson.dumps(value).decode()
+                )
+            elif name == "metadata":
+                metadata = dict(value)
+                columns["last_message"] = metadata.pop("last_message", None)
+                columns["metadata_json"] = orjson.dumps(metadata).decode()
+            else:
+                columns[name] = value
+        return columns
+
+    def get(self, task_id: str) -> Optional[Task]:
+        with Session(self.engine) as session:
+            record = session.get(TaskRecord, task_id)
+        if record is None:
+            return None
+        task = Task(record.id, record.type)
+        task.status = TaskStatus(record.status)
+        task.progress = record.progress
+        task.result = (
+            None if record.result_json is None else orjson.loads(record.result_json)
+        )
+        task.error = record.error
+        task.created_at = record.created_at
+        task.started_at = record.started_at
+        task.completed_at = record.completed_at
+        task.metadata = orjson.loads(record.metadata_json)
+        if record.last_message is not None:
+            task.metadata["last_message"] = record.last_message
+        return task
+
+    def put(self, task: Task) -> None:
+        fields = task.to_dict()
+        record = TaskRecord(**self._columns(fields))
+        with Session(self.engine) as session:
+            session.merge(record)
+            session.commit()
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        statement = (
+            update(TaskRecord)
+            .where(TaskRecord.id == task_id)
+            .values(**self._columns(fields))
+        )
+        with self.engine.begin() as connection:
+            return connection.execute(statement).rowcount > 0
+
+    def delete(self, task_id: str) -> bool:
+        statement = delete(TaskRecord).where(TaskRecord.id == task_id)
+        with self.engine.begin() as connection:
+            return connection.execute(statement).rowcount > 0
+
+
+def create_task_store() -> TaskStore:
+    """
+    Create the task store configured by the TASK_STORE_URL environment variable.
+
+    :return: A DatabaseTaskStore on that URL, or an InMemoryTaskStore if unset
+    """
+    url = os.getenv("TASK_STORE_URL")
+    if not url:
+        return InMemoryTaskStore()
+    logger.info(f"Sharing tasks between workers through {url}")
+    return DatabaseTaskStore(get_engine(DatabaseSettings(url=url)))
+
+
 class TaskManager:
     """
-    Manages background tasks with in-memory storage.
+    Manages background tasks on a pluggable TaskStore.
 
-    This is a simple in-memory implementation. For production with multiple
-    workers, consider using Redis or a database for task storage.
+    The default InMemoryTaskStore only works with a single server worker;
+    with several workers use a DatabaseTaskStore, so a status request sees
+    the task whichever worker runs it.
     """
 
-    def __init__(self):
-        """Initialize the task manager with empty task storage."""
-        self.tasks: Dict[str, Task] = {}
+    def __init__(self, store: Optional[TaskStore] = None):
+        """
+        Initialize the task manager.
+
+        :param store: Task storage (defaults to an InMemoryTaskStore)
+        """
+        self.store: TaskStore = store or InMemoryTaskStore()
 
     def create_task(
         self, task_type: str, metadata: Optional[Dict[str, Any]] = None
@@ -86,7 +258,7 @@ class TaskManager:
         task = Task(task_id, task_type)
         if metadata:
             task.metadata = metadata
-        self.tasks[task_id] = task
+        self.store.put(task)
         return task_id
 
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -96,7 +268,7 @@ class TaskManager:
         :param task_id: Task identifier
         :return: Task object if found, None otherwise
         """
-        return self.tasks.get(task_id)
+        return self.store.get(task_id)
 
     def update_progress(
         self, task_id: str, progress: int, message: Optional[str] = None
@@ -108,10 +280,10 @@ class TaskManager:
         :param progress: Progress percentage (0-100)
         :param message: Optional progress message
         """
-        if task := self.tasks.get(task_id):
-            task.progress = progress
-            if message:
-                task.metadata["last_message"] = message
+        fields: Dict[str, Any] = {"progress": progress}
+        if message:
+            fields["last_message"] = message
+        self.store.update(task_id, fields)
 
     def mark_running(self, task_id: str) -> None:
         """
@@ -119,9 +291,9 @@ class TaskManager:
 
         :param task_id: Task identifier
         """
-        if task := self.tasks.get(task_id):
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now()
+        self.store.update(
+            task_id, {"status": TaskStatus.RUNNING, "started_at": time.time()}
+        )
 
     def mark_completed(self, task_id: str, result: Any) -> None:
         """
@@ -130,11 +302,15 @@ class TaskManager:
         :param task_id: Task identifier
         :param result: Task result data
         """
-        if task := self.tasks.get(task_id):
-            task.status = TaskStatus.COMPLETED
-            task.progress = 100
-            task.result = result
-            task.completed_at = datetime.now()
+        self.store.update(
+            task_id,
+            {
+                "status": TaskStatus.COMPLETED,
+                "progress": 100,
+                "result": result,
+                "completed_at": time.time(),
+            },
+        )
 
     def mark_failed(self, task_id: str, error: str) -> None:
         """
@@ -143,10 +319,10 @@ class TaskManager:
         :param task_id: Task identifier
         :param error: Error message
         """
-        if task := self.tasks.get(task_id):
-            task.status = TaskStatus.FAILED
-            task.error = error
-            task.completed_at = datetime.now()
+        self.store.update(
+            task_id,
+            {"status": TaskStatus.FAILED, "error": error, "completed_at": time.time()},
+        )
 
     def mark_cancelled(self, task_id: str) -> None:
         """
@@ -154,9 +330,9 @@ class TaskManager:
 
         :param task_id: Task identifier
         """
-        if task := self.tasks.get(task_id):
-            task.status = TaskStatus.CANCELLED
-            task.completed_at = datetime.now()
+        self.store.update(
+            task_id, {"status": TaskStatus.CANCELLED, "completed_at": time.time()}
+        )
 
     def is_cancelled(self, task_id: str) -> bool:
         """
@@ -165,7 +341,7 @@ class TaskManager:
         :param task_id: Task identifier
         :return: True if task is cancelled, False otherwise
         """
-        task = self.tasks.get(task_id)
+        task = self.store.get(task_id)
         return task.status == TaskStatus.CANCELLED if task else False
 
     def delete_task(self, task_id: str) -> bool:
@@ -175,11 +351,8 @@ class TaskManager:
         :param task_id: Task identifier
         :return: True if task was deleted, False if not found
         """
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-            return True
-        return False
+        return self.store.delete(task_id)
 
 
 # Global task manager instance
-task_manager = TaskManager()
+task_manager = TaskManager(create_task_store())
@@ -5,7 +5,10 @@ This module provides WebSocket connection management for broadcasting
 task progress updates to connected clients.
 """
 
+import asyncio
 from typing import Dict, List
+
+import orjson
 from fastapi import WebSocket
 
 from src.config.logger import logger
@@ -60,26 +63,28 @@ class WebSocketManager:
         """
         Broadcast progress update to all connected clients for a task.
 
-        Automatically removes dead connections that fail to receive updates.
+        The update is serialized once and sent to every client concurrently,
+        as the same JSON text frame send_json would produce. Dead connections
+        that fail to receive it are removed.
 
         :param task_id: Task identifier
         :param data: Progress data to send (will be JSON serialized)
         """
-        if task_id not in self.active_connections:
+        connections = list(self.active_connections.get(task_id, ()))
+        if not connections:
             return
 
-        dead_connections = []
-
-        for connection in self.active_connections[task_id]:
-            try:
-                await connection.send_json(data)
-            except Exception as e:
-                logger.debug(f"Failed to send to WebSocket: {e}")
-                dead_connections.append(connection)
+        payload = orjson.dumps(data).decode()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True,
+        )
 
         # Clean up dead connections
-        for conn in dead_connections:
-            self.disconnect(task_id, conn)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Failed to send to WebSocket: {result}")
+                self.disconnect(task_id, connection)
 
     def get_connection_count(self, task_id: str) -> int:
         """
@@ -1,12 +1,36 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Union
 
+import orjson
 from langchain_core.runnables import Runnable, RunnableLambda
 
 from src.config.logger import logger
 from src.llm.surveillance_llm import SurveillanceLLM
+from src.memory.enrich_cache import EnrichmentCache
 from src.memory.store import MemoryStore
-from src.utils.db import payload_hash
+from src.utils.db import canonical_json, tags_hash
+from src.utils.elements import Elements
+from src.utils.scheduler import run_step_graph
+
+# Charts are only rendered once statistics exist; the hotspot chart also needs
+# the hotspot clusters. Everything else is independent and may run in parallel.
+_VISUALIZATION_DEPENDENCIES = {
+    "pie_chart": {"stats"},
+    "zone_sensitivity": {"stats"},
+    "sensitivity_reasons": {"stats"},
+    "hotspots_chart": {"stats", "hotspots"},
+}
+
+# pyplot keeps global figure state and is not thread-safe
+_PLOT_LOCK = threading.Lock()
+
+# Capacity of the queues between enrichment pipeline stages
+_QUEUE_SIZE = 64
 
 
 class AnalysisChain:
@@ -16,7 +40,7 @@ class AnalysisChain:
     Implements a structured pipeline:
     1. Load → Check cache → Load or skip
     2. Enrich → Use LLM to analyze each element
-    3. Save → Persist enriched data
+    3. Save → Persist enriched data, streamed to disk during enrichment
     4. Transform → Generate GeoJSON
     5. Visualize → Create requested outputs
 
@@ -32,6 +56,9 @@ class AnalysisChain:
         llm: SurveillanceLLM,
         memory: MemoryStore,
         agent_name: str,
+        concurrency: int = 16,
+        batch_size: int = 16,
+        enrich_cache: Optional[EnrichmentCache] = None,
     ):
         """
         Initialize the analysis chain.
@@ -39,10 +66,16 @@ class AnalysisChain:
         :param llm: SurveillanceLLM instance for enrichment
         :param memory: MemoryStore for caching
         :param agent_name: Name for memory storage
+        :param concurrency: Maximum number of in-flight LLM enrichment requests
+        :param batch_size: Number of elements packed into one LLM request
+        :param enrich_cache: Optional per-tag cache of enrichment results
         """
         self.llm = llm
         self.memory = memory
         self.agent_name = agent_name
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.enrich_cache = enrich_cache
 
         # Build the core pipeline
         self.pipeline = self._build_pipeline()
@@ -70,22 +103,29 @@ class AnalysisChain:
         """
         Load raw surveillance data from file.
 
+        Elements are streamed from disk and hashed as they arrive, so the raw
+        document is parsed once and never held in memory as a whole.
+
         :param input_dict: Dictionary with 'path' key
-        :return: Updated dictionary with loaded elements
+        :return: Updated dictionary with loaded elements and their columns
         """
-        from src.tools.io_tools import load_overpass_elements
+        from src.tools.io_tools import iter_overpass_elements
 
         path = Path(input_dict["path"])
         logger.info(f"Loading data from {path}")
 
-        elements = load_overpass_elements(path)
-
-        # Calculate hash for caching
-        raw_hash = payload_hash({"elements": elements})
+        # Calculate hash for caching incrementally while parsing
+        hasher = hashlib.blake2b(digest_size=32)
+        elements = []
+        for element in iter_overpass_elements(path):
+            elements.append(element)
+            hasher.update(canonical_json(element))
+        raw_hash = hasher.hexdigest()
 
         return {
             **input_dict,
             "elements": elements,
+            "columns": Elements.from_elements(elements),
             "raw_hash": raw_hash,
             "element_count": len(elements),
         }
@@ -101,9 +141,12 @@ class AnalysisChain:
         enriched_path = path.with_name(f"{path.stem}_enriched.json")
         geojson_path = enriched_path.with_suffix(".geojson")
 
-        # Check filesystem
-        enriched_exists = enriched_path.exists()
-        geojson_exists = geojson_path.exists()
+        # Check filesystem with a single directory listing instead of a stat
+        # per candidate file
+        with os.scandir(path.parent) as entries:
+            names = {entry.name for entry in entries}
+        enriched_exists = enriched_path.name in names
+        geojson_exists = geojson_path.name in names
 
         context["enriched_path"] = str(enriched_path)
         context["geojson_path"] = str(geojson_path)
@@ -114,15 +157,17 @@ class AnalysisChain:
         raw_hash = context["raw_hash"]
         cache_hit = False
 
-        for mem in self.memory.load(self.agent_name):
-            if mem.step == "enriched_cache" and mem.content.startswith(raw_hash):
-                _, cached_enriched, cached_geojson = mem.content.split("|")
-                if Path(cached_enriched).exists() and Path(cached_geojson).exists():
-                    logger.debug(f"Cache hit for {path.name}")
-                    context["enriched_path"] = cached_enriched
-                    context["geojson_path"] = cached_geojson
-                    cache_hit = True
-                    break
+        cached = self.memory.find_cache(self.agent_name, "enriched_cache", raw_hash)
+        if cached:
+            _, cached_enriched, cached_geojson = cached.split("|")
+            if all(
+                p.name in names if p.parent == path.parent else p.exists()
+                for p in (Path(cached_enriched), Path(cached_geojson))
+            ):
+                logger.debug(f"Cache hit for {path.name}")
+                context["enriched_path"] = cached_enriched
+                context["geojson_path"] = cached_geojson
+                cache_hit = True
 
         context["cache_hit"] = cache_hit
 
@@ -140,47 +185,271 @@ class AnalysisChain:
         """
         # Skip if cache hit
         if context.get("cache_hit") or context.get("enriched_exists"):
-            import json
+            from src.tools.io_tools import load_json_file
 
-            enriched_path = Path(context["enriched_path"])
-            enriched_data = json.loads(enriched_path.read_text())
+            enriched_data = load_json_file(context["enriched_path"])
             context["enriched"] = enriched_data["elements"]
             logger.debug(f"Loaded {len(context['enriched'])} cached enriched elements")
             return context
 
-        # Enrich each element
         logger.info(f"Enriching {len(context['elements'])} elements...")
+        enriched = self._enrich_elements(
+            context["elements"], destination=Path(context["enriched_path"])
+        )
+
+        context["enriched"] = enriched
+        context["enriched_saved"] = True
+        logger.info(f"Successfully enriched {len(enriched)} elements")
+        return context
+
+    def _enrich_elements(
+        self,
+        elements: List[Dict[str, Any]],
+        destination: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Enrich elements once per distinct tag set.
+
+        Elements are grouped by tag hash so identical tag payloads cost a
+        single LLM request. Cached analyses are fetched in one lookup up
+        front; only the remaining tag sets are sent to the LLM, and their
+        successful results are cached afterwards.
+
+        :param elements: Raw OSM elements
+        :param destination: Optional file the enriched elements are streamed to
+        :return: Enriched elements in input order
+        """
+        groups: Dict[str, List[int]] = defaultdict(list)
+        keys = []
+        for i, element in enumerate(elements):
+            key = tags_hash(element.get("tags", {}))
+            groups[key].append(i)
+            keys.append(key)
+
+        analyses = self.enrich_cache.get_many(groups) if self.enrich_cache else {}
+        pending = [key for key in groups if key not in analyses]
+        logger.info(
+            f"{len(groups)} distinct tag sets: {len(analyses)} cached, "
+            f"{len(pending)} to enrich"
+        )
+
+        representatives = [elements[groups[key][0]] for key in pending]
+        enriched = asyncio.run(
+            self._enrich_pipeline(
+                elements, keys, analyses, pending, representatives, destination
+            )
+        )
+
+        if self.enrich_cache and pending:
+            self.enrich_cache.put_many(
+                {key: analyses[key] for key in pending if "error" not in analyses[key]}
+            )
+        return enriched
+
+    async def _enrich_pipeline(
+        self,
+        elements: List[Dict[str, Any]],
+        keys: List[str],
+        analyses: Dict[str, Dict[str, Any]],
+        pending: List[str],
+        representatives: List[Dict[str, Any]],
+        destination: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run enrichment and writing as overlapping pipeline stages.
+
+        The enrich stage resolves one future per pending tag set as results
+        arrive. Elements are emitted in input order as soon as their tag set
+        is known and handed to the writer through a bounded queue, so the
+        enriched file is assembled on disk while the LLM is still working.
+
+        :param elements: Raw OSM elements
+        :param keys: Tag hash of each element, aligned with ``elements``
+        :param analyses: Known analyses by tag hash; filled in place
+        :param pending: Tag hashes that still need enrichment
+        :param representatives: One element per pending tag hash
+        :param destination: Optional file the enriched elements are streamed to
+        :return: Enriched elements in input order
+        """
+        if pending and hasattr(self.llm, "awarm_up"):
+            await self.llm.awarm_up()
+
+        loop = asyncio.get_running_loop()
+        ready = {key: loop.create_future() for key in pending}
+
+        def on_chunk(start: int, results: List[Dict[str, Any]]) -> None:
+            for key, result in zip(pending[start:], results):
+                analyses[key] = result["analysis"]
+                ready[key].set_result(None)
+
+        def on_enrich_done(task: asyncio.Task) -> None:
+            # Unblock the emitter if enrichment dies before every key resolves
+            if task.cancelled() or task.exception() is None:
+                return
+            for future in ready.values():
+                if not future.done():
+                    future.set_exception(task.exception())
+
+        enrich = asyncio.create_task(
+            self._enrich_batch(representatives, on_chunk=on_chunk)
+        )
+        enrich.add_done_callback(on_enrich_done)
+
+        writes: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        writer = (
+            asyncio.create_task(self._write_enriched(writes, destination))
+            if destination
+            else None
+        )
+
         enriched = []
+        try:
+            for element, key in zip(elements, keys):
+                if key in ready:
+                    await ready[key]
+                item = {**element, "analysis": dict(analyses[key])}
+                enriched.append(item)
+                if writer:
+                    if writer.done():
+                        writer.result()
+                    await writes.put(item)
+            await enrich
+            if writer:
+                await writes.put(None)
+                await writer
+        except BaseException:
+            for task in (enrich, writer):
+                if task:
+                    task.cancel()
+            raise
+        return enriched
+
+    @staticmethod
+    async def _write_enriched(queue: asyncio.Queue, destination: Path) -> None:
+        """
+        Drain enriched elements from a queue into the enriched JSON file.
+
+        :param queue: Queue of enriched elements, terminated by None
+        :param destination: The enriched JSON file to write
+        """
+        from src.tools.io_tools import EnrichedElementsWriter
+
+        with EnrichedElementsWriter(destination) as sink:
+            while (element := await queue.get()) is not None:
+                sink.write(element)
+        logger.info(f"Saved {sink.count} enriched elements to {destination}")
+
+    async def _enrich_batch(
+        self,
+        elements: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_chunk: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Enrich elements on a bounded pool of concurrent workers.
+
+        A producer feeds chunk offsets into a bounded queue and ``concurrency``
+        workers drain it, so at most that many requests are in flight. When
+        the LLM supports batched analysis, elements are packed into chunks of
+        ``batch_size`` so each request covers several elements. Results are
+        written into a preallocated list by index so the output order always
+        matches the input order.
+
+        :param elements: Raw OSM elements
+        :param concurrency: Maximum in-flight requests (defaults to chain setting)
+        :param on_chunk: Optional callback receiving each chunk's offset and
+                         results as soon as it completes
+        :return: Enriched elements in input order
+        """
+        enriched: List[Optional[Dict[str, Any]]] = [None] * len(elements)
+        total = len(elements)
+        done = 0
 
-        for i, element in enumerate(context["elements"]):
-            try:
-                # Use LLM's analyze method if available, otherwise use surveillance analysis
-                if hasattr(self.llm, "analyze_surveillance_element"):
-                    metadata = self.llm.analyze_surveillance_element(element)
-                    analysis = metadata.model_dump(exclude_none=True)
+        batch_size = (
+            self.batch_size if hasattr(self.llm, "aanalyze_surveillance_batch") else 1
+        )
+        chunks = range(0, total, batch_size)
+        workers = min(concurrency or self.concurrency, len(chunks))
+        offsets: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+
+        async def produce() -> None:
+            for start in chunks:
+                await offsets.put(start)
+            for _ in range(workers):
+                await offsets.put(None)
+
+        async def consume() -> None:
+            nonlocal done
+            while (start := await offsets.get()) is not None:
+                chunk = elements[start : start + batch_size]
+                if len(chunk) > 1:
+                    results = await self._aenrich_chunk(chunk)
                 else:
-                    # Fallback to simple generation
-                    analysis = self._enrich_element_fallback(element)
+                    results = [await self._aenrich_element(chunk[0])]
+                enriched[start : start + len(chunk)] = results
+                if on_chunk:
+                    on_chunk(start, results)
+                previous, done = done, done + len(chunk)
+                if done // 10 > previous // 10:
+                    logger.debug(f"Enriched {done}/{total} elements")
+
+        await asyncio.gather(produce(), *(consume() for _ in range(workers)))
+        return enriched
+
+    async def _aenrich_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enrich a chunk of elements with one batched LLM request.
+
+        Falls back to per-element enrichment if the batched response cannot
+        be used (e.g. the model returned the wrong number of objects).
 
-                enriched_element = {**element, "analysis": analysis}
-                enriched.append(enriched_element)
+        :param chunk: Raw OSM elements
+        :return: Enriched elements in chunk order
+        """
+        try:
+            metadata = await self.llm.aanalyze_surveillance_batch(chunk)
+            return [
+                {**element, "analysis": meta.model_dump(exclude_none=True)}
+                for element, meta in zip(chunk, metadata)
+            ]
+        except Exception as e:
+            logger.warning(
+                f"Batched enrichment of {len(chunk)} elements failed, "
+                f"falling back to per-element requests: {e}"
+            )
+            return [await self._aenrich_element(element) for element in chunk]
 
-                if (i + 1) % 10 == 0:
-                    logger.debug(
-                        f"Enriched {i + 1}/{len(context['elements'])} elements"
-                    )
+    async def _aenrich_element(self, element: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enrich a single element, annotating it with an error on failure.
 
-            except Exception as e:
-                logger.warning(
-                    f"Failed to enrich element {element.get('id', 'unknown')}: {e}"
+        :param element: Raw OSM element
+        :return: Element with an 'analysis' key
+        """
+        try:
+            # Use LLM's analyze method if available, otherwise use surveillance analysis
+            if hasattr(self.llm, "aanalyze_surveillance_element"):
+                metadata = await self.llm.aanalyze_surveillance_element(element)
+                analysis = metadata.model_dump(exclude_none=True)
+            elif hasattr(self.llm, "analyze_surveillance_element"):
+                metadata = await asyncio.to_thread(
+                    self.llm.analyze_surveillance_element, element
+                )
+                analysis = metadata.model_dump(exclude_none=True)
+            else:
+                # Fallback to simple generation
+                analysis = await asyncio.to_thread(
+                    self._enrich_element_fallback, element
                 )
-                # Add element with error annotation
-                enriched_element = {**element, "analysis": {"error": str(e)}}
-                enriched.append(enriched_element)
 
-        context["enriched"] = enriched
-        logger.info(f"Successfully enriched {len(enriched)} elements")
-        return context
+            return {**element, "analysis": analysis}
+
+        except Exception as e:
+            logger.warning(
+                f"Failed to enrich element {element.get('id', 'unknown')}: {e}"
+            )
+            # Add element with error annotation
+            return {**element, "analysis": {"error": str(e)}}
 
     def _enrich_element_fallback(self, element: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -189,17 +458,18 @@ class AnalysisChain:
         :param element: Raw OSM element
         :return: Analysis dictionary
         """
-        import json
         from src.config.models.surveillance_metadata import SurveillanceMetadata
 
         # Use basic prompt
-        tags_json = json.dumps(element.get("tags", {}), ensure_ascii=False, indent=2)
+        tags_json = orjson.dumps(
+            element.get("tags", {}), option=orjson.OPT_INDENT_2
+        ).decode()
         prompt = f"Analyze these surveillance camera tags and return JSON: {tags_json}"
 
         try:
-            raw = self.llm.generate_response(prompt)
+            raw = self.llm.generate_response(prompt, expect_json=True)
             # Try to parse as JSON
-            enriched_fields = json.loads(raw)
+            enriched_fields = orjson.loads(raw)
             # Validate with schema
             meta = SurveillanceMetadata.from_raw(element, enriched_fields)
             return meta.model_dump(exclude_none=True)
@@ -220,6 +490,10 @@ class AnalysisChain:
             logger.debug("Skipping save (using cache)")
             return context
 
+        # Already streamed to disk during enrichment
+        if context.get("enriched_saved"):
+            return context
+
         from src.tools.io_tools import save_enriched_elements
 
         enriched_path = save_enriched_elements(context["enriched"], context["path"])
@@ -249,7 +523,8 @@ class AnalysisChain:
         enriched_path = Path(context["enriched_path"])
         geojson_path = enriched_path.with_suffix(".geojson")
 
-        to_geojson(enriched_path, geojson_path)
+        # Convert the in-memory elements rather than re-reading the file
+        to_geojson(context["enriched"], geojson_path, columns=context.get("columns"))
 
         context["geojson_path"] = str(geojson_path)
         logger.info(f"Generated GeoJSON at {geojson_path}")
@@ -269,15 +544,57 @@ class AnalysisChain:
         """
         try:
             result = self.pipeline.invoke(input_dict)
-            result["success"] = True
-            return result
         except Exception as e:
-            logger.error(f"Analysis chain failed: {e}")
+            result = e
+        return self._finalize(input_dict, result)
+
+    def batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the full analysis pipeline for several inputs concurrently.
+
+        A failure in one input does not affect the others.
+
+        :param inputs: Input dictionaries, each with a 'path' key
+        :param max_concurrency: Maximum number of pipelines run at once
+        :return: Results dictionaries, in input order
+        """
+        if not inputs:
+            return []
+        results = self.pipeline.batch(
+            inputs,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        return [
+            self._finalize(input_dict, result)
+            for input_dict, result in zip(inputs, results)
+        ]
+
+    @staticmethod
+    def _finalize(
+        input_dict: Dict[str, Any], result: Union[Dict[str, Any], Exception]
+    ) -> Dict[str, Any]:
+        """
+        Mark a pipeline result as successful, or turn its exception into an
+        error result.
+
+        :param input_dict: The pipeline input
+        :param result: The pipeline output, or the exception it raised
+        :return: Results dictionary with a 'success' flag
+        """
+        if isinstance(result, Exception):
+            logger.error(f"Analysis chain failed: {result}")
             return {
                 **input_dict,
                 "success": False,
-                "error": str(e),
+                "error": str(result),
             }
+        result["success"] = True
+        return result
 
     @staticmethod
     def generate_visualizations(
@@ -287,6 +604,10 @@ class AnalysisChain:
         """
         Generate requested visualizations with error recovery.
 
+        Independent outputs (heatmap, hotspots, statistics) run concurrently;
+        charts start as soon as the data they depend on is available. A failed
+        step only skips the steps that depend on it.
+
         :param context: Pipeline context with enriched data
         :param options: Dictionary of visualization options
         :return: Updated context with visualization paths
@@ -300,96 +621,116 @@ class AnalysisChain:
             plot_hotspots as plot_hotspots_chart,
         )
 
-        errors = []
+        context_lock = threading.Lock()
+        step_errors: Dict[str, str] = {}
 
-        # Generate heatmap
-        if options.get("generate_heatmap"):
-            try:
-                geojson_path = Path(context["geojson_path"])
-                heatmap_path = geojson_path.with_suffix(".html")
-                to_heatmap(geojson_path, heatmap_path)
+        def heatmap() -> None:
+            geojson_path = Path(context["geojson_path"])
+            heatmap_path = geojson_path.with_suffix(".html")
+            to_heatmap(geojson_path, heatmap_path)
+            with context_lock:
                 context["heatmap_path"] = str(heatmap_path)
-                logger.info(f"Generated heatmap at {heatmap_path}")
-            except Exception as e:
-                error_msg = f"Heatmap generation failed: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-
-        # Generate hotspots
-        if options.get("generate_hotspots"):
-            try:
-                geojson_path = Path(context["geojson_path"])
-                hotspots_path = geojson_path.with_name(
-                    f"{geojson_path.stem}_hotspots.geojson"
-                )
-                to_hotspots(geojson_path, hotspots_path)
+            logger.info(f"Generated heatmap at {heatmap_path}")
+
+        def hotspots() -> None:
+            geojson_path = Path(context["geojson_path"])
+            hotspots_path = geojson_path.with_name(
+                f"{geojson_path.stem}_hotspots.geojson"
+            )
+            to_hotspots(geojson_path, hotspots_path)
+            with context_lock:
                 context["hotspots_path"] = str(hotspots_path)
-                logger.info(f"Generated hotspots at {hotspots_path}")
-            except Exception as e:
-                error_msg = f"Hotspots generation failed: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-
-        # Compute statistics
-        if options.get("compute_stats", True):
-            try:
-                stats = compute_statistics(context["enriched"])
-                context["stats"] = stats
-                logger.info("Computed statistics")
-            except Exception as e:
-                error_msg = f"Statistics computation failed: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-
-        # Generate charts (only if stats available)
-        if "stats" in context:
+            logger.info(f"Generated hotspots at {hotspots_path}")
+
+        def stats() -> None:
+            result = compute_statistics(context["enriched"])
+            with context_lock:
+                context["stats"] = result
+            logger.info("Computed statistics")
+
+        def pie_chart() -> None:
             output_dir = Path(context["path"]).parent
+            with _PLOT_LOCK:
+                chart_path = private_public_pie(context["stats"], output_dir)
+            with context_lock:
+                context["pie_chart_path"] = str(chart_path)
+            logger.info(f"Generated pie chart at {chart_path}")
 
-            if options.get("generate_chart"):
-                try:
-                    chart_path = private_public_pie(context["stats"], output_dir)
-                    context["pie_chart_path"] = str(chart_path)
-                    logger.info(f"Generated pie chart at {chart_path}")
-                except Exception as e:
-                    error_msg = f"Pie chart generation failed: {e}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+        def zone_sensitivity() -> None:
+            output_dir = Path(context["path"]).parent
+            with _PLOT_LOCK:
+                chart_path = plot_zone_sensitivity(context["stats"], output_dir)
+            with context_lock:
+                context["zone_sensitivity_chart"] = str(chart_path)
+            logger.info(f"Generated zone sensitivity chart at {chart_path}")
 
-            if options.get("plot_zone_sensitivity"):
-                try:
-                    chart_path = plot_zone_sensitivity(context["stats"], output_dir)
-                    context["zone_sensitivity_chart"] = str(chart_path)
-                    logger.info(f"Generated zone sensitivity chart at {chart_path}")
-                except Exception as e:
-                    error_msg = f"Zone sensitivity chart failed: {e}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+        def sensitivity_reasons() -> None:
+            enriched_path = Path(context["enriched_path"])
+            chart_path = enriched_path.with_name(
+                f"{enriched_path.stem}_sensitivity.png"
+            )
+            with _PLOT_LOCK:
+                plot_sensitivity_reasons(context["enriched"], chart_path)
+            with context_lock:
+                context["sensitivity_reasons_chart"] = str(chart_path)
+            logger.info(f"Generated sensitivity reasons chart at {chart_path}")
+
+        def hotspots_chart() -> None:
+            hotspots_path = Path(context["hotspots_path"])
+            chart_path = hotspots_path.with_suffix(".png")
+            with _PLOT_LOCK:
+                plot_hotspots_chart(hotspots_path, chart_path)
+            with context_lock:
+                context["hotspots_chart"] = str(chart_path)
+            logger.info(f"Generated hotspots chart at {chart_path}")
+
+        # name -> (option flag, default, callable, error label)
+        available = {
+            "heatmap": ("generate_heatmap", False, heatmap, "Heatmap generation"),
+            "hotspots": ("generate_hotspots", False, hotspots, "Hotspots generation"),
+            "stats": ("compute_stats", True, stats, "Statistics computation"),
+            "pie_chart": ("generate_chart", False, pie_chart, "Pie chart generation"),
+            "zone_sensitivity": (
+                "plot_zone_sensitivity",
+                False,
+                zone_sensitivity,
+                "Zone sensitivity chart",
+            ),
+            "sensitivity_reasons": (
+                "plot_sensitivity_reasons",
+                False,
+                sensitivity_reasons,
+                "Sensitivity reasons chart",
+            ),
+            "hotspots_chart": (
+                "plot_hotspots",
+                False,
+                hotspots_chart,
+                "Hotspots chart",
+            ),
+        }
 
-            if options.get("plot_sensitivity_reasons"):
+        def recorded(name: str, fn, label: str):
+            def run() -> None:
                 try:
-                    enriched_path = Path(context["enriched_path"])
-                    chart_path = enriched_path.with_name(
-                        f"{enriched_path.stem}_sensitivity.png"
-                    )
-                    plot_sensitivity_reasons(enriched_path, chart_path)
-                    context["sensitivity_reasons_chart"] = str(chart_path)
-                    logger.info(f"Generated sensitivity reasons chart at {chart_path}")
+                    fn()
                 except Exception as e:
-                    error_msg = f"Sensitivity reasons chart failed: {e}"
+                    error_msg = f"{label} failed: {e}"
                     logger.error(error_msg)
-                    errors.append(error_msg)
+                    step_errors[name] = error_msg
+                    raise
 
-            if options.get("plot_hotspots") and "hotspots_path" in context:
-                try:
-                    hotspots_path = Path(context["hotspots_path"])
-                    chart_path = hotspots_path.with_suffix(".png")
-                    plot_hotspots_chart(hotspots_path, chart_path)
-                    context["hotspots_chart"] = str(chart_path)
-                    logger.info(f"Generated hotspots chart at {chart_path}")
-                except Exception as e:
-                    error_msg = f"Hotspots chart failed: {e}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            return run
+
+        steps = {
+            name: recorded(name, fn, label)
+            for name, (flag, default, fn, label) in available.items()
+            if options.get(flag, default)
+        }
+        run_step_graph(steps, _VISUALIZATION_DEPENDENCIES)
+
+        # Report errors in a stable order regardless of completion order
+        errors = [step_errors[name] for name in available if name in step_errors]
 
         # Add errors to context if any occurred
         if errors:
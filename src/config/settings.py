@@ -178,6 +178,20 @@ class LangChainSettings(BaseSettings):
         default=0.0,
         description="Temperature for LLM responses (0.0 = deterministic, 1.0 = creative)",
     )
+    ollama_keep_alive: str = Field(
+        default="1h",
+        description="How long Ollama keeps the model and its prompt cache loaded between requests",
+    )
+
+    # Response cache configuration
+    llm_cache_enabled: bool = Field(
+        default=False,
+        description="Serve repeated identical analysis prompts from a response cache",
+    )
+    llm_cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for a persistent LLM response cache (in-memory when unset)",
+    )
 
     # Agent configuration
     agent_max_iterations: int = Field(
@@ -202,6 +216,16 @@ class LangChainSettings(BaseSettings):
     tool_timeout: float = Field(
         default=60.0, description="Timeout for individual tool executions in seconds"
     )
+
+    # Enrichment configuration
+    enrich_concurrency: int = Field(
+        default=16,
+        description="Maximum number of in-flight LLM requests during enrichment",
+    )
+    enrich_batch_size: int = Field(
+        default=16,
+        description="Number of elements packed into a single LLM enrichment request",
+    )
     model_config = SettingsConfigDict(
         env_file=".env", env_prefix="LANGCHAIN_", extra="allow"
     )
@@ -219,3 +243,10 @@ class LangChainSettings(BaseSettings):
         if value <= 0:
             raise ValueError("Maximum iterations must be positive")
         return value
+
+    @field_validator("enrich_concurrency", "enrich_batch_size")
+    @classmethod
+    def validate_enrich_limits(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("Enrichment concurrency and batch size must be positive")
+        return value
@@ -1,6 +1,13 @@
-import json
-from typing import Any, Dict, Optional
-
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+from langchain_core.caches import BaseCache, InMemoryCache
+from langchain_core.outputs import Generation
 from langchain_ollama import OllamaLLM
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
@@ -15,7 +22,116 @@ from tenacity import (
 from src.config.logger import logger
 from src.config.models.surveillance_metadata import SurveillanceMetadata
 from src.config.settings import LangChainSettings
-from src.prompts.prompt_template import PROMPT_v1
+from src.prompts.prompt_template import PROMPT_BATCH_v1, PROMPT_v1
+
+# Shared pool for parsing/validating LLM output off the event loop
+_VALIDATION_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="llm-validate"
+)
+
+# Process-wide LLM instances, one per distinct settings
+_LLM_POOL: Dict[str, "SurveillanceLLM"] = {}
+_LLM_POOL_LOCK = threading.Lock()
+
+# Maximum number of override clients kept per SurveillanceLLM
+_OVERRIDE_LLM_LIMIT = 8
+
+# Maximum number of responses kept by the in-memory LLM cache
+_LLM_CACHE_SIZE = 10_000
+
+
+def _is_valid_analysis(text: str) -> bool:
+    """
+    Check whether a raw analysis response parses and validates.
+
+    Accepts a single metadata object, a JSON array of them, or an object
+    wrapping the array under ``results`` (the batch response shapes).
+
+    :param text: Raw text returned by the LLM.
+    :return: True if every object validates as SurveillanceMetadata.
+    """
+    try:
+        parsed = orjson.loads(text.strip())
+        if isinstance(parsed, dict) and isinstance(parsed.get("results"), list):
+            parsed = parsed["results"]
+        items = parsed if isinstance(parsed, list) else [parsed]
+        for item in items:
+            SurveillanceMetadata.model_validate(item)
+    except (orjson.JSONDecodeError, ValidationError, AttributeError):
+        return False
+    return True
+
+
+class _ValidatedResponseCache(BaseCache):
+    """
+    LLM response cache for analysis prompts.
+
+    Trailing whitespace in prompts is ignored, and responses are only stored
+    when they parse and validate, so a malformed answer is never replayed to
+    the retry that follows it.
+    """
+
+    def __init__(self, inner: BaseCache) -> None:
+        self.inner = inner
+
+    @staticmethod
+    def _storable(return_val: Sequence[Generation]) -> bool:
+        return bool(return_val) and all(
+            _is_valid_analysis(generation.text) for generation in return_val
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        return self.inner.lookup(prompt.rstrip(), llm_string)
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        if self._storable(return_val):
+            self.inner.update(prompt.rstrip(), llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.inner.clear(**kwargs)
+
+    async def alookup(
+        self, prompt: str, llm_string: str
+    ) -> Optional[Sequence[Generation]]:
+        return await self.inner.alookup(prompt.rstrip(), llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        if self._storable(return_val):
+            await self.inner.aupdate(prompt.rstrip(), llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await self.inner.aclear(**kwargs)
+
+
+def create_response_cache(
+    settings: LangChainSettings,
+) -> Optional[_ValidatedResponseCache]:
+    """
+    Build the analysis response cache configured in settings.
+
+    Identical (model parameters, prompt) pairs are then answered from the
+    cache instead of a round-trip to Ollama. The cache lives in memory
+    unless ``settings.llm_cache_path`` names a SQLite file.
+
+    :param settings: LangChain settings
+    :return: The cache, or None when ``settings.llm_cache_enabled`` is off.
+    """
+    if not settings.llm_cache_enabled:
+        return None
+    if settings.llm_cache_path:
+        from langchain_community.cache import SQLiteCache
+
+        inner = SQLiteCache(database_path=settings.llm_cache_path)
+    else:
+        inner = InMemoryCache(maxsize=_LLM_CACHE_SIZE)
+    logger.debug(
+        f"Created LLM response cache ({settings.llm_cache_path or 'in-memory'})"
+    )
+    return _ValidatedResponseCache(inner)
 
 
 class SurveillanceLLM:
@@ -40,6 +156,8 @@ class SurveillanceLLM:
         """
         try:
             self.settings = settings or LangChainSettings()
+            # Only the JSON analysis client uses it, see _ensure_chain_initialized()
+            self.response_cache = create_response_cache(self.settings)
 
             # Initialize LangChain LLM with new package
             self.llm = OllamaLLM(
@@ -52,7 +170,14 @@ class SurveillanceLLM:
             # Initialize prompt template and output parser (lazy)
             self.prompt_template = None
             self.output_parser = None
+            self.batch_template = None
+            self.json_llm = None
+            self.raw_chain = None
             self.chain = None
+            self._warmed_up = False
+            # Clients for per-call parameter overrides, see _llm_with()
+            self._override_llms: Dict[tuple, OllamaLLM] = {}
+            self._override_llms_lock = threading.Lock()
 
             logger.debug(
                 f"Initialized SurveillanceLLM with model: {self.settings.ollama_model}"
@@ -68,9 +193,59 @@ class SurveillanceLLM:
             self.output_parser = PydanticOutputParser(
                 pydantic_object=SurveillanceMetadata
             )
-            self.chain = self.prompt_template | self.llm | self.output_parser
+            # Format instructions never change; render them into the templates
+            # once instead of regenerating the schema text for every element
+            format_instructions = self.output_parser.get_format_instructions()
+            self.prompt_template = self.prompt_template.partial(
+                format_instructions=format_instructions
+            )
+            self.batch_template = PROMPT_BATCH_v1.replace(
+                "{format_instructions}",
+                format_instructions.replace("{", "{{").replace("}", "}}"),
+            )
+            # Analysis always expects JSON, so decode in Ollama's JSON mode
+            self.json_llm = OllamaLLM(
+                base_url=self.settings.ollama_base_url,
+                model=self.settings.ollama_model,
+                temperature=self.settings.ollama_temperature,
+                format="json",
+                keep_alive=self.settings.ollama_keep_alive,
+                cache=self.response_cache,
+            )
+            self.raw_chain = self.prompt_template | self.json_llm
+            self.chain = self.raw_chain | self.output_parser
             logger.debug("Initialized LangChain prompt/parser chain")
 
+    async def awarm_up(self) -> None:
+        """
+        Load the model and prime Ollama's prompt cache with the static prompt.
+
+        Every analysis prompt shares the rendered template header, so sending
+        it once up front lets subsequent requests reuse the cached prefix
+        instead of re-processing it per element. Runs at most once per
+        instance; failures are logged and otherwise ignored.
+
+        :return: None
+        """
+        if self._warmed_up:
+            return
+        self._ensure_chain_initialized()
+        self._warmed_up = True
+        try:
+            await self.json_llm.ainvoke(
+                self.prompt_template.format(tags=""),
+                options={
+                    "num_predict": 1,
+                    "temperature": self.settings.ollama_temperature,
+                },
+            )
+            logger.debug(
+                f"Warmed up {self.settings.ollama_model} "
+                f"(keep_alive={self.settings.ollama_keep_alive})"
+            )
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed: {e}")
+
     @staticmethod
     def _create_prompt_template() -> PromptTemplate:
         """Create LangChain PromptTemplate for surveillance analysis."""
@@ -81,6 +256,23 @@ class SurveillanceLLM:
             template=template,
         )
 
+    def _chain_input(self, element: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build the prompt variables for a single element.
+
+        :param element: OSM element dictionary with tags.
+        :return: Input mapping for the prompt/parser chain.
+        """
+        # Ensure chain is initialized
+        self._ensure_chain_initialized()
+
+        tags = element.get("tags", {})
+        tags_json = orjson.dumps(tags, option=orjson.OPT_INDENT_2).decode()
+
+        logger.debug(f"Analyzing surveillance element with tags: {tags}")
+
+        return {"tags": tags_json}
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -98,21 +290,10 @@ class SurveillanceLLM:
         :raise: Exception if analysis fails after retries.
         """
         try:
-            # Ensure chain is initialized
-            self._ensure_chain_initialized()
-
-            tags = element.get("tags", {})
-            tags_json = json.dumps(tags, ensure_ascii=False, indent=2)
-
-            logger.debug(f"Analyzing surveillance element with tags: {tags}")
-
-            # Get format instructions from parser
-            format_instructions = self.output_parser.get_format_instructions()
+            chain_input = self._chain_input(element)
 
             # Use the chain to process the input
-            result = self.chain.invoke(
-                {"tags": tags_json, "format_instructions": format_instructions}
-            )
+            result = self.chain.invoke(chain_input)
 
             # Create the complete metadata object
             metadata = SurveillanceMetadata.from_raw(element, result.model_dump())
@@ -134,34 +315,200 @@ class SurveillanceLLM:
             )
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True,
+    )
+    async def aanalyze_surveillance_element(
+        self, element: Dict[str, Any]
+    ) -> SurveillanceMetadata:
+        """
+        Asynchronously analyze a surveillance element with retry logic.
+
+        Mirrors :meth:`analyze_surveillance_element` but awaits the LLM so
+        many elements can be in flight against Ollama at the same time, and
+        validates the response on a worker thread.
+
+        :param element: OSM element dictionary with tags.
+        :return: Parsed and validated SurveillanceMetadata.
+        :raise: Exception if analysis fails after retries.
+        """
+        try:
+            chain_input = self._chain_input(element)
+            raw = await self.raw_chain.ainvoke(chain_input)
+
+            # Parse and validate on the worker pool so the event loop can keep
+            # dispatching and receiving other LLM responses meanwhile
+            loop = asyncio.get_running_loop()
+            metadata = await loop.run_in_executor(
+                _VALIDATION_POOL, self.parse_analysis, element, raw
+            )
+
+            logger.debug(
+                f"Successfully analyzed element {element.get('id', 'unknown')}"
+            )
+            return metadata
+
+        except Exception as e:
+            logger.error(
+                f"Failed to analyze element {element.get('id', 'unknown')}: {e}"
+            )
+            raise
+
+    def parse_analysis(self, element: Dict[str, Any], raw: str) -> SurveillanceMetadata:
+        """
+        Parse a raw LLM response into validated metadata for an element.
+
+        :param element: OSM element dictionary the response belongs to.
+        :param raw: Raw text returned by the LLM.
+        :return: Parsed and validated SurveillanceMetadata.
+        :raise: OutputParserException if the response cannot be parsed.
+        """
+        self._ensure_chain_initialized()
+        result = self.output_parser.parse(raw)
+        try:
+            return SurveillanceMetadata.from_raw(element, result.model_dump())
+        except ValidationError as e:
+            logger.warning(
+                f"Validation error for element {element.get('id', 'unknown')}: {e}"
+            )
+            return SurveillanceMetadata.from_raw(element, {"schema_errors": str(e)})
+
+    async def aanalyze_surveillance_batch(
+        self, elements: List[Dict[str, Any]]
+    ) -> List[SurveillanceMetadata]:
+        """
+        Analyze several surveillance elements with a single LLM request.
+
+        The tag dictionaries are packed into one prompt and the model is asked
+        for a JSON array with one object per element, in input order.
+
+        :param elements: OSM element dictionaries with tags.
+        :return: One SurveillanceMetadata per element, in input order.
+        :raise: ValueError if the response is not an array of matching length.
+        """
+        self._ensure_chain_initialized()
+
+        tags_list = orjson.dumps(
+            [element.get("tags", {}) for element in elements],
+            option=orjson.OPT_INDENT_2,
+        ).decode()
+        prompt = self.batch_template.format_map(
+            {"count": len(elements), "tags_list": tags_list}
+        )
+
+        logger.debug(f"Analyzing batch of {len(elements)} surveillance elements")
+        raw = await self.json_llm.ainvoke(prompt)
+
+        parsed = orjson.loads(str(raw).strip())
+        items = parsed.get("results") if isinstance(parsed, dict) else parsed
+        if (
+            not isinstance(items, list)
+            or len(items) != len(elements)
+            or not all(isinstance(item, dict) for item in items)
+        ):
+            raise ValueError(
+                f"Expected {len(elements)} result objects from batch analysis"
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _VALIDATION_POOL, self._validate_batch, elements, items
+        )
+
+    @staticmethod
+    def _validate_batch(
+        elements: List[Dict[str, Any]], items: List[Dict[str, Any]]
+    ) -> List[SurveillanceMetadata]:
+        """
+        Validate the objects of a batched response against their elements.
+
+        :param elements: OSM element dictionaries, in request order.
+        :param items: Parsed JSON objects from the LLM, in the same order.
+        :return: One SurveillanceMetadata per element.
+        """
+        results = []
+        for element, fields in zip(elements, items):
+            try:
+                results.append(SurveillanceMetadata.from_raw(element, fields))
+            except ValidationError as e:
+                logger.warning(
+                    f"Validation error for element {element.get('id', 'unknown')}: {e}"
+                )
+                results.append(
+                    SurveillanceMetadata.from_raw(element, {"schema_errors": str(e)})
+                )
+        return results
+
+    def _llm_with(self, kwargs: Dict[str, Any], expect_json: bool = False) -> OllamaLLM:
+        """
+        Get an Ollama client configured with per-call overrides.
+
+        Clients are kept per distinct set of overrides, so repeated calls with
+        the same parameters reuse one client and its HTTP connection pool.
+        The instance is shared between threads, so lookups and eviction hold
+        a lock.
+
+        :param kwargs: Override parameters (``timeout`` is ignored).
+        :param expect_json: Whether to enable Ollama's JSON mode.
+        :return: The configured OllamaLLM.
+        """
+        options = {
+            k: v for k, v in kwargs.items() if k not in ("temperature", "timeout")
+        }
+        if expect_json:
+            options["format"] = "json"
+        temperature = kwargs.get("temperature", self.settings.ollama_temperature)
+        key: Optional[tuple] = (temperature, tuple(sorted(options.items())))
+        try:
+            with self._override_llms_lock:
+                llm = self._override_llms.get(key)
+        except TypeError:
+            # Unhashable override values; build a client just for this call
+            key, llm = None, None
+        if llm is None:
+            llm = OllamaLLM(
+                base_url=self.settings.ollama_base_url,
+                model=self.settings.ollama_model,
+                temperature=temperature,
+                # timeout=kwargs.get("timeout", self.settings.ollama_timeout),
+                **options,
+            )
+            if key is not None:
+                with self._override_llms_lock:
+                    # Another thread may have built one meanwhile; keep theirs
+                    existing = self._override_llms.get(key)
+                    if existing is not None:
+                        return existing
+                    if len(self._override_llms) >= _OVERRIDE_LLM_LIMIT:
+                        self._override_llms.pop(next(iter(self._override_llms)))
+                    self._override_llms[key] = llm
+        return llm
+
     def generate_response(self, prompt: str, **kwargs: Any) -> str:
         """
         Generate a response from the LLM (backward compatibility method).
 
         :param prompt: The text prompt to send to the LLM.
-        :param kwargs: Additional parameters.
+        :param kwargs: Additional parameters; ``expect_json=True`` enables
+            Ollama's JSON mode so the output is guaranteed to parse.
         :return: The generated response text from the LLM.
         :raise: RuntimeError if the LLM request fails.
         """
         try:
             logger.debug(f"Generating response for prompt: {prompt!r}")
 
-            # Handle kwargs by creating temporary LLM if needed
+            # JSON mode constrains decoding to valid JSON on the Ollama side
+            expect_json = kwargs.pop("expect_json", False)
+
+            # Handle kwargs with a client configured for these overrides
             if kwargs:
-                temp_llm = OllamaLLM(
-                    base_url=self.settings.ollama_base_url,
-                    model=self.settings.ollama_model,
-                    temperature=kwargs.get(
-                        "temperature", self.settings.ollama_temperature
-                    ),
-                    # timeout=kwargs.get("timeout", self.settings.ollama_timeout),
-                    **{
-                        k: v
-                        for k, v in kwargs.items()
-                        if k not in ["temperature", "timeout"]
-                    },
-                )
-                response = temp_llm.invoke(prompt)
+                response = self._llm_with(kwargs, expect_json).invoke(prompt)
+            elif expect_json:
+                self._ensure_chain_initialized()
+                response = self.json_llm.invoke(prompt)
             else:
                 response = self.llm.invoke(prompt)
 
@@ -185,20 +532,7 @@ class SurveillanceLLM:
             logger.debug(f"Generating batch responses for {len(prompts)} prompts")
 
             if kwargs:
-                temp_llm = OllamaLLM(
-                    base_url=self.settings.ollama_base_url,
-                    model=self.settings.ollama_model,
-                    temperature=kwargs.get(
-                        "temperature", self.settings.ollama_temperature
-                    ),
-                    # timeout=kwargs.get("timeout", self.settings.ollama_timeout),
-                    **{
-                        k: v
-                        for k, v in kwargs.items()
-                        if k not in ["temperature", "timeout"]
-                    },
-                )
-                responses = temp_llm.batch(prompts)
+                responses = self._llm_with(kwargs).batch(prompts)
             else:
                 responses = self.llm.batch(prompts)
 
@@ -230,5 +564,38 @@ def create_surveillance_llm(
         raise
 
 
+def settings_key(settings: LangChainSettings) -> str:
+    """
+    Derive a stable identifier for a settings instance.
+
+    :param settings: LangChain settings
+    :return: 32-char hex digest of the serialized settings
+    """
+    return hashlib.blake2b(
+        settings.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
+
+
+def get_shared_surveillance_llm(
+    settings: Optional[LangChainSettings] = None,
+) -> SurveillanceLLM:
+    """
+    Return the process-wide SurveillanceLLM for the given settings.
+
+    Agents built with equal settings share one instance, so the Ollama
+    clients, prompt templates and parser chain are only set up once.
+
+    :param settings: Optional LangChain settings. If None, uses default settings.
+    :return: Shared SurveillanceLLM instance.
+    """
+    settings = settings or LangChainSettings()
+    key = settings_key(settings)
+    with _LLM_POOL_LOCK:
+        llm = _LLM_POOL.get(key)
+        if llm is None:
+            llm = _LLM_POOL[key] = create_surveillance_llm(settings)
+    return llm
+
+
 # Backward compatibility alias
 LangChainLLM = SurveillanceLLM
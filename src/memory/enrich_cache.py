@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable
+
+import orjson
+from sqlalchemy import Engine
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, SQLModel, select
+
+from src.config.logger import logger
+from src.memory.models import EnrichedTags
+from src.utils.db import enable_sqlite_wal
+
+# Stay well below SQLite's bound-parameter limit for multi-row statements
+_LOOKUP_CHUNK = 500
+
+
+class EnrichmentCache:
+    """
+    Key-value cache of LLM enrichment results keyed by tag hash.
+
+    Elements with identical tags always receive the same analysis, so results
+    can be reused across runs and cities instead of asking the LLM again.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """
+        Initialize the cache on an existing database engine.
+
+        :param engine: SQLAlchemy engine (typically ``MemoryStore.engine``)
+        """
+        self.engine = engine
+        enable_sqlite_wal(engine)
+        SQLModel.metadata.create_all(engine, tables=[EnrichedTags.__table__])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached analyses for several tag hashes at once.
+
+        :param keys: Tag hashes to look up
+        :return: Mapping of tag hash to analysis for every hit
+        """
+        keys = list(dict.fromkeys(keys))
+        hits: Dict[str, Dict[str, Any]] = {}
+        try:
+            with Session(self.engine) as session:
+                for start in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[start : start + _LOOKUP_CHUNK]
+                    statement = select(EnrichedTags).where(
+                        EnrichedTags.tag_hash.in_(chunk)
+                    )
+                    for row in session.exec(statement):
+                        hits[row.tag_hash] = orjson.loads(row.analysis_json)
+        except Exception as e:
+            logger.error(f"Failed to read enrichment cache: {e}")
+            raise
+        logger.debug(f"Enrichment cache hits: {len(hits)}/{len(keys)}")
+        return hits
+
+    def put_many(self, analyses: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store analyses, keeping any existing entry for the same tag hash.
+
+        :param analyses: Mapping of tag hash to analysis
+        :return: None
+        """
+        if not analyses:
+            return
+        rows = [
+            {
+                "tag_hash": key,
+                "analysis_json": orjson.dumps(
+                    analysis, option=orjson.OPT_NON_STR_KEYS
+                ).decode(),
+            }
+            for key, analysis in analyses.items()
+        ]
+        try:
+            with self.engine.begin() as connection:
+                for start in range(0, len(rows), _LOOKUP_CHUNK):
+                    statement = insert(EnrichedTags).values(
+                        rows[start : start + _LOOKUP_CHUNK]
+                    )
+                    connection.execute(statement.on_conflict_do_nothing())
+        except Exception as e:
+            logger.error(f"Failed to write enrichment cache: {e}")
+            raise
+        logger.debug(f"Stored {len(rows)} enrichment cache entries")
@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime, timezone
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -15,6 +16,8 @@ class Memory(SQLModel, table=True):
       - content: The serialized result or note
     """
 
+    __table_args__ = (Index("ix_memory_agent_step", "agent_id", "step"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     agent_id: str = Field(index=True, description="Agent unique identifier")
     step: str = Field(description="Action or step name")
@@ -22,3 +25,74 @@ class Memory(SQLModel, table=True):
         default_factory=lambda: datetime.now(timezone.utc), description="UTC timestamp"
     )
     content: str = Field(description="Result or note to remember")
+
+
+class EnrichedTags(SQLModel, table=True):
+    """
+    SQLModel table caching LLM enrichment results per distinct tag set.
+
+    Columns:
+      - tag_hash: Digest of the canonical JSON of an element's tags
+      - analysis_json: Serialized analysis produced for those tags
+    """
+
+    tag_hash: str = Field(primary_key=True, description="Canonical tags digest")
+    analysis_json: str = Field(description="Serialized enrichment analysis")
+
+
+class CacheEntry(SQLModel, table=True):
+    """
+    SQLModel table of agent cache entries looked up by key.
+
+    Columns:
+      - id: Auto-increment primary key
+      - agent_id: Identifier of the agent owning the entry
+      - step: Cache namespace within the agent (e.g. "route_cache")
+      - key: Lookup key (e.g. a query or request hash)
+      - timestamp: When the entry was last written
+      - value_json: Serialized entry fields
+    """
+
+    __table_args__ = (
+        Index("ux_cacheentry_agent_step_key", "agent_id", "step", "key", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: str = Field(description="Agent unique identifier")
+    step: str = Field(description="Cache namespace within the agent")
+    key: str = Field(description="Lookup key")
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), description="UTC timestamp"
+    )
+    value_json: str = Field(description="Serialized entry fields")
+
+
+class TaskRecord(SQLModel, table=True):
+    """
+    SQLModel table of API background tasks, shared by all server workers.
+
+    Columns:
+      - id: Task identifier
+      - type: Task type (scrape, analyze, route, pipeline)
+      - status: TaskStatus value
+      - progress: Progress percentage (0-100)
+      - result_json: Serialized task result, once completed
+      - error: Error message, if the task failed
+      - created_at / started_at / completed_at: Epoch seconds
+      - metadata_json: Serialized task metadata
+      - last_message: Latest progress message (metadata key "last_message")
+    """
+
+    id: str = Field(primary_key=True, description="Task identifier")
+    type: str = Field(description="Task type")
+    status: str = Field(description="TaskStatus value")
+    progress: int = Field(default=0, description="Progress percentage")
+    result_json: Optional[str] = Field(default=None, description="Serialized result")
+    error: Optional[str] = Field(default=None, description="Error message")
+    created_at: float = Field(description="Epoch seconds of creation")
+    started_at: Optional[float] = Field(default=None, description="Epoch seconds")
+    completed_at: Optional[float] = Field(default=None, description="Epoch seconds")
+    metadata_json: str = Field(default="{}", description="Serialized metadata")
+    last_message: Optional[str] = Field(
+        default=None, description="Latest progress message"
+    )
@@ -1,11 +1,14 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from src.config.logger import logger
+import orjson
+from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import Session, select
 
+from src.config.logger import logger
 from src.config.settings import DatabaseSettings
-from src.memory.models import Memory, SQLModel
-from src.utils.db import get_engine
+from src.memory.models import CacheEntry, Memory, SQLModel
+from src.utils.db import enable_sqlite_wal, get_engine
 
 
 class MemoryStore:
@@ -21,8 +24,12 @@ class MemoryStore:
         """
         try:
             self.engine = get_engine(settings)
+            enable_sqlite_wal(self.engine)
             # Create tables if they do not exist
             SQLModel.metadata.create_all(self.engine)
+            # create_all skips existing tables, so add newer indexes explicitly
+            for index in Memory.__table__.indexes:
+                index.create(self.engine, checkfirst=True)
         except Exception as e:
             logger.error(f"Failed to create database engine: {e}")
             raise
@@ -48,6 +55,29 @@ class MemoryStore:
             logger.error(f"Failed to store memory for {agent_id}:{step}: {e}")
             raise
 
+    def store_many(self, records: Sequence[Tuple[str, str, str]]) -> List[Memory]:
+        """
+        Store several memory records in a single transaction.
+
+        :param records: (agent_id, step, content) tuples
+        :return: The created Memory instances, in input order
+        """
+        memories = [
+            Memory(agent_id=agent_id, step=step, content=content)
+            for agent_id, step, content in records
+        ]
+        if not memories:
+            return memories
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                session.add_all(memories)
+                session.commit()
+            logger.debug(f"Stored {len(memories)} memories")
+            return memories
+        except Exception as e:
+            logger.error(f"Failed to store {len(memories)} memories: {e}")
+            raise
+
     def load(self, agent_id: str) -> List[Memory]:
         """
         Load all memory records for a given agent.
@@ -64,3 +94,100 @@ class MemoryStore:
         except Exception as e:
             logger.error(f"Failed to load memories for {agent_id}: {e}")
             raise
+
+    def find_cache(
+        self, agent_id: str, step: str, content_prefix: str
+    ) -> Optional[str]:
+        """
+        Find the newest memory content for an agent step starting with a prefix.
+
+        The lookup runs in SQL on the (agent_id, step) index instead of loading
+        and filtering every memory of the agent in Python.
+
+        :param agent_id: Identifier of the agent
+        :param step: Action or step name
+        :param content_prefix: Required start of the content (e.g. a hash)
+        :return: The matching content, or None if there is no match
+        """
+        try:
+            with Session(self.engine) as session:
+                statement = (
+                    select(Memory.content)
+                    .where(Memory.agent_id == agent_id)
+                    .where(Memory.step == step)
+                    .where(Memory.content.startswith(content_prefix, autoescape=True))
+                    .order_by(Memory.id.desc())
+                    .limit(1)
+                )
+                return session.exec(statement).first()
+        except Exception as e:
+            logger.error(f"Failed to find cache for {agent_id}:{step}: {e}")
+            raise
+
+    def get_cache(
+        self,
+        agent_id: str,
+        step: str,
+        key: str,
+        max_age: Optional[timedelta] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cache entry by key on the unique (agent_id, step, key) index.
+
+        :param agent_id: Identifier of the agent
+        :param step: Cache namespace (e.g. "route_cache")
+        :param key: Lookup key
+        :param max_age: Ignore entries written longer ago than this
+        :return: The stored entry fields, or None if there is no fresh entry
+        """
+        try:
+            with Session(self.engine) as session:
+                statement = (
+                    select(CacheEntry.value_json)
+                    .where(CacheEntry.agent_id == agent_id)
+                    .where(CacheEntry.step == step)
+                    .where(CacheEntry.key == key)
+                )
+                if max_age is not None:
+                    cutoff = datetime.now(timezone.utc) - max_age
+                    statement = statement.where(CacheEntry.timestamp >= cutoff)
+                value_json = session.exec(statement).first()
+        except Exception as e:
+            logger.error(f"Failed to read cache entry for {agent_id}:{step}: {e}")
+            raise
+        return None if value_json is None else orjson.loads(value_json)
+
+    def put_cache(
+        self, agent_id: str, step: str, key: str, value: Dict[str, Any]
+    ) -> None:
+        """
+        Store a cache entry, replacing any existing entry for the same key.
+
+        :param agent_id: Identifier of the agent
+        :param step: Cache namespace (e.g. "route_cache")
+        :param key: Lookup key
+        :param value: JSON-serializable entry fields
+        :return: None
+        """
+        row = {
+            "agent_id": agent_id,
+            "step": step,
+            "key": key,
+            "timestamp": datetime.now(timezone.utc),
+            "value_json": orjson.dumps(value).decode(),
+        }
+        statement = insert(CacheEntry).values(row)
+        statement = statement.on_conflict_do_update(
+            index_elements=["agent_id", "step", "key"],
+            set_={
+                "timestamp": statement.excluded.timestamp,
+                "value_json": statement.excluded.value_json,
+            },
+        )
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(statement)
+        except Exception as e:
+            logger.error(f"Failed to store cache entry for {agent_id}:{step}: {e}")
+            raise
+        logger.debug(f"Stored cache entry {agent_id}:{step}:{key}")
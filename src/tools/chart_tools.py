@@ -1,6 +1,5 @@
-import json
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Union
 from collections import Counter
 
 import matplotlib
@@ -12,6 +11,8 @@ import geopandas as gpd
 import contextily as cx
 from shapely import Point
 
+from src.tools.io_tools import load_json_file
+
 
 def private_public_pie(stats: Dict[str, Any], output_dir: Path) -> Path:
     """
@@ -100,24 +101,26 @@ def plot_zone_sensitivity(
 
 
 def plot_sensitivity_reasons(
-    enriched_file: Union[str, Path],
+    enriched_file: Union[str, Path, List[Dict[str, Any]]],
     output_file: Union[str, Path],
     top_n: int = 5,
 ) -> Path:
     """
     Read an enriched JSON, count non-null sensitive_reason values and draw a bar chart.
-    :param enriched_file: The enriched json file
+    :param enriched_file: The enriched json file, or the enriched elements themselves
     :param output_file: The Path to save the chart
     :param top_n: Number of reasons to be plotted
     :return:
     """
-    enriched_path = Path(enriched_file)
-    data = json.loads(enriched_path.read_text(encoding="utf-8"))
+    if isinstance(enriched_file, list):
+        elements = enriched_file
+    else:
+        elements = load_json_file(enriched_file).get("elements", [])
 
     # collect all non-null reasons
     reasons = [
         elt["analysis"]["sensitive_reason"]
-        for elt in data.get("elements", [])
+        for elt in elements
         if elt["analysis"].get("sensitive") and elt["analysis"].get("sensitive_reason")
     ]
     counts: Counter[str] = Counter(reasons)
@@ -155,8 +158,7 @@ def plot_hotspots(
     :return:
     """
     #  load clusters
-    hf = Path(hotspots_file)
-    raw = json.loads(hf.read_text(encoding="utf-8"))
+    raw = load_json_file(hotspots_file)
     feats = raw.get("features", [])
 
     # build a GeoDataFrame in WGS84
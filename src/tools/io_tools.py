@@ -1,10 +1,89 @@
 from __future__ import annotations
 
-import json
+import gzip
+import mmap
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterator
+
+import ijson
+import numpy as np
+import orjson
 
 from src.config.logger import logger
+from src.utils.elements import Elements
+
+
+@lru_cache(maxsize=128)
+def _resolve(path_str: str, cwd: str) -> Path:
+    """
+    Expand and resolve a path string, memoised per distinct string.
+
+    :param path_str: The path as given by the caller
+    :param cwd: The working directory relative paths are resolved against
+    :return: The absolute, resolved path
+    """
+    return Path(path_str).expanduser().resolve()
+
+
+def resolve_path(path: Path | str) -> Path:
+    """
+    Return the absolute, resolved form of a path.
+
+    Resolution involves several filesystem calls, so results are cached for
+    paths that are seen repeatedly across runs.
+
+    :param path: The path to resolve
+    :return: The absolute, resolved path
+    """
+    return _resolve(str(path), os.getcwd())
+
+
+@lru_cache(maxsize=1024)
+def city_slug(city: str) -> str:
+    """
+    File-system name for a city: lowercase, with spaces replaced by underscores.
+
+    :param city: The city name
+    :return: The slug used for directories and file names
+    """
+    return city.lower().replace(" ", "_")
+
+
+def load_json_file(path: Path | str) -> Any:
+    """
+    Parse a JSON file straight from a read-only memory map.
+
+    The bytes are handed to orjson without first being decoded into a
+    Python string, so large files are parsed in a single pass.
+
+    :param path: The Path object to the JSON file
+    :return: The decoded JSON document
+    """
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            # mmap cannot map an empty file; let orjson report the error
+            return orjson.loads(b"")
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def iter_overpass_elements(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the elements of an Overpass dump one at a time.
+
+    The file is parsed incrementally, so the raw document is never held in
+    memory as a whole and consumers can start on the first element right away.
+
+    :param path: The Path object to the Overpass dump
+    :return: An iterator over the dump's elements
+    """
+    p = resolve_path(path)
+    logger.debug(f"Streaming {p}")
+    with p.open("rb") as fp:
+        yield from ijson.items(fp, "elements.item", use_float=True)
 
 
 def load_overpass_elements(path: Path | str) -> List[Dict[str, Any]]:
@@ -15,10 +94,7 @@ def load_overpass_elements(path: Path | str) -> List[Dict[str, Any]]:
     :param path: The Path object to the Overpass dump
     :return: The extracted list of elements
     """
-    p = Path(path).expanduser().resolve()
-    logger.debug(f"Loading {p}")
-    data = json.loads(p.read_text(encoding="utf-8"))
-    return data.get("elements", [])
+    return list(iter_overpass_elements(path))
 
 
 def save_enriched_elements(elements: List[Dict[str, Any]], path: Path | str) -> str:
@@ -28,18 +104,96 @@ def save_enriched_elements(elements: List[Dict[str, Any]], path: Path | str) ->
     :param path: The path of the source file
     :return: The absolute path to the new file
     """
-    p = Path(path).expanduser().resolve()
+    p = resolve_path(path)
     destination = p.with_name(p.stem + "_enriched.json")
     logger.debug(f"Saving {destination}")
-    destination.write_text(json.dumps({"elements": elements}, indent=2), "utf-8")
+    destination.write_bytes(
+        orjson.dumps({"elements": elements}, option=orjson.OPT_INDENT_2)
+    )
     return str(destination)
 
 
-def save_overpass_dump(data: Dict[str, Any], city: str, dest: Union[Path, str]) -> Path:
+def write_gzip_companion(path: Path | str, compresslevel: int = 6) -> Path:
+    """
+    Write a gzip-compressed copy of a file next to it (``foo.geojson.gz``).
+
+    The output API serves the companion to clients that accept gzip, so the
+    compression cost is paid once per artifact instead of once per request.
+    The copy is written to a temporary name and renamed into place, so it
+    never appears half-written.
+
+    :param path: The file to compress
+    :param compresslevel: gzip compression level
+    :return: Path of the compressed copy
+    """
+    src = Path(path)
+    destination = src.with_name(src.name + ".gz")
+    partial = src.with_name(src.name + ".gz.part")
+    with (
+        src.open("rb") as f_in,
+        gzip.open(partial, "wb", compresslevel=compresslevel) as f_out,
+    ):
+        while chunk := f_in.read(1 << 20):
+            f_out.write(chunk)
+    partial.replace(destination)
+    logger.debug(f"Wrote gzip companion {destination}")
+    return destination
+
+
+class EnrichedElementsWriter:
+    """
+    Incrementally write enriched elements as a ``{"elements": [...]}`` document.
+
+    Elements are appended one at a time, so callers can drain results to disk
+    while they are still being produced. The document is assembled in a
+    temporary file that only replaces the destination once the writer closes
+    cleanly; on error the partial file is discarded.
+    """
+
+    def __init__(self, destination: Path | str):
+        """
+        :param destination: The path of the enriched JSON file to write
+        """
+        self.destination = Path(destination)
+        self._tmp = self.destination.with_name(self.destination.name + ".tmp")
+        self._fp = None
+        self.count = 0
+
+    def __enter__(self) -> "EnrichedElementsWriter":
+        logger.debug(f"Streaming enriched elements to {self.destination}")
+        self._fp = self._tmp.open("wb")
+        self._fp.write(b'{"elements": [')
+        return self
+
+    def write(self, element: Dict[str, Any]) -> None:
+        """
+        Append one element to the document.
+
+        :param element: The enriched element
+        """
+        self._fp.write(b",\n" if self.count else b"\n")
+        self._fp.write(orjson.dumps(element, option=orjson.OPT_INDENT_2))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._fp.write(b"\n]}\n")
+        finally:
+            self._fp.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.destination)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+
+def save_overpass_dump(
+    data: Union[Dict[str, Any], bytes], city: str, dest: Union[Path, str]
+) -> Path:
     """
     Save the Overpass API response to a JSON file in a specified directory.
 
-    :param data: The JSON data to write.
+    :param data: The JSON data to write, or its already serialized bytes.
     :param city: The name of the city used to name the file.
     :param dest: The output directory where the file will be saved.
     :returns: The full path to the saved file.
@@ -52,11 +206,13 @@ def save_overpass_dump(data: Dict[str, Any], city: str, dest: Union[Path, str])
         else:
             # treat as directory: ensure it exists, then name file by city
             dest.mkdir(parents=True, exist_ok=True)
-            filename = f"{city.lower().replace(' ', '_')}.json"
+            filename = f"{city_slug(city)}.json"
             filepath = (dest / filename).resolve()
 
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        filepath.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        if not isinstance(data, bytes):
+            data = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        filepath.write_bytes(data)
         return filepath
 
     except Exception as e:
@@ -66,25 +222,30 @@ def save_overpass_dump(data: Dict[str, Any], city: str, dest: Union[Path, str])
 
 
 def to_geojson(
-    enriched_file: Union[str, Path],
+    enriched_file: Union[str, Path, List[Dict[str, Any]]],
     output_file: Optional[Union[str, Path]] = None,
+    columns: Optional[Elements] = None,
 ) -> Dict[str, Any]:
     """
     Convert an enriched Overpass JSON (with `elements`) into a GeoJSON FeatureCollection.
-    :param enriched_file: Path to the enriched JSON file
+    :param enriched_file: Path to the enriched JSON file, or the enriched elements
+                          themselves to skip reading them back from disk
     :param output_file: Optional path where to write the GeoJSON. If omitted, no file is written.
+    :param columns: Optional column view of the same elements, reused instead of
+                    being rebuilt to find the elements with coordinates
     :return: A dict representing a GeoJSON FeatureCollection.
     """
-    enriched_path = Path(enriched_file)
-    data = json.loads(enriched_path.read_text(encoding="utf-8"))
+    if isinstance(enriched_file, list):
+        elements = enriched_file
+    else:
+        elements = load_json_file(enriched_file).get("elements", [])
+    if columns is None or len(columns) != len(elements):
+        columns = Elements.from_elements(elements)
     features: List[Dict[str, Any]] = []
 
-    for element in data.get("elements", []):
-        # Skip elements without lon, lan
-        lat = element.get("lat")
-        lon = element.get("lon")
-        if lat is None or lon is None:
-            continue
+    # Skip elements without lon, lat
+    for i in np.flatnonzero(columns.has_coords).tolist():
+        element = elements[i]
 
         # Merge OSM tags and analysis metadata into properties
         props: Dict[str, Any] = {}
@@ -95,7 +256,10 @@ def to_geojson(
 
         feature = {
             "type": "Feature",
-            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "geometry": {
+                "type": "Point",
+                "coordinates": [element["lon"], element["lat"]],
+            },
             "properties": props,
         }
 
@@ -104,6 +268,7 @@ def to_geojson(
     geojson = {"type": "FeatureCollection", "features": features}
     if output_file:
         out_path = Path(output_file)
-        out_path.write_text(json.dumps(geojson, indent=2), encoding="utf-8")
+        out_path.write_bytes(orjson.dumps(geojson, option=orjson.OPT_INDENT_2))
+        write_gzip_companion(out_path)
 
     return geojson
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Union, List, Dict, Tuple
+from typing import Union
 
 import folium
 from folium.plugins import HeatMap
@@ -8,6 +8,7 @@ import numpy as np
 from sklearn.cluster import DBSCAN
 
 from src.config.settings import HeatmapSettings
+from src.tools.io_tools import load_json_file, write_gzip_companion
 
 
 def to_heatmap(
@@ -20,25 +21,30 @@ def to_heatmap(
     :param settings: The Heatmap settings
     :return: The html filepath
     """
-    data = json.loads(geojson_path.read_text(encoding="utf-8"))
-
-    coords = [
-        (feat["geometry"]["coordinates"][1], feat["geometry"]["coordinates"][0])
-        for feat in data.get("features", [])
-        if feat["geometry"]["type"].lower() == "point"
-    ]
-    if not coords:
+    data = load_json_file(geojson_path)
+
+    # (lon, lat) pairs as a single ndarray, flipped to (lat, lon) for folium
+    lonlat = np.array(
+        [
+            feat["geometry"]["coordinates"][:2]
+            for feat in data.get("features", [])
+            if feat["geometry"]["type"].lower() == "point"
+        ],
+        dtype=np.float64,
+    )
+    if lonlat.size == 0:
         raise RuntimeError("No point features in GeoJSON for heatmap")
+    coords = lonlat[:, ::-1]
 
     # center map at mean lat/lon
-    avg_lat = sum(lat for lat, _ in coords) / len(coords)
-    avg_lon = sum(lon for _, lon in coords) / len(coords)
+    avg_lat, avg_lon = coords.mean(axis=0).tolist()
 
     m = folium.Map(location=(avg_lat, avg_lon), zoom_start=13)
     HeatMap(coords, radius=settings.radius, blur=settings.blur).add_to(m)
 
     output_html.parent.mkdir(parents=True, exist_ok=True)
     m.save(str(output_html))
+    write_gzip_companion(output_html)
     return output_html
 
 
@@ -59,41 +65,41 @@ def to_hotspots(
     :param min_samples: Minimum points per cluster.
     :return: Path to the written hotspots geojson
     """
-    gj = json.loads(Path(geojson_path).read_text(encoding="utf-8"))
-    coords = []
-    for feat in gj.get("features", []):
-        lon, lat = feat["geometry"]["coordinates"]
-        coords.append((lat, lon))
-
-    if not coords:
+    gj = load_json_file(geojson_path)
+    # (lon, lat) pairs as a single ndarray
+    lonlat = np.array(
+        [feat["geometry"]["coordinates"][:2] for feat in gj.get("features", [])],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+    if lonlat.size == 0:
         # nothing to cluster; emit an empty collection
         out = {"type": "FeatureCollection", "features": []}
         Path(output_file).write_text(json.dumps(out, indent=2), encoding="utf-8")
         return Path(output_file)
 
-    X = np.radians(np.array(coords))
+    X = np.radians(lonlat[:, ::-1])
     clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="haversine").fit(X)
 
-    labels = clustering.labels_
-    clusters: Dict[int, List[Tuple[float, float]]] = {}
-
-    for lbl, (lat, lon) in zip(labels, coords):
-        if lbl == -1:
-            continue
-        clusters.setdefault(lbl, []).append((lat, lon))
-
-    features = []
-    for lbl, pts in clusters.items():
-        mean_lat = sum(p[0] for p in pts) / len(pts)
-        mean_lon = sum(p[1] for p in pts) / len(pts)
-        features.append(
-            {
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": [mean_lon, mean_lat]},
-                # cast lbl to native int
-                "properties": {"cluster_id": int(lbl), "count": len(pts)},
-            }
+    # Drop noise, then average each cluster's points in one pass
+    clustered = clustering.labels_ != -1
+    labels, members, counts = np.unique(
+        clustering.labels_[clustered], return_inverse=True, return_counts=True
+    )
+    points = lonlat[clustered]
+    mean_lon = np.bincount(members, weights=points[:, 0]) / counts
+    mean_lat = np.bincount(members, weights=points[:, 1]) / counts
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"cluster_id": lbl, "count": count},
+        }
+        for lbl, count, lon, lat in zip(
+            labels.tolist(), counts.tolist(), mean_lon.tolist(), mean_lat.tolist()
         )
+    ]
 
     out = {"type": "FeatureCollection", "features": features}
     out_path = Path(output_file)
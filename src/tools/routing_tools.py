@@ -7,20 +7,23 @@ on surveillance camera exposure.
 """
 
 import hashlib
+import heapq
+import itertools
 import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import folium
-import geopandas as gpd
 import networkx as nx
+import numpy as np
 import osmnx as ox
-from shapely.geometry import LineString, Point
 
 from src.config.logger import logger
 from src.config.models.route_models import RouteMetrics
 from src.config.settings import RouteSettings
+from src.tools.io_tools import load_json_file, write_gzip_companion
 
 
 def load_camera_points(geojson_path: Path) -> List[Tuple[float, float]]:
@@ -35,7 +38,7 @@ def load_camera_points(geojson_path: Path) -> List[Tuple[float, float]]:
     if not geojson_path.exists():
         raise FileNotFoundError(f"GeoJSON file not found: {geojson_path}")
 
-    data = json.loads(geojson_path.read_text(encoding="utf-8"))
+    data = load_json_file(geojson_path)
 
     # Extract coordinates from Point features only
     # GeoJSON format: [longitude, latitude], we return (latitude, longitude)
@@ -52,6 +55,121 @@ def load_camera_points(geojson_path: Path) -> List[Tuple[float, float]]:
     return coords
 
 
+@dataclass(frozen=True, slots=True)
+class CameraArrays:
+    """
+    Camera positions as contiguous longitude/latitude columns.
+
+    Exposure scoring runs on these arrays directly instead of building
+    shapely geometries per camera.
+    """
+
+    lon: np.ndarray  # float64
+    lat: np.ndarray  # float64
+
+    @classmethod
+    def from_points(cls, cameras: List[Tuple[float, float]]) -> "CameraArrays":
+        """
+        :param cameras: List of (latitude, longitude) tuples
+        :return: CameraArrays in input order
+        """
+        points = np.asarray(cameras, dtype=np.float64).reshape(-1, 2)
+        return cls(
+            lon=np.ascontiguousarray(points[:, 1]),
+            lat=np.ascontiguousarray(points[:, 0]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.lon)
+
+
+def build_camera_index(
+    cameras: List[Tuple[float, float]],
+) -> Optional[CameraArrays]:
+    """
+    Build the column arrays used to score camera exposure.
+
+    :param cameras: List of (latitude, longitude) tuples for camera positions.
+    :return: CameraArrays for the cameras, or None if there are no cameras.
+    """
+    if len(cameras) == 0:
+        return None
+    camera_index = CameraArrays.from_points(cameras)
+    logger.debug(f"Built camera arrays for {len(cameras)} cameras")
+    return camera_index
+
+
+def _cameras_near_path(
+    path_coords: np.ndarray, cameras: CameraArrays, radius_deg: float
+) -> np.ndarray:
+    """
+    Find the cameras closer than a radius to a path polyline.
+
+    Distances are planar in degrees, matching a buffer of the path in
+    EPSG:4326. Cameras outside the path's padded bounding box are discarded
+    before the point-to-segment distances are computed.
+
+    :param path_coords: (N, 2) array of (longitude, latitude) path vertices.
+    :param cameras: Camera positions.
+    :param radius_deg: Buffer radius in degrees.
+    :return: Indices of the nearby cameras, in ascending order.
+    """
+    lo = path_coords.min(axis=0) - radius_deg
+    hi = path_coords.max(axis=0) + radius_deg
+    candidates = np.flatnonzero(
+        (cameras.lon >= lo[0])
+        & (cameras.lon <= hi[0])
+        & (cameras.lat >= lo[1])
+        & (cameras.lat <= hi[1])
+    )
+    if candidates.size == 0:
+        return candidates
+
+    points = np.column_stack((cameras.lon[candidates], cameras.lat[candidates]))
+    if len(path_coords) == 1:
+        dist_sq = ((points - path_coords[0]) ** 2).sum(axis=1)
+    else:
+        dist_sq = _min_segment_dist_sq(points, path_coords)
+
+    return candidates[dist_sq < radius_deg * radius_deg]
+
+
+# Upper bound on point-segment pairs evaluated at once by _min_segment_dist_sq,
+# keeping its temporaries small enough to stay in cache
+_EXPOSURE_CHUNK_PAIRS = 16384
+
+
+def _min_segment_dist_sq(points: np.ndarray, path_coords: np.ndarray) -> np.ndarray:
+    """
+    Squared distance from each point to the nearest segment of a polyline.
+
+    Points are processed in chunks so the (points x segments) temporaries
+    stay bounded for long paths and dense camera sets.
+
+    :param points: (C, 2) array of (longitude, latitude) points.
+    :param path_coords: (N, 2) array of polyline vertices, N >= 2.
+    :return: (C,) array of squared planar distances.
+    """
+    starts = path_coords[:-1]
+    seg = path_coords[1:] - starts
+    seg_len_sq = (seg**2).sum(axis=1)
+    seg_len_sq[seg_len_sq == 0] = 1.0  # Degenerate segments project to start
+    ax, ay = starts[:, 0], starts[:, 1]
+    dx, dy = seg[:, 0], seg[:, 1]
+
+    dist_sq = np.empty(len(points), dtype=np.float64)
+    step = max(1, _EXPOSURE_CHUNK_PAIRS // len(starts))
+    for lo in range(0, len(points), step):
+        px = points[lo : lo + step, 0:1] - ax
+        py = points[lo : lo + step, 1:2] - ay
+        # Projection onto each segment, clamped to its ends
+        t = np.clip((px * dx + py * dy) / seg_len_sq, 0.0, 1.0)
+        px -= t * dx
+        py -= t * dy
+        dist_sq[lo : lo + step] = (px * px + py * py).min(axis=1)
+    return dist_sq
+
+
 def build_pedestrian_graph(
     city: str,
     country: Optional[str],
@@ -174,13 +292,108 @@ def compute_shortest_path(G: nx.MultiDiGraph, src: int, dst: int) -> List[int]:
     return path
 
 
+class CandidatePath(list):
+    """
+    A path as a list of node IDs that also carries its length in metres.
+
+    The length is known from the shortest-path search, so scoring does not
+    need to walk the path's edges again.
+    """
+
+    __slots__ = ("length_m",)
+
+    def __init__(self, nodes: List[int], length_m: float) -> None:
+        super().__init__(nodes)
+        self.length_m = length_m
+
+
+def _k_shortest_paths(
+    G: nx.DiGraph, src: int, dst: int, k: int, weight: str = "length"
+) -> List[List[int]]:
+    """
+    Yen's k-shortest simple paths with Lawler's modification.
+
+    Candidates are kept in a binary heap keyed by path weight. Each accepted
+    path only spawns spur paths from the node where it deviated from its
+    parent onwards, since the earlier spur nodes share the parent's root and
+    were already explored. Spur nodes whose root path is already heavier than
+    every candidate that could still be selected are skipped.
+
+    :param G: Simple directed graph with edge weights.
+    :param src: Source node ID.
+    :param dst: Destination node ID.
+    :param k: Maximum number of paths to return.
+    :param weight: Edge attribute holding the edge weight.
+    :return: Up to k paths with their lengths, shortest first.
+    :raises nx.NetworkXNoPath: If no path exists between the nodes.
+    """
+    first_length, first = nx.single_source_dijkstra(G, src, dst, weight=weight)
+    paths = [CandidatePath(first, first_length)]
+    deviations = [0]
+    seen = {tuple(first)}
+    candidates: List[Tuple[float, int, List[int], int]] = []
+    tiebreak = itertools.count()
+
+    while len(paths) < k:
+        prev = paths[-1]
+        # Only candidates lighter than this bound can still be selected
+        needed = k - len(paths)
+        bound = (
+            heapq.nsmallest(needed, candidates)[-1][0]
+            if len(candidates) >= needed
+            else float("inf")
+        )
+
+        root_weight = sum(
+            G[u][v][weight] for u, v in zip(prev, prev[1 : deviations[-1] + 1])
+        )
+        for i in range(deviations[-1], len(prev) - 1):
+            if root_weight >= bound:
+                break
+            root = prev[: i + 1]
+            banned_nodes = set(root[:-1])
+            banned_edges = {(p[i], p[i + 1]) for p in paths if p[: i + 1] == root}
+
+            def spur_weight(u: Any, v: Any, data: Dict[str, Any]) -> Optional[float]:
+                if v in banned_nodes or (u, v) in banned_edges:
+                    return None
+                return data[weight]
+
+            try:
+                spur_length, spur = nx.single_source_dijkstra(
+                    G, prev[i], dst, weight=spur_weight
+                )
+            except nx.NetworkXNoPath:
+                spur = None
+
+            if spur is not None:
+                candidate = root[:-1] + spur
+                key = tuple(candidate)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(
+                        candidates,
+                        (root_weight + spur_length, next(tiebreak), candidate, i),
+                    )
+            root_weight += G[prev[i]][prev[i + 1]][weight]
+
+        if not candidates:
+            break
+        length, _, path, deviation = heapq.heappop(candidates)
+        paths.append(CandidatePath(path, length))
+        deviations.append(deviation)
+
+    return paths
+
+
 def generate_candidate_paths(
     G: nx.MultiDiGraph, src: int, dst: int, k: int
 ) -> List[List[int]]:
     """
     Generate up to k candidate paths between nodes.
 
-    Uses NetworkX k-shortest simple paths algorithm to find alternative routes.
+    Uses Yen's k-shortest simple paths algorithm (with Lawler's modification)
+    to find alternative routes.
     If fewer than k simple paths exist, returns all available paths.
     Always returns at least one path (the shortest) if any path exists.
 
@@ -188,12 +401,20 @@ def generate_candidate_paths(
     :param src: Source node ID.
     :param dst: Destination node ID.
     :param k: Maximum number of candidate paths to generate.
-    :return: List of paths, where each path is a list of node IDs.
+    :return: List of paths, where each path is a list of node IDs
+             (a CandidatePath carrying its length_m).
     :raises ValueError: If no path exists between the nodes.
     """
     try:
-        # Convert MultiDiGraph to DiGraph for k-shortest paths algorithm
-        # (shortest_simple_paths doesn't support multigraphs)
+        if k == 1:
+            # A single candidate is just the shortest path; Dijkstra handles
+            # parallel edges itself, so skip the DiGraph conversion
+            length, path = nx.single_source_dijkstra(G, src, dst, weight="length")
+            logger.debug(f"Generated shortest path between {src} and {dst}")
+            return [CandidatePath(path, length)]
+
+        # Convert MultiDiGraph to DiGraph for _k_shortest_paths, which
+        # expects at most one edge between any two nodes
         # Keep minimum length edge between any two nodes
         G_simple = nx.DiGraph()
 
@@ -211,15 +432,7 @@ def generate_candidate_paths(
             else:
                 G_simple.add_edge(u, v, length=data.get("length", 1.0))
 
-        # nx.shortest_simple_paths returns a generator
-        path_generator = nx.shortest_simple_paths(G_simple, src, dst, weight="length")
-
-        # Collect up to k paths
-        paths = []
-        for path in path_generator:
-            paths.append(path)
-            if len(paths) >= k:
-                break
+        paths = _k_shortest_paths(G_simple, src, dst, k, weight="length")
 
         if not paths:
             raise ValueError(f"No paths found between nodes {src} and {dst}")
@@ -241,74 +454,57 @@ def compute_exposure_for_path(
     path_nodes: List[int],
     cameras: List[Tuple[float, float]],
     settings: RouteSettings,
-    camera_gdf: Optional[gpd.GeoDataFrame] = None,
+    camera_index: Optional[CameraArrays] = None,
 ) -> RouteMetrics:
     """
     Compute exposure metrics for a path based on nearby surveillance cameras.
 
-    The function samples the path geometry at regular intervals, buffers it by
-    the configured radius, and counts cameras within the buffer using spatial
-    indexing for performance.
+    The function counts the cameras within the configured radius of the path
+    polyline, using vectorized point-to-segment distances over the camera
+    arrays.
 
     :param G: NetworkX graph representing the street network.
     :param path_nodes: List of node IDs representing the path.
     :param cameras: List of (latitude, longitude) tuples for camera positions.
     :param settings: RouteSettings instance containing buffer_radius_m.
-    :param camera_gdf: Existing GeoDataFrame containing camera positions.
+    :param camera_index: Prebuilt camera arrays (see build_camera_index).
     :return: RouteMetrics instance with exposure score and camera count.
     """
+    # Candidate paths already know their length; other paths walk their edges
+    path_length_m = getattr(path_nodes, "length_m", None)
+    if path_length_m is None:
+        path_length_m = _calculate_path_length(G, path_nodes)
+
     # Handle edge case: zero cameras
     if len(cameras) == 0:
         logger.warning("No cameras in dataset - route has zero exposure")
-        # Calculate path length
-        path_length_m = _calculate_path_length(G, path_nodes)
         return RouteMetrics(
             length_m=path_length_m,
             exposure_score=0.0,
             camera_count_near_route=0,
         )
 
-    # Build path geometry from node coordinates
-    path_coords = []
-    for node in path_nodes:
-        node_data = G.nodes[node]
-        path_coords.append((node_data["x"], node_data["y"]))  # (lon, lat)
-
-    # Calculate total path length in meters
-    path_length_m = _calculate_path_length(G, path_nodes)
-
-    # Handle single-node path (no LineString can be created)
-    if len(path_coords) < 2:
-        # Use a point buffer instead
-        if len(path_coords) == 1:
-            point = Point(path_coords[0])
-            buffer_radius_deg = settings.buffer_radius_m / 111000.0
-            buffered_path = point.buffer(buffer_radius_deg)
-        else:
-            # Empty path - return zero metrics
-            return RouteMetrics(
-                length_m=0.0,
-                exposure_score=0.0,
-                camera_count_near_route=0,
-            )
-    else:
-        # Create LineString for the path
-        path_line = LineString(path_coords)
-        buffer_radius_deg = settings.buffer_radius_m / 111000.0
-        buffered_path = path_line.buffer(buffer_radius_deg)
+    # Path vertices as an (N, 2) array of (lon, lat)
+    path_coords = np.array(
+        [(G.nodes[node]["x"], G.nodes[node]["y"]) for node in path_nodes],
+        dtype=np.float64,
+    ).reshape(-1, 2)
 
-    # Build or reuse GeoDataFrame for cameras with spatial index
-    if camera_gdf is None:
-        camera_gdf = gpd.GeoDataFrame(
-            geometry=[Point(lon, lat) for lat, lon in cameras],
-            crs="EPSG:4326",
+    if len(path_coords) == 0:
+        # Empty path - return zero metrics
+        return RouteMetrics(
+            length_m=0.0,
+            exposure_score=0.0,
+            camera_count_near_route=0,
         )
 
-    # Create GeoDataFrame for buffered path
-    path_gdf = gpd.GeoDataFrame([{"geometry": buffered_path}], crs="EPSG:4326")
+    # Build or reuse the camera arrays
+    if camera_index is None:
+        camera_index = build_camera_index(cameras)
 
-    # Spatial join to find cameras within buffer
-    cameras_in_buffer = gpd.sjoin(camera_gdf, path_gdf, predicate="within", how="inner")
+    # Cameras within the buffer around the path (or around a single node)
+    buffer_radius_deg = settings.buffer_radius_m / 111000.0
+    cameras_in_buffer = _cameras_near_path(path_coords, camera_index, buffer_radius_deg)
 
     camera_count = len(cameras_in_buffer)
 
@@ -331,6 +527,34 @@ def compute_exposure_for_path(
     )
 
 
+def compute_exposure_for_paths(
+    G: nx.MultiDiGraph,
+    paths: List[List[int]],
+    cameras: List[Tuple[float, float]],
+    settings: RouteSettings,
+    camera_index: Optional[CameraArrays] = None,
+) -> List[RouteMetrics]:
+    """
+    Compute exposure metrics for several candidate paths at once.
+
+    The camera arrays are built (or reused) once and shared by every path.
+
+    :param G: NetworkX graph representing the street network.
+    :param paths: Candidate paths, each a list of node IDs.
+    :param cameras: List of (latitude, longitude) tuples for camera positions.
+    :param settings: RouteSettings instance containing buffer_radius_m.
+    :param camera_index: Prebuilt camera arrays (see build_camera_index).
+    :return: RouteMetrics for each path, in input order.
+    """
+    if camera_index is None:
+        camera_index = build_camera_index(cameras)
+
+    return [
+        compute_exposure_for_path(G, path, cameras, settings, camera_index)
+        for path in paths
+    ]
+
+
 def _calculate_path_length(G: nx.MultiDiGraph, path_nodes: List[int]) -> float:
     """
     Calculate total path length in meters from edge weights.
@@ -413,25 +637,13 @@ def build_route_geojson(
     else:
         # Normal case: LineString
         # Find cameras near the route for drill-down
-        path_line = LineString([(lon, lat) for lon, lat in path_coords])
         buffer_radius_deg = settings.buffer_radius_m / 111000.0
-        buffered_path = path_line.buffer(buffer_radius_deg)
-
-        # Build GeoDataFrame for cameras
-        camera_gdf = gpd.GeoDataFrame(
-            {"camera_id": list(range(len(cameras)))},
-            geometry=[Point(lon, lat) for lat, lon in cameras],
-            crs="EPSG:4326",
-        )
-
-        # Create GeoDataFrame for buffered path
-        path_gdf = gpd.GeoDataFrame([{"geometry": buffered_path}], crs="EPSG:4326")
-
-        # Spatial join to find cameras within buffer
-        cameras_in_buffer = gpd.sjoin(
-            camera_gdf, path_gdf, predicate="within", how="inner"
+        cameras_in_buffer = _cameras_near_path(
+            np.asarray(path_coords, dtype=np.float64),
+            CameraArrays.from_points(cameras),
+            buffer_radius_deg,
         )
-        nearby_camera_ids = cameras_in_buffer["camera_id"].tolist()
+        nearby_camera_ids = cameras_in_buffer.tolist()
 
         # Build properties
         properties = {
@@ -457,6 +669,7 @@ def build_route_geojson(
     # Save to file
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(feature_collection, indent=2), encoding="utf-8")
+    write_gzip_companion(output_path)
 
     logger.info(f"Saved route GeoJSON to {output_path}")
     return output_path
@@ -488,7 +701,7 @@ def render_route_map(
         raise FileNotFoundError(f"Cameras GeoJSON not found: {cameras_geojson_path}")
 
     # Load route data
-    route_data = json.loads(route_geojson_path.read_text(encoding="utf-8"))
+    route_data = load_json_file(route_geojson_path)
     features = route_data.get("features", [])
 
     if not features:
@@ -549,7 +762,7 @@ def render_route_map(
     ).add_to(m)
 
     # Load and add cameras
-    cameras_data = json.loads(cameras_geojson_path.read_text(encoding="utf-8"))
+    cameras_data = load_json_file(cameras_geojson_path)
     camera_features = cameras_data.get("features", [])
 
     for feat in camera_features:
@@ -572,6 +785,7 @@ def render_route_map(
     # Save map
     output_html.parent.mkdir(parents=True, exist_ok=True)
     m.save(str(output_html))
+    write_gzip_companion(output_html)
 
     logger.info(f"Saved route map to {output_html}")
     return output_html
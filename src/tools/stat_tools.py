@@ -1,6 +1,19 @@
 from collections import Counter
 from typing import List, Dict, Any
 
+import numpy as np
+
+
+def _value_counts(values: np.ndarray) -> Counter:
+    """
+    Count occurrences of each distinct value in an array.
+    Counter rather than np.unique: object arrays of mixed label types
+    cannot be sorted, and first-seen order keeps most_common() ties stable.
+    :param values: 1-D array of hashable labels
+    :return: Counter mapping label to count (plain Python types)
+    """
+    return Counter(values.tolist())
+
 
 def compute_statistics(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -13,30 +26,31 @@ def compute_statistics(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
     total = len(elements)
     analysis = [el["analysis"] for el in elements]
 
-    sensitive_count = sum(1 for a in analysis if a.get("sensitive"))
-    public_count = sum(1 for a in analysis if a.get("public") is True)
-    private_count = sum(1 for a in analysis if a.get("public") is False)
-
-    zone_counts = Counter()
-    zone_sensitivity = Counter()
-    for e in elements:
-        z = e["analysis"].get("zone") or "unknown"
-        zone_counts[z] += 1
-        if e["analysis"].get("sensitive"):
-            zone_sensitivity[z] += 1
-
-    camera_type_counts = Counter(
-        a.get("camera_type") for a in analysis if a.get("camera_type")
+    # Extract each field once into a column array, then aggregate vectorised
+    sensitive = np.fromiter(
+        (bool(a.get("sensitive")) for a in analysis), dtype=bool, count=total
+    )
+    public = np.fromiter(
+        (a.get("public") is True for a in analysis), dtype=bool, count=total
+    )
+    private = np.fromiter(
+        (a.get("public") is False for a in analysis), dtype=bool, count=total
+    )
+    zones = np.array([a.get("zone") or "unknown" for a in analysis], dtype=object)
+    camera_types = np.array(
+        [a["camera_type"] for a in analysis if a.get("camera_type")], dtype=object
+    )
+    operators = np.array(
+        [a["operator"] for a in analysis if a.get("operator")], dtype=object
     )
-    operator_counts = Counter(a.get("operator") for a in analysis if a.get("operator"))
 
     return {
         "total": total,
-        "sensitive_count": sensitive_count,
-        "public_count": public_count,
-        "private_count": private_count,
-        "zone_counts": zone_counts,
-        "zone_sensitivity_counts": zone_sensitivity,
-        "camera_type_counts": camera_type_counts,
-        "operator_counts": operator_counts,
+        "sensitive_count": int(sensitive.sum()),
+        "public_count": int(public.sum()),
+        "private_count": int(private.sum()),
+        "zone_counts": _value_counts(zones),
+        "zone_sensitivity_counts": _value_counts(zones[sensitive]),
+        "camera_type_counts": _value_counts(camera_types),
+        "operator_counts": _value_counts(operators),
     }
@@ -1,16 +1,27 @@
 import json
 import re
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Union
 
+import orjson
 from langchain_core.tools import Tool, tool
 
 from src.config.logger import logger
 from src.config.settings import OverpassSettings
 from src.memory.store import MemoryStore
-from src.utils.db import query_hash, payload_hash
+from src.utils.db import file_hash, query_hash
+from src.utils.elements import Elements, sidecar_path
 from src.utils.overpass import build_query, run_query as execute_overpass_query
-from src.tools.io_tools import save_overpass_dump
+from src.utils.scheduler import run_step_graph
+from src.tools.io_tools import city_slug, save_overpass_dump
+
+# Settings are read from the environment once rather than on every tool call
+_OVERPASS_SETTINGS = OverpassSettings()
+
+# A batch argument that refers to an earlier invocation's result: "$0" is the
+# whole observation, "$0.temp_file" one field of its JSON object
+_BATCH_REF = re.compile(r"^\$(\d+)(?:\.(\w+))?$")
 
 
 def parse_tool_input(raw_input: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
@@ -91,8 +102,7 @@ def build_overpass_query_tool(tool_input: Union[str, Dict[str, Any]]) -> str:
         logger.info(
             f"Building Overpass query for {city}" + (f", {country}" if country else "")
         )
-        settings = OverpassSettings()
-        query = build_query(city, country=country, settings=settings)
+        query = build_query(city, country=country, settings=_OVERPASS_SETTINGS)
         logger.debug(f"Built query: {query[:100]}...")
         return query
     except Exception as e:
@@ -125,8 +135,7 @@ def run_overpass_query_tool(tool_input: Union[str, Dict[str, Any]]) -> str:
             return '{"error": "Query parameter is required. Use format: {"query": "QueryString"}"}'
 
         logger.debug("Executing Overpass query")
-        settings = OverpassSettings()
-        data = execute_overpass_query(query, settings=settings)
+        data = execute_overpass_query(query, settings=_OVERPASS_SETTINGS)
         element_count = len(data.get("elements", []))
         logger.info(f"Query returned {element_count} surveillance elements")
 
@@ -191,22 +200,18 @@ def create_check_cache_tool(memory: MemoryStore) -> Tool:
             q_hash = query_hash(query)
             logger.debug(f"Checking cache for query hash: {q_hash[:16]}...")
 
-            # Look for cache entry in memory
-            for mem in memory.load(agent_name):
-                if mem.step == "cache" and mem.content.startswith(q_hash):
-                    _, filepath_str, p_hash = mem.content.split("|")
-                    filepath = Path(filepath_str)
-
-                    if not filepath.exists():
-                        logger.warning(f"Cache file missing: {filepath}")
-                        continue
-
-                    # Load and verify cached data
-                    with filepath.open(encoding="utf-8") as f:
-                        data = json.load(f)
-
-                    # Verify integrity
-                    if payload_hash(data) == p_hash:
+            # Look up the cache entry for this query
+            entry = memory.get_cache(agent_name, "cache", q_hash)
+            if entry is not None:
+                filepath = Path(entry["path"])
+
+                if not filepath.exists():
+                    logger.warning(f"Cache file missing: {filepath}")
+                else:
+                    # Verify integrity of the cached bytes before parsing them
+                    raw = filepath.read_bytes()
+                    if file_hash(raw) == entry.get("file_hash"):
+                        data = orjson.loads(raw)
                         element_count = len(data.get("elements", []))
                         logger.info(
                             f"Cache hit! Loaded {element_count} elements from {filepath}"
@@ -218,6 +223,9 @@ def create_check_cache_tool(memory: MemoryStore) -> Tool:
                             "elements_count": element_count,
                             "message": f"Cache hit! Found {element_count} surveillance cameras from previous query.",
                         }
+                        npz_path = sidecar_path(filepath)
+                        if npz_path.exists():
+                            result["elements_npz"] = str(npz_path)
                         return json.dumps(result)
                     else:
                         logger.warning(f"Cache integrity check failed for {filepath}")
@@ -285,9 +293,14 @@ def create_save_data_tool(memory: MemoryStore) -> Tool:
                 try:
                     cache_path = Path(cache_filepath)
                     if cache_path.exists():
-                        with open(cache_path, "r") as f:
-                            data = json.load(f)
-                        element_count = len(data.get("elements", []))
+                        npz_path = sidecar_path(cache_path)
+                        if npz_path.exists():
+                            # Count from the saved columns instead of parsing the dump
+                            element_count = Elements.count(npz_path)
+                        else:
+                            with open(cache_path, "r") as f:
+                                data = json.load(f)
+                            element_count = len(data.get("elements", []))
                         logger.info(
                             f"Using cached data from {cache_path} with {element_count} elements"
                         )
@@ -298,6 +311,8 @@ def create_save_data_tool(memory: MemoryStore) -> Tool:
                             "elements_count": element_count,
                             "from_cache": True,
                         }
+                        if npz_path.exists():
+                            result["elements_npz"] = str(npz_path)
                         return json.dumps(result)
                     else:
                         return json.dumps(
@@ -352,16 +367,22 @@ def create_save_data_tool(memory: MemoryStore) -> Tool:
                 return json.dumps(result)
 
             # Save non-empty data
-            city_key = city.lower().replace(" ", "_")
+            city_key = city_slug(city)
             output_path = Path(output_dir) / f"{city_key}.json"
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
             saved_path = save_overpass_dump(data, city, output_path)
+            npz_path = Elements.from_overpass(data).save(sidecar_path(saved_path))
 
             # Cache the result
             q_hash = query_hash(query)
-            p_hash = payload_hash(data)
-            memory.store(agent_name, "cache", f"{q_hash}|{saved_path}|{p_hash}")
+            f_hash = file_hash(saved_path.read_bytes())
+            memory.put_cache(
+                agent_name,
+                "cache",
+                q_hash,
+                {"path": str(saved_path), "file_hash": f_hash},
+            )
 
             logger.info(f"Saved {element_count} elements to {saved_path}")
             result = {
@@ -369,6 +390,7 @@ def create_save_data_tool(memory: MemoryStore) -> Tool:
                 "empty": False,
                 "filepath": str(saved_path),
                 "elements_count": element_count,
+                "elements_npz": str(npz_path),
             }
             return json.dumps(result)
 
@@ -380,6 +402,136 @@ def create_save_data_tool(memory: MemoryStore) -> Tool:
     return save_overpass_data_tool
 
 
+def _batch_refs(arguments: Dict[str, Any]) -> List[int]:
+    """
+    :param arguments: Arguments of one batch invocation
+    :return: Indexes of the invocations whose results they reference
+    """
+    refs = []
+    for value in arguments.values():
+        if isinstance(value, str):
+            match = _BATCH_REF.match(value)
+            if match:
+                refs.append(int(match.group(1)))
+    return refs
+
+
+def _resolve_batch_refs(
+    arguments: Dict[str, Any], observations: Dict[int, str]
+) -> Dict[str, Any]:
+    """
+    Replace references to earlier invocations with their results.
+
+    :param arguments: Arguments of one batch invocation
+    :param observations: Raw observations of the finished invocations
+    :return: Arguments with every reference substituted
+    """
+    resolved = {}
+    for key, value in arguments.items():
+        match = _BATCH_REF.match(value) if isinstance(value, str) else None
+        if match:
+            observation = observations[int(match.group(1))]
+            field = match.group(2)
+            value = orjson.loads(observation).get(field) if field else observation
+        resolved[key] = value
+    return resolved
+
+
+def _decode_observation(observation: str) -> Any:
+    """
+    :param observation: Raw tool observation
+    :return: The decoded JSON object, or the text itself if it is not JSON
+    """
+    try:
+        return orjson.loads(observation)
+    except orjson.JSONDecodeError:
+        return observation
+
+
+def create_batch_tool(tools: List[Tool]) -> Tool:
+    """
+    Factory function to create a tool that runs several tool calls in one step.
+
+    Invocations run as a dependency graph: those that do not reference each
+    other run concurrently, and an invocation referencing "$i" waits for
+    invocation i. This lets the agent plan a whole stretch of the workflow in
+    a single LLM turn instead of one turn per tool.
+
+    :param tools: The tools the batch may call
+    :return: Configured LangChain Tool for batched tool calls
+    """
+    by_name = {t.name: t for t in tools}
+
+    def run_invocation(
+        index: int,
+        name: Optional[str],
+        arguments: Dict[str, Any],
+        observations: Dict[int, str],
+    ) -> None:
+        target = by_name.get(name)
+        if target is None:
+            raise ValueError(f"Unknown tool: {name}")
+        observations[index] = target.func(_resolve_batch_refs(arguments, observations))
+
+    @tool("batch", return_direct=False)
+    def batch_tool(tool_input: Union[str, Dict[str, Any]]) -> str:
+        """
+        Run several tool calls in one step and return all of their results.
+
+        Independent calls run concurrently. An argument value "$i" is replaced
+        by the result of call i (counting from 0), and "$i.field" by one field
+        of that JSON result; such a call runs after call i.
+
+        Expected input: {"invocations": [{"tool_name": "build_overpass_query", "arguments": {"city": "CityName"}}, {"tool_name": "check_query_cache", "arguments": {"query": "$0", "agent_name": "ScraperAgent"}}]}
+        :param tool_input: Tool parameters (JSON string or dict)
+        :return: JSON string {"results": [{"tool_name": ..., "result": ...}, ...]} in call order
+        """
+        params = parse_tool_input(tool_input)
+        logger.debug(f"batch_tool received: {tool_input}")
+        invocations = params.get("invocations")
+        if not isinstance(invocations, list) or not invocations:
+            return json.dumps(
+                {
+                    "error": "invocations is required. Use format: "
+                    "{'invocations': [{'tool_name': 'name', 'arguments': {...}}]}"
+                }
+            )
+
+        observations: Dict[int, str] = {}
+        steps = {}
+        dependencies = {}
+        for i, invocation in enumerate(invocations):
+            if not isinstance(invocation, dict):
+                invocation = {}
+            arguments = invocation.get("arguments") or {}
+            if not isinstance(arguments, dict):
+                arguments = parse_tool_input(arguments)
+            steps[str(i)] = partial(
+                run_invocation, i, invocation.get("tool_name"), arguments, observations
+            )
+            # Only earlier calls can be referenced; anything else never resolves
+            dependencies[str(i)] = {
+                str(ref) if ref < i else "" for ref in _batch_refs(arguments)
+            }
+
+        outcomes = run_step_graph(steps, dependencies)
+
+        results = []
+        for i, invocation in enumerate(invocations):
+            name = invocation.get("tool_name") if isinstance(invocation, dict) else None
+            if str(i) not in outcomes:
+                result: Any = {"error": "Skipped: a referenced call did not succeed"}
+            elif outcomes[str(i)] is not None:
+                result = {"error": str(outcomes[str(i)])}
+            else:
+                result = _decode_observation(observations[i])
+            results.append({"tool_name": name, "result": result})
+        logger.info(f"Batch ran {len(observations)}/{len(invocations)} tool calls")
+        return json.dumps({"results": results})
+
+    return batch_tool
+
+
 def create_surveillance_data_collector_tools(memory: MemoryStore) -> list:
     """
     Create all tools needed for the surveillance data collector agent.
@@ -387,9 +539,10 @@ def create_surveillance_data_collector_tools(memory: MemoryStore) -> list:
     :param memory: MemoryStore instance for caching
     :return: List of configured LangChain tools
     """
-    return [
+    tools = [
         build_overpass_query_tool,
         run_overpass_query_tool,
         create_check_cache_tool(memory),
         create_save_data_tool(memory),
     ]
+    return tools + [create_batch_tool(tools)]
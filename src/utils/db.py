@@ -1,9 +1,12 @@
 import hashlib
 import json
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
-from sqlalchemy import Engine
+import orjson
+import xxhash
+from sqlalchemy import Engine, event, make_url
 
 from src.config.settings import DatabaseSettings
 from sqlmodel import create_engine
@@ -12,17 +15,43 @@ from sqlmodel import create_engine
 def get_engine(settings: DatabaseSettings) -> Engine:
     """
     Create and return a SQLAlchemy engine based on settings.
-    :param settings: The SQLite db settings
+    :param settings: The db settings
     :return: SQLAlchemy Engine
     """
+    connect_args = {}
+    if make_url(settings.url).get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False  # for SQLite multithreading
     engine = create_engine(
         settings.url,
         echo=settings.echo,
-        connect_args={"check_same_thread": False},  # for SQLite multithreading
+        connect_args=connect_args,
     )
     return engine
 
 
+def enable_sqlite_wal(engine: Engine) -> None:
+    """
+    Switch SQLite connections of an engine to write-ahead logging.
+
+    WAL lets readers proceed while a writer commits, and ``synchronous=NORMAL``
+    avoids an fsync per transaction. No-op for non-SQLite engines.
+    :param engine: SQLAlchemy Engine
+    :return: None
+    """
+    if engine.url.get_backend_name() != "sqlite":
+        return
+    if event.contains(engine, "connect", _set_sqlite_wal_pragmas):
+        return
+    event.listen(engine, "connect", _set_sqlite_wal_pragmas)
+
+
+def _set_sqlite_wal_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 def summarize(result: Any, *, max_len: int = 200) -> str:
     """
     Summarizes the input `result` into a short string.
@@ -40,6 +69,7 @@ def summarize(result: Any, *, max_len: int = 200) -> str:
     return (str(result)[:max_len] + "…") if len(str(result)) > max_len else str(result)
 
 
+@lru_cache(maxsize=1024)
 def query_hash(query: str) -> str:
     """
     Stable 8‑char digest of the query text (URL‑safe)
@@ -49,11 +79,29 @@ def query_hash(query: str) -> str:
     return hashlib.sha256(query.encode()).hexdigest()[:8]
 
 
-def payload_hash(data: Dict[str, Any]) -> str:
+def canonical_json(data: Any) -> bytes:
+    """
+    Serialize data to compact JSON with sorted keys, suitable for hashing.
+    :param data: JSON-serializable data
+    :return: The canonical UTF-8 encoded JSON
+    """
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+
+def file_hash(raw: bytes) -> str:
+    """
+    Digest the raw bytes of a saved file, so a cached dump can be verified
+    before it is parsed.
+    :param raw: The file contents
+    :return: 32-char xxh3-128 hex digest of the bytes
+    """
+    return xxhash.xxh3_128_hexdigest(raw)
+
+
+def tags_hash(tags: Dict[str, Any]) -> str:
     """
-    Digest the full Overpass JSON payload.
-    :param data: The payload
-    :return: The sha256 encoded payload
+    Digest an element's tag dictionary independent of key order.
+    :param tags: OSM tags of a single element
+    :return: 32-char blake2b hex digest of the canonical JSON
     """
-    dumped = json.dumps(data, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(dumped.encode()).hexdigest()
+    return hashlib.blake2b(canonical_json(tags), digest_size=16).hexdigest()
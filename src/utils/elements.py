@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def sidecar_path(dump_path: Union[str, Path]) -> Path:
+    """
+    :param dump_path: Path to an Overpass JSON dump
+    :return: Path of the Elements archive saved next to it
+    """
+    return Path(dump_path).with_suffix(".npz")
+
+
+@dataclass(frozen=True, slots=True)
+class Elements:
+    """
+    Column (struct-of-arrays) view of Overpass elements.
+
+    Each array holds one field for every element, in input order, so numeric
+    work runs on contiguous arrays instead of re-reading element dicts.
+    Missing coordinates are stored as NaN.
+    """
+
+    ids: np.ndarray  # int64
+    lat: np.ndarray  # float64
+    lon: np.ndarray  # float64
+    kind: np.ndarray  # int16 codes into ``kinds``
+    kinds: Tuple[str, ...]  # man_made values; code 0 is "" (tag absent)
+
+    @classmethod
+    def from_overpass(cls, data: Dict[str, Any]) -> "Elements":
+        """
+        Build the columns for an Overpass JSON document.
+
+        :param data: Overpass JSON with an `elements` list
+        :return: Elements for data["elements"]
+        """
+        return cls.from_elements(data.get("elements", []))
+
+    @classmethod
+    def from_elements(cls, elements: Sequence[Dict[str, Any]]) -> "Elements":
+        """
+        Build the columns for a list of element dicts in a single pass.
+
+        :param elements: Overpass (or enriched) element dicts
+        :return: Elements with one row per input element
+        """
+        n = len(elements)
+        ids = np.zeros(n, dtype=np.int64)
+        lat = np.full(n, np.nan, dtype=np.float64)
+        lon = np.full(n, np.nan, dtype=np.float64)
+        kind = np.zeros(n, dtype=np.int16)
+        codes: Dict[str, int] = {"": 0}
+
+        for i, element in enumerate(elements):
+            ids[i] = element.get("id", 0)
+            if element.get("lat") is not None and element.get("lon") is not None:
+                lat[i] = element["lat"]
+                lon[i] = element["lon"]
+            man_made = element.get("tags", {}).get("man_made", "")
+            kind[i] = codes.setdefault(man_made, len(codes))
+
+        return cls(ids=ids, lat=lat, lon=lon, kind=kind, kinds=tuple(codes))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def has_coords(self) -> np.ndarray:
+        """
+        :return: Boolean mask of elements with both latitude and longitude
+        """
+        return ~(np.isnan(self.lat) | np.isnan(self.lon))
+
+    def kind_names(self) -> List[str]:
+        """
+        :return: The man_made value of every element ("" when absent)
+        """
+        return [self.kinds[code] for code in self.kind.tolist()]
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the columns to an uncompressed .npz archive.
+
+        :param path: Destination .npz file
+        :return: The written path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            ids=self.ids,
+            lat=self.lat,
+            lon=self.lon,
+            kind=self.kind,
+            kinds=np.array(self.kinds, dtype=str),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Elements":
+        """
+        Read columns written by save().
+
+        :param path: The .npz archive
+        :return: The stored Elements
+        """
+        with np.load(path) as npz:
+            return cls(
+                ids=npz["ids"],
+                lat=npz["lat"],
+                lon=npz["lon"],
+                kind=npz["kind"],
+                kinds=tuple(npz["kinds"].tolist()),
+            )
+
+    @staticmethod
+    def count(path: Union[str, Path]) -> int:
+        """
+        Number of elements in a saved archive, reading only the id column.
+
+        :param path: The .npz archive
+        :return: Element count
+        """
+        with np.load(path) as npz:
+            return len(npz["ids"])
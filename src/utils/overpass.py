@@ -1,10 +1,63 @@
 from __future__ import annotations
-from typing import Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Tuple
 import textwrap
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+import xxhash
 from src.config.settings import OverpassSettings
 from src.utils.decorators import with_retry
 
+# Number of Overpass area IDs resolved through Nominatim kept per process
+_AREA_ID_CACHE_SIZE = 1024
+
+# Bytes read from the Overpass response per chunk when streaming to disk
+_STREAM_CHUNK_SIZE = 1 << 16
+
+# Keep-alive connections kept per host by the shared HTTP session
+_SESSION_POOL_SIZE = 20
+
+# Minimum seconds between Nominatim requests (its usage policy allows 1/s)
+_NOMINATIM_MIN_INTERVAL = 1.0
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+# Serialises Nominatim requests across threads and spaces them out
+_NOMINATIM_LOCK = threading.Lock()
+_nominatim_next_at = 0.0
+
+# Serialises area ID lookups, so a city requested by several threads at
+# once is geocoded by the first and served from the cache for the others
+_AREA_ID_LOCK = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session used for Overpass and Nominatim.
+
+    Every collector and every city of a batch goes through the same
+    connection pool, so TCP and TLS handshakes are paid once per host rather
+    than once per request.
+
+    :return: The shared requests session
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=_SESSION_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
 
 def best_area_candidate(results: list[Dict[str, Any]]) -> tuple[int, str]:
     """
@@ -40,6 +93,9 @@ def nominatim_city(
     """
     Query Nominatim to find the best OSM boundary match for a city name.
 
+    Requests are made one at a time across the process, at most one per
+    `_NOMINATIM_MIN_INTERVAL` seconds, as Nominatim's usage policy requires.
+
     :param settings: The Overpass base settings.
     :param osm_query: The name of the city to search for.
     :param country: Optional 2-letter ISO country code to narrow the search.
@@ -57,12 +113,21 @@ def nominatim_city(
     if country:
         params["countrycodes"] = country.lower()
 
-    try:
-        r = requests.get(url, params=params, headers=settings.headers, timeout=30)
-        r.raise_for_status()
-        results = r.json()
-    except (requests.RequestException, ValueError) as e:
-        raise RuntimeError(f"Nominatim request failed for {osm_query!r}") from e
+    global _nominatim_next_at
+    with _NOMINATIM_LOCK:
+        wait = _nominatim_next_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            r = http_session().get(
+                url, params=params, headers=settings.headers, timeout=30
+            )
+            r.raise_for_status()
+            results = r.json()
+        except (requests.RequestException, ValueError) as e:
+            raise RuntimeError(f"Nominatim request failed for {osm_query!r}") from e
+        finally:
+            _nominatim_next_at = time.monotonic() + _NOMINATIM_MIN_INTERVAL
 
     if not results:
         raise RuntimeError(f"No Nominatim result for {osm_query!r}")
@@ -86,6 +151,28 @@ def area_id(osm_id: int, osm_type: str) -> int:
     return base + osm_id
 
 
+@lru_cache(maxsize=_AREA_ID_CACHE_SIZE)
+def _cached_area_id(
+    city: str, country: str | None, headers: tuple[tuple[str, Any], ...]
+) -> int:
+    """
+    Resolve a city's Overpass area ID through Nominatim, memoised per process.
+
+    The key holds everything the lookup depends on: the Nominatim request
+    only uses the settings' headers, which are passed as sorted items so
+    they are hashable. Failed lookups are not cached.
+
+    :param city: The name of the city.
+    :param country: Optional ISO country code.
+    :param headers: Request headers as sorted (name, value) pairs.
+    :returns: The Overpass area ID.
+    """
+    osm_id, osm_type = nominatim_city(
+        city, country=country, settings=OverpassSettings(headers=dict(headers))
+    )
+    return area_id(osm_id, osm_type)
+
+
 def build_query(
     city: str,
     *,
@@ -95,14 +182,19 @@ def build_query(
     """
     Build an Overpass QL query to find all `man_made=surveillance` features in a city.
 
+    The city's area is resolved through Nominatim once per (city, country) and
+    reused by later calls in the same process.
+
     :param city: The name of the city to query.
     :param country: Optional ISO country code to disambiguate city name.
     :param settings: The Overpass base settings.
     :returns: A formatted Overpass QL query string.
     """
     try:
-        osm_id, osm_type = nominatim_city(city, country=country, settings=settings)
-        a_id = area_id(osm_id, osm_type)
+        with _AREA_ID_LOCK:
+            a_id = _cached_area_id(
+                city, country, tuple(sorted(settings.headers.items()))
+            )
     except Exception as e:
         raise RuntimeError(f"Failed to construct query for city '{city}': {e}") from e
 
@@ -131,7 +223,7 @@ def run_query(
     :raises RuntimeError: If the Overpass API returns an error.
     """
     try:
-        resp = requests.post(
+        resp = http_session().post(
             settings.endpoint,
             data=query.encode("utf-8"),
             timeout=settings.timeout,
@@ -145,3 +237,45 @@ def run_query(
         ) from exc
     except (requests.RequestException, ValueError) as e:
         raise RuntimeError("Failed to execute Overpass query") from e
+
+
+@with_retry
+def stream_query_to_file(
+    query: str, dest: Path | str, settings: OverpassSettings = OverpassSettings()
+) -> Tuple[Path, str]:
+    """
+    Submit an Overpass QL query and stream the raw response body to a file,
+    hashing it in the same pass. Memory use stays at one chunk regardless of
+    the payload size and the response is never re-serialized.
+
+    :param query: The Overpass query to execute.
+    :param dest: The file to write the response to.
+    :param settings: The Overpass base settings.
+    :returns: The written path and the xxh3-128 hex digest of its bytes
+              (the same digest as `file_hash`).
+    :raises RuntimeError: If the Overpass API returns an error.
+    """
+    dest = Path(dest)
+    hasher = xxhash.xxh3_128()
+    try:
+        with http_session().post(
+            settings.endpoint,
+            data=query.encode("utf-8"),
+            timeout=settings.timeout,
+            headers=settings.headers,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with dest.open("wb") as fh:
+                for chunk in resp.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    fh.write(chunk)
+        return dest, hasher.hexdigest()
+    except requests.HTTPError as exc:
+        raise RuntimeError(
+            f"Overpass error {exc.response.status_code}: {exc.response.text.strip()}"
+        ) from exc
+    except requests.RequestException as e:
+        dest.unlink(missing_ok=True)
+        raise RuntimeError("Failed to execute Overpass query") from e
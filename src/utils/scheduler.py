@@ -0,0 +1,76 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Set
+
+from src.config.logger import logger
+
+
+def run_step_graph(
+    steps: Dict[str, Callable[[], None]],
+    dependencies: Dict[str, Set[str]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[BaseException]]:
+    """
+    Execute steps as a dependency graph, running every ready step concurrently.
+
+    A step becomes ready once all of its dependencies have completed
+    successfully. If a dependency fails or is skipped, its dependents are
+    skipped as well. Dependencies on names that are not in ``steps`` are
+    treated as unsatisfiable, so the dependent step is skipped.
+
+    :param steps: Mapping of step name to a zero-argument callable
+    :param dependencies: Mapping of step name to the names it depends on
+    :param max_workers: Thread pool size (defaults to the number of steps)
+    :return: Mapping of executed step name to its exception (None on success);
+             skipped steps are absent
+    """
+    remaining = {name: set(dependencies.get(name, ())) for name in steps}
+    dependents: Dict[str, Set[str]] = {name: set() for name in steps}
+    blocked: Set[str] = set()
+    for name, deps in remaining.items():
+        for dep in deps:
+            if dep in steps:
+                dependents[dep].add(name)
+            else:
+                blocked.add(name)
+
+    outcomes: Dict[str, Optional[BaseException]] = {}
+
+    def skip(name: str) -> None:
+        # Drop a step and, transitively, everything waiting on it
+        if name not in remaining:
+            return
+        del remaining[name]
+        logger.debug(f"Skipping step {name}: unmet dependency")
+        for child in dependents[name]:
+            skip(child)
+
+    for name in blocked:
+        skip(name)
+
+    if not remaining:
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(remaining)) as pool:
+        running: Dict[Future, str] = {}
+
+        def submit_ready() -> None:
+            for name in [n for n, deps in remaining.items() if not deps]:
+                del remaining[name]
+                running[pool.submit(steps[name])] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                outcomes[name] = error
+                for child in dependents[name]:
+                    if error is None:
+                        if child in remaining:
+                            remaining[child].discard(name)
+                    else:
+                        skip(child)
+            submit_ready()
+
+    return outcomes
@@ -22,3 +22,18 @@ def test_simple_agent_runs():
     agent = SimpleAgent(name="Simple", tools={}, memory=None)
     # Should run without errors
     agent.achieve_goal("DATA")
+
+
+def test_memories_are_flushed_once_per_run(mem_fake):
+    calls = []
+    mem_fake.store_many = lambda records: calls.append(list(records))
+
+    class TwoStepAgent(SimpleAgent):
+        def plan(self, observation):
+            return ["first", "second"]
+
+    agent = TwoStepAgent(name="Simple", tools={}, memory=mem_fake)
+    agent.achieve_goal("DATA")
+
+    assert calls == [[("Simple", "first", "ok"), ("Simple", "second", "ok")]]
+    assert agent._pending_memories == []
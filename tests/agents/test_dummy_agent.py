@@ -1,7 +1,8 @@
 from src.agents.dummy_agent import DummyAgent
 
 
-def test_dummy_agent_cycle(capsys):
+def test_dummy_agent_cycle(capsys, monkeypatch):
+    monkeypatch.setenv("DUMMY_AGENT_PRINT", "1")
     agent = DummyAgent(name="TestDummy")
     agent.achieve_goal("INPUT")
     captured = capsys.readouterr().out.strip().splitlines()
@@ -9,3 +10,20 @@ def test_dummy_agent_cycle(capsys):
     assert len(captured) == 3
     for i, line in enumerate(captured, start=1):
         assert f"executed action: dummy_step{i}" in line
+
+
+def test_dummy_agent_is_silent_by_default(capsys, monkeypatch):
+    monkeypatch.delenv("DUMMY_AGENT_PRINT", raising=False)
+    agent = DummyAgent(name="TestDummy")
+    agent.achieve_goal("INPUT")
+    assert capsys.readouterr().out == ""
+
+
+def test_dummy_agent_no_log_is_silent(capsys, monkeypatch):
+    monkeypatch.setenv("DUMMY_AGENT_PRINT", "1")
+    agent = DummyAgent(name="TestDummy", no_log=True)
+
+    assert agent.plan("INPUT") == ("dummy_step1", "dummy_step2", "dummy_step3")
+    assert agent.act("dummy_step1", {}) == "result_of_dummy_step1"
+    agent.achieve_goal("INPUT")
+    assert capsys.readouterr().out == ""
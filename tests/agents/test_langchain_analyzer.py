@@ -0,0 +1,97 @@
+from unittest.mock import Mock
+
+from src.agents.langchain_analyzer import (
+    AnalyzeOptions,
+    _RESPONSE_KEYS,
+    SurveillanceAnalyzerAgent,
+)
+
+
+def test_analyze_reports_missing_file(mem_fake, tmp_path):
+    agent = SurveillanceAnalyzerAgent("AnalyzerAgent", mem_fake)
+
+    result = agent.analyze({"path": str(tmp_path / "missing.json")})
+
+    assert result["success"] is False
+    assert "File not found" in result["error"]
+
+
+def test_input_check_sees_deleted_file(tmp_path):
+    target = tmp_path / "lund.json"
+    target.write_text("{}")
+
+    assert SurveillanceAnalyzerAgent._check_input({"path": str(target)})[1] is None
+    target.unlink()
+
+    _, error = SurveillanceAnalyzerAgent._check_input({"path": str(target)})
+    assert error["success"] is False
+
+
+def test_analyze_options_fill_defaults():
+    options = AnalyzeOptions.from_input({"path": "x.json", "generate_heatmap": True})
+
+    assert options.generate_heatmap is True
+    assert options.generate_geojson is True
+    assert options.plot_hotspots is False
+
+
+def test_llm_and_chain_are_built_on_first_use(mem_fake, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "src.agents.langchain_analyzer.get_shared_surveillance_llm",
+        lambda settings: calls.append(settings) or object(),
+    )
+
+    agent = SurveillanceAnalyzerAgent("AnalyzerAgent", mem_fake)
+    assert calls == []
+
+    assert agent.chain.llm is agent.llm
+    assert len(calls) == 1
+
+
+def test_analyze_batch_keeps_input_order(mem_fake, tmp_path):
+    first, second = tmp_path / "lund.json", tmp_path / "malmo.json"
+    first.write_text("{}")
+    second.write_text("{}")
+    agent = SurveillanceAnalyzerAgent("AnalyzerAgent", mem_fake)
+    agent.chain = Mock()
+    agent.chain.batch.side_effect = lambda inputs, max_concurrency: [
+        {"success": True, "element_count": i} for i, _ in enumerate(inputs)
+    ]
+    agent.chain.generate_visualizations.side_effect = lambda result, options: result
+
+    results = agent.analyze_batch(
+        [
+            {"path": str(first)},
+            {"path": str(tmp_path / "missing.json")},
+            {"path": str(second)},
+        ],
+        max_concurrency=2,
+    )
+
+    agent.chain.batch.assert_called_once_with(
+        [{"path": str(first)}, {"path": str(second)}], max_concurrency=2
+    )
+    assert [r["success"] for r in results] == [True, False, True]
+    assert results[0]["path"] == str(first)
+    assert results[2]["element_count"] == 1
+    assert "File not found" in results[1]["error"]
+
+
+def test_analyze_copies_only_known_outputs(mem_fake, tmp_path):
+    target = tmp_path / "lund.json"
+    target.write_text("{}")
+    agent = SurveillanceAnalyzerAgent("AnalyzerAgent", mem_fake)
+    agent.chain = Mock()
+    agent.chain.invoke.return_value = {"success": True}
+    agent.chain.generate_visualizations.return_value = {
+        "heatmap_path": "heat.html",
+        "enriched": [{"id": 1}],
+    }
+
+    response = agent.analyze({"path": str(target)})
+
+    assert response["heatmap_path"] == "heat.html"
+    assert "enriched" not in response
+    assert response["stats"] is None
+    assert list(response) == list(_RESPONSE_KEYS)
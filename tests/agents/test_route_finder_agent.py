@@ -7,11 +7,32 @@ from unittest.mock import MagicMock
 import networkx as nx
 import pytest
 
-from src.agents.route_finder_agent import RouteFinderAgent
+from src.agents.route_finder_agent import (
+    RouteContext,
+    RouteFinderAgent,
+    route_cache_key,
+)
 from src.config.models.route_models import RouteMetrics, RouteRequest, RouteResult
 from src.config.settings import RouteSettings
 
 
+def make_context(**fields):
+    """Build a RouteContext for a Berlin request, overriding the given fields."""
+    defaults = dict(
+        city="Berlin",
+        country="DE",
+        start_lat=52.52,
+        start_lon=13.40,
+        end_lat=52.53,
+        end_lon=13.41,
+        cameras_geojson_path=Path("cameras.geojson"),
+        route_geojson_path=Path("route.geojson"),
+        route_map_path=Path("route.html"),
+        cache_key="0" * 16,
+    )
+    return RouteContext(**{**defaults, **fields})
+
+
 @pytest.fixture
 def route_settings():
     """Create default RouteSettings."""
@@ -33,10 +54,13 @@ def mock_tools():
         "snap_start": MagicMock(return_value=0),
         "snap_end": MagicMock(return_value=1),
         "generate_paths": MagicMock(return_value=[[0, 1]]),
-        "compute_exposure": MagicMock(
-            return_value=RouteMetrics(
-                length_m=100.0, exposure_score=5.0, camera_count_near_route=2
-            )
+        "compute_exposure_batch": MagicMock(
+            side_effect=lambda G, paths, *args: [
+                RouteMetrics(
+                    length_m=100.0, exposure_score=5.0, camera_count_near_route=2
+                )
+                for _ in paths
+            ]
         ),
         "build_geojson": MagicMock(return_value=Path("/tmp/route.geojson")),
         "render_map": MagicMock(return_value=Path("/tmp/map.html")),
@@ -92,15 +116,15 @@ def test_perceive_no_cache(mem_fake, route_settings, route_request):
 
     observation = agent.perceive(route_request)
 
-    assert observation["city"] == "Berlin"
-    assert observation["country"] == "DE"
-    assert observation["start_lat"] == 52.52
-    assert observation["start_lon"] == 13.40
-    assert observation["end_lat"] == 52.53
-    assert observation["end_lon"] == 13.41
-    assert "cache_key" in observation
-    assert observation["cache_hit"] is False
-    assert observation["cached_result"] is None
+    assert observation.city == "Berlin"
+    assert observation.country == "DE"
+    assert observation.start_lat == 52.52
+    assert observation.start_lon == 13.40
+    assert observation.end_lat == 52.53
+    assert observation.end_lon == 13.41
+    assert len(observation.cache_key) == 16
+    assert observation.cache_hit is False
+    assert observation.cached_result is None
 
 
 def test_plan_cache_miss(mem_fake, route_settings):
@@ -109,7 +133,7 @@ def test_plan_cache_miss(mem_fake, route_settings):
         name="test_agent", memory=mem_fake, settings=route_settings
     )
 
-    observation = {"cache_hit": False}
+    observation = make_context(cache_hit=False)
     plan = agent.plan(observation)
 
     expected_steps = [
@@ -132,7 +156,7 @@ def test_plan_cache_hit(mem_fake, route_settings):
         name="test_agent", memory=mem_fake, settings=route_settings
     )
 
-    observation = {"cache_hit": True}
+    observation = make_context(cache_hit=True)
     plan = agent.plan(observation)
 
     assert plan == []  # No steps when using cache
@@ -161,12 +185,60 @@ def test_act_load_cameras(mem_fake, route_settings, mock_tools, tmp_path):
     cameras_path = tmp_path / "cameras.geojson"
     cameras_path.write_text(json.dumps(cameras_geojson), encoding="utf-8")
 
-    context = {"cameras_geojson_path": cameras_path}
+    context = make_context(cameras_geojson_path=cameras_path)
 
     agent.act("load_cameras", context)
 
     mock_tools["load_cameras"].assert_called_once_with(cameras_path)
-    assert "cameras" in context
+    assert context.cameras is not None
+
+
+def test_act_load_cameras_reuses_index_until_file_changes(
+    mem_fake, route_settings, mock_tools, tmp_path
+):
+    """Cameras and their index are reused while the file's mtime is unchanged."""
+    import os
+
+    agent = RouteFinderAgent(
+        name="test_agent",
+        memory=mem_fake,
+        settings=route_settings,
+        tools=mock_tools,
+    )
+    cameras_path = tmp_path / "cameras.geojson"
+    cameras_path.write_text("{}", encoding="utf-8")
+
+    first = make_context(cameras_geojson_path=cameras_path)
+    agent.act("load_cameras", first)
+    second = make_context(cameras_geojson_path=cameras_path)
+    agent.act("load_cameras", second)
+
+    mock_tools["load_cameras"].assert_called_once_with(cameras_path)
+    assert second.camera_index is first.camera_index
+    assert len(second.camera_index) == 2
+
+    mtime = cameras_path.stat().st_mtime
+    os.utime(cameras_path, (mtime + 10, mtime + 10))
+    agent.act("load_cameras", make_context(cameras_geojson_path=cameras_path))
+
+    assert mock_tools["load_cameras"].call_count == 2
+
+
+def test_act_build_graph_reuses_graph_per_city(mem_fake, route_settings, mock_tools):
+    """The graph is built once per (city, country, network type)."""
+    agent = RouteFinderAgent(
+        name="test_agent",
+        memory=mem_fake,
+        settings=route_settings,
+        tools=mock_tools,
+    )
+
+    first = agent.act("build_graph", make_context(city="Berlin"))
+    second = agent.act("build_graph", make_context(city="Berlin"))
+    agent.act("build_graph", make_context(city="Hamburg"))
+
+    assert second is first
+    assert mock_tools["build_graph"].call_count == 2
 
 
 def test_act_score_paths(mem_fake, route_settings, mock_tools):
@@ -180,25 +252,58 @@ def test_act_score_paths(mem_fake, route_settings, mock_tools):
 
     # Setup context with candidate paths
     G = mock_tools["build_graph"].return_value
-    context = {
-        "graph": G,
-        "cameras": [(52.52, 13.40)],
-        "candidate_paths": [[0, 1], [0, 1]],  # Two paths
-    }
+    context = make_context(
+        graph=G,
+        cameras=[(52.52, 13.40)],
+        candidate_paths=[[0, 1], [0, 1]],  # Two paths
+    )
 
     agent.act("score_paths", context)
 
-    # Should have called compute_exposure for each path
-    assert mock_tools["compute_exposure"].call_count == 2
+    # Should have scored both paths in a single call
+    mock_tools["compute_exposure_batch"].assert_called_once()
+    assert mock_tools["compute_exposure_batch"].call_args[0][1] == [[0, 1], [0, 1]]
 
     # Should have selected best path and metrics
-    assert "best_path" in context
-    assert "best_metrics" in context
-    assert "baseline_metrics" in context
+    assert context.best_path is not None
+    assert context.best_metrics is not None
+    assert context.baseline_metrics is not None
 
     # Best metrics should have baseline comparison
-    assert context["best_metrics"].baseline_length_m is not None
-    assert context["best_metrics"].baseline_exposure_score is not None
+    assert context.best_metrics.baseline_length_m is not None
+    assert context.best_metrics.baseline_exposure_score is not None
+
+
+def test_act_score_paths_keeps_candidate_order(mem_fake, route_settings, mock_tools):
+    """Test that scored paths keep their baseline and best pick."""
+    scores = {(0, 1): 9.0, (0, 2, 1): 3.0, (0, 3, 1): 6.0}
+    mock_tools["compute_exposure_batch"] = MagicMock(
+        side_effect=lambda G, paths, *args: [
+            RouteMetrics(
+                length_m=100.0 * len(path),
+                exposure_score=scores[tuple(path)],
+                camera_count_near_route=1,
+            )
+            for path in paths
+        ]
+    )
+    agent = RouteFinderAgent(
+        name="test_agent",
+        memory=mem_fake,
+        settings=route_settings,
+        tools=mock_tools,
+    )
+    context = make_context(
+        graph=mock_tools["build_graph"].return_value,
+        cameras=[(52.52, 13.40)],
+        candidate_paths=[[0, 1], [0, 2, 1], [0, 3, 1]],
+    )
+
+    agent.act("score_paths", context)
+
+    assert context.baseline_metrics.exposure_score == 9.0
+    assert context.best_path == [0, 2, 1]
+    assert context.best_metrics.baseline_length_m == 200.0
 
 
 def test_act_unknown_action(mem_fake, route_settings):
@@ -208,7 +313,7 @@ def test_act_unknown_action(mem_fake, route_settings):
     )
 
     with pytest.raises(ValueError, match="Unknown action"):
-        agent.act("unknown_action", {})
+        agent.act("unknown_action", make_context())
 
 
 def test_achieve_goal_full_workflow(
@@ -268,25 +373,19 @@ def test_achieve_goal_with_cache(mem_fake, route_settings, route_request, tmp_pa
     )
 
     # Create cache key (must match agent's key generation logic)
-    cache_key_input = (
-        f"{route_request.city}_{route_request.country}_"
-        f"{route_request.start_lat}_{route_request.start_lon}_"
-        f"{route_request.end_lat}_{route_request.end_lon}_"
-        f"{route_settings.max_candidates}_{route_settings.buffer_radius_m}"
-    )
-    import hashlib
-
-    cache_key = hashlib.sha256(cache_key_input.encode()).hexdigest()[:16]
-
-    cache_content = (
-        f"{cache_key}|"
-        f"{route_geojson_path}|"
-        f"{route_map_path}|"
-        f"{cached_metrics.model_dump_json()}"
+    cache_key = route_cache_key(route_request, route_settings)
+
+    mem_fake.put_cache(
+        "test_agent",
+        "route_cache",
+        cache_key,
+        {
+            "route_geojson_path": str(route_geojson_path),
+            "route_map_path": str(route_map_path),
+            "metrics": cached_metrics.model_dump(mode="json"),
+        },
     )
 
-    mem_fake.store("test_agent", "route_cache", cache_content)
-
     # Create agent and run
     agent = RouteFinderAgent(
         name="test_agent", memory=mem_fake, settings=route_settings
@@ -327,20 +426,118 @@ def test_achieve_goal_stores_in_cache(
     result1 = agent.achieve_goal(route_request)
     assert result1.from_cache is False
 
-    # Check that result was stored in memory
-    memories = list(mem_fake.load("test_agent"))
-    cache_memories = [m for m in memories if m.step == "route_cache"]
-
-    assert len(cache_memories) > 0
-
-    # Verify cache content format
-    cache_content = cache_memories[0].content
-    parts = cache_content.split("|", 3)
-    assert len(parts) == 4
-    # Verify cache structure: cache_key|geojson_path|map_path|metrics_json
-    assert len(parts[0]) == 16  # Cache key is 16-char hash
-    assert parts[1].endswith(".geojson")  # Route GeoJSON path
-    assert parts[2].endswith(".html")  # Route map path
-    # Verify metrics JSON can be parsed
-    metrics_json = json.loads(parts[3])
-    assert "length_m" in metrics_json
+    # Check that result was stored under the route's cache key
+    entry = mem_fake.get_cache("test_agent", "route_cache", result1.route_id)
+
+    assert len(result1.route_id) == 16  # Cache key is 16-char hash
+    assert entry["route_geojson_path"].endswith(".geojson")
+    assert entry["route_map_path"].endswith(".html")
+    assert entry["metrics"]["length_m"] == result1.metrics.length_m
+
+
+def test_route_cache_key_depends_on_settings(route_request):
+    """Test that the cache key is stable and changes with relevant settings."""
+    key = route_cache_key(route_request, RouteSettings())
+
+    assert len(key) == 16
+    assert key == route_cache_key(route_request, RouteSettings())
+    assert key != route_cache_key(route_request, RouteSettings(max_candidates=7))
+    assert key != route_cache_key(route_request, RouteSettings(buffer_radius_m=75.0))
+    moved = route_request.model_copy(update={"end_lat": route_request.end_lat + 1e-9})
+    assert key != route_cache_key(moved, RouteSettings())
+
+
+def test_route_cache_hit_uses_keyed_lookup(
+    mem_fake, route_settings, mock_tools, route_request, tmp_path, monkeypatch
+):
+    """Test that cache lookups go through the keyed cache, not a memory scan."""
+    monkeypatch.chdir(tmp_path)
+    agent = RouteFinderAgent(
+        name="test_agent",
+        memory=mem_fake,
+        settings=route_settings,
+        tools=mock_tools,
+    )
+    assert agent.achieve_goal(route_request).from_cache is False
+
+    # Materialize the outputs the (mocked) tools would have written
+    observation = agent.perceive(route_request)
+    observation.route_geojson_path.parent.mkdir(parents=True)
+    observation.route_geojson_path.write_text("{}")
+    observation.route_map_path.write_text("<html></html>")
+    mem_fake.load = MagicMock(side_effect=mem_fake.load)
+
+    assert agent.achieve_goal(route_request).from_cache is True
+    mem_fake.load.assert_not_called()
+
+
+def test_cache_miss_when_route_map_is_gone(
+    mem_fake, route_settings, route_request, tmp_path
+):
+    """Test that a cached route is ignored once one of its files is missing."""
+    route_geojson_path = tmp_path / "cached_route.geojson"
+    route_geojson_path.write_text("{}")
+    mem_fake.put_cache(
+        "test_agent",
+        "route_cache",
+        route_cache_key(route_request, route_settings),
+        {
+            "route_geojson_path": str(route_geojson_path),
+            "route_map_path": str(tmp_path / "missing_map.html"),
+            "metrics": {
+                "length_m": 1.0,
+                "exposure_score": 0.0,
+                "camera_count_near_route": 0,
+            },
+        },
+    )
+    agent = RouteFinderAgent(
+        name="test_agent", memory=mem_fake, settings=route_settings
+    )
+
+    observation = agent.perceive(route_request)
+
+    assert observation.cache_hit is False
+    assert observation.cached_result is None
+
+
+def test_cached_route_result_reused_until_files_change(
+    mem_fake, route_settings, route_request, tmp_path
+):
+    """Test that repeated cache hits are served in process while files are unchanged."""
+    import os
+
+    route_geojson_path = tmp_path / "cached_route.geojson"
+    route_map_path = tmp_path / "cached_map.html"
+    route_geojson_path.write_text("{}")
+    route_map_path.write_text("<html></html>")
+    mem_fake.put_cache(
+        "test_agent",
+        "route_cache",
+        route_cache_key(route_request, route_settings),
+        {
+            "route_geojson_path": str(route_geojson_path),
+            "route_map_path": str(route_map_path),
+            "metrics": {
+                "length_m": 1.0,
+                "exposure_score": 0.0,
+                "camera_count_near_route": 0,
+            },
+        },
+    )
+    mem_fake.get_cache = MagicMock(side_effect=mem_fake.get_cache)
+    agent = RouteFinderAgent(
+        name="test_agent", memory=mem_fake, settings=route_settings
+    )
+
+    assert agent.achieve_goal(route_request).from_cache is True
+    assert agent.achieve_goal(route_request).from_cache is True
+    assert mem_fake.get_cache.call_count == 1
+
+    mtime = route_map_path.stat().st_mtime
+    os.utime(route_map_path, (mtime + 10, mtime + 10))
+    assert agent.achieve_goal(route_request).from_cache is True
+    assert mem_fake.get_cache.call_count == 2
+
+    route_map_path.unlink()
+    assert agent.perceive(route_request).cache_hit is False
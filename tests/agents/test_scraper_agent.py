@@ -1,8 +1,13 @@
+import asyncio
 import json
+import threading
+import time
+from datetime import timedelta
 
+import orjson
 import pytest
 
-from src.utils.db import query_hash, payload_hash
+from src.utils.db import file_hash, query_hash
 from src.agents.scraper_agent import ScraperAgent
 
 
@@ -25,8 +30,9 @@ def test_first_run_saves(mem_fake, tmp_path, monkeypatch):
         return PAYLOAD_OK
 
     def save_stub(data, city, overpass_dir):
-        assert data is PAYLOAD_OK
+        assert orjson.loads(data) == PAYLOAD_OK
         assert city == "Lund"
+        saved_path.write_bytes(data)
         return saved_path
 
     agent = make_agent(mem_fake, run_stub, save_stub)
@@ -37,12 +43,12 @@ def test_first_run_saves(mem_fake, tmp_path, monkeypatch):
     assert ctx["elements_count"] == 2
     assert ctx["save_json"] == str(saved_path)
 
-    # memory rows contain cache entry
-    cache_rows = [r for r in mem_fake.rows if r.step == "cache"]
-    assert len(cache_rows) == 1
+    # cache entry is stored under the query hash
     qh = query_hash(ctx["query"])
-    ph = payload_hash(PAYLOAD_OK)
-    assert f"{qh}|{saved_path}|{ph}" in cache_rows[0].content
+    assert mem_fake.get_cache("ScraperAgent", "cache", qh) == {
+        "path": str(saved_path),
+        "file_hash": file_hash(saved_path.read_bytes()),
+    }
 
 
 def test_second_run_hits_cache(mem_fake, tmp_path, monkeypatch):
@@ -52,11 +58,12 @@ def test_second_run_hits_cache(mem_fake, tmp_path, monkeypatch):
     # the exact query string we'll pretend the agent will use
     q = "FAKE QUERY TEXT"
 
-    # pre‑seed cache row
-    mem_fake.store(
+    # pre‑seed cache entry
+    mem_fake.put_cache(
         "ScraperAgent",
         "cache",
-        f"{query_hash(q)}|{cached_path}|{payload_hash(PAYLOAD_OK)}",
+        query_hash(q),
+        {"path": str(cached_path), "file_hash": file_hash(cached_path.read_bytes())},
     )
 
     # stub tools that must NOT be called
@@ -92,5 +99,255 @@ def test_empty_result_skips_save(mem_fake, monkeypatch):
     assert ctx["elements_count"] == 0
     assert ctx["save_json"] == "NO_DATA"
 
-    empty_rows = [r for r in mem_fake.rows if r.step == "empty"]
-    assert empty_rows, "empty marker row should be stored"
+    empty_markers = [key for key in mem_fake.cache if key[1] == "empty"]
+    assert len(empty_markers) == 1, "empty marker should be stored once"
+    assert not [r for r in mem_fake.rows if r.step == "empty"]
+
+
+def test_known_empty_query_is_not_fetched_again(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+    calls = []
+
+    def run_stub(query):
+        calls.append(query)
+        return PAYLOAD_EMPTY
+
+    def save_stub(*_):
+        pytest.fail("save_json must not be called for empty result")
+
+    agent = make_agent(mem_fake, run_stub, save_stub)
+    inputs = {"city": "Nowhere", "overpass_dir": str(tmp_path)}
+    agent.achieve_goal(inputs)
+    ctx = agent.achieve_goal(inputs)
+
+    assert calls == ["query for Nowhere"]
+    assert ctx["cache_hit"] is True
+    assert ctx["empty"] is True
+    assert ctx["save_json"] == "NO_DATA"
+
+
+def test_empty_marker_expires(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+    monkeypatch.setattr("src.agents.scraper_agent.EMPTY_RESULT_TTL", timedelta(0))
+    calls = []
+
+    def run_stub(query):
+        calls.append(query)
+        return PAYLOAD_EMPTY
+
+    agent = make_agent(mem_fake, run_stub, lambda *_: None)
+    inputs = {"city": "Nowhere", "overpass_dir": str(tmp_path)}
+    agent.achieve_goal(inputs)
+    ctx = agent.achieve_goal(inputs)
+
+    assert calls == ["query for Nowhere"] * 2
+    assert ctx["cache_hit"] is False
+
+
+def test_cache_misses_when_dump_bytes_change(mem_fake, tmp_path, monkeypatch):
+    cached_path = tmp_path / "lund.json"
+    cached_path.write_text(json.dumps(PAYLOAD_OK))
+    q = "FAKE QUERY TEXT"
+    mem_fake.put_cache(
+        "ScraperAgent",
+        "cache",
+        query_hash(q),
+        {"path": str(cached_path), "file_hash": file_hash(cached_path.read_bytes())},
+    )
+    cached_path.write_text(json.dumps(PAYLOAD_EMPTY))
+    monkeypatch.setattr("src.agents.scraper_agent.build_query", lambda *a, **k: q)
+
+    agent = make_agent(mem_fake, lambda _: PAYLOAD_OK, lambda *_: cached_path)
+    ctx = agent.achieve_goal({"city": "Lund"})
+
+    assert ctx["cache_hit"] is False
+    assert ctx["run_query"] == PAYLOAD_OK
+
+
+def test_achieve_goal_many_limits_concurrent_fetches(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def run_stub(query):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return {"elements": [{"id": query}]}
+
+    def save_stub(data, city, out_path):
+        out_path.write_bytes(data)
+        return out_path
+
+    # one city is already cached and must not take a fetch slot
+    cached = tmp_path / "cached.json"
+    cached.write_text(json.dumps(PAYLOAD_OK))
+    mem_fake.put_cache(
+        "ScraperAgent",
+        "cache",
+        query_hash("query for Lund"),
+        {"path": str(cached), "file_hash": file_hash(cached.read_bytes())},
+    )
+
+    batches = []
+    store_many = mem_fake.store_many
+
+    def counting_store_many(records):
+        batches.append(len(records))
+        return store_many(records)
+
+    monkeypatch.setattr(mem_fake, "store_many", counting_store_many)
+
+    agent = make_agent(mem_fake, run_stub, save_stub)
+    cities = ["Malmö", "Lund", "Umeå", "Kiruna", "Visby"]
+    inputs = [{"city": c, "overpass_dir": str(tmp_path)} for c in cities]
+    results = asyncio.run(agent.achieve_goal_many(inputs, max_concurrency=2))
+
+    assert [r["city"] for r in results] == cities
+    assert peak == 2
+    assert [r["cache_hit"] for r in results] == [False, True, False, False, False]
+    assert results[1]["save_json"] == str(cached)
+    assert results[0]["run_query"] == {"elements": [{"id": "query for Malmö"}]}
+    # two step memories per city, written in one batch
+    assert batches == [2 * len(cities)]
+
+
+def test_streamed_response_is_renamed_into_place(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+    body = json.dumps(PAYLOAD_OK).encode()
+
+    def stream_stub(query, dest):
+        dest.write_bytes(body)
+        return dest, file_hash(body)
+
+    def run_stub(_):
+        pytest.fail("run_query must not be called when streaming")
+
+    def save_stub(*_):
+        pytest.fail("save_json tool must not re-serialize a streamed response")
+
+    tools = {"run_query": run_stub, "save_json": save_stub, "stream_query": stream_stub}
+    agent = ScraperAgent(name="ScraperAgent", memory=mem_fake, tools=tools)
+    ctx = agent.achieve_goal({"city": "Lund", "overpass_dir": str(tmp_path)})
+
+    saved = tmp_path / "lund" / "lund.json"
+    assert ctx["run_query"] == PAYLOAD_OK
+    assert ctx["save_json"] == str(saved)
+    assert saved.read_bytes() == body
+    assert list(saved.parent.glob("*.part")) == []
+    assert mem_fake.get_cache(
+        "ScraperAgent", "cache", query_hash("query for Lund")
+    ) == {
+        "path": str(saved),
+        "file_hash": file_hash(body),
+    }
+
+
+def test_achieve_goal_many_reports_failed_runs(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+
+    def run_stub(query):
+        if query.endswith("Lund"):
+            raise RuntimeError("Overpass timeout")
+        return {"elements": [{"id": query}]}
+
+    def save_stub(data, city, out_path):
+        out_path.write_bytes(data)
+        return out_path
+
+    agent = make_agent(mem_fake, run_stub, save_stub)
+    cities = ["Malmö", "Lund", "Umeå"]
+    inputs = [{"city": c, "overpass_dir": str(tmp_path)} for c in cities]
+    results = asyncio.run(agent.achieve_goal_many(inputs))
+
+    assert [r["city"] for r in results] == cities
+    assert results[1] == {
+        "city": "Lund",
+        "country": None,
+        "success": False,
+        "error": "Overpass timeout",
+    }
+    assert results[0]["save_json"] and results[2]["save_json"]
+
+
+def test_invalid_streamed_response_is_discarded(mem_fake, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.scraper_agent.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+
+    def stream_stub(query, dest):
+        dest.write_bytes(b"<html>rate limited</html>")
+        return dest, file_hash(b"")
+
+    tools = {"run_query": None, "save_json": None, "stream_query": stream_stub}
+    agent = ScraperAgent(name="ScraperAgent", memory=mem_fake, tools=tools)
+
+    with pytest.raises(RuntimeError, match="invalid JSON"):
+        agent.achieve_goal({"city": "Lund", "overpass_dir": str(tmp_path)})
+    assert list((tmp_path / "lund").iterdir()) == []
+
+
+def test_achieve_goal_many_geocodes_one_city_at_a_time(mem_fake, tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    import src.utils.overpass as ovp
+
+    interval = 0.05
+    ovp._cached_area_id.cache_clear()
+    monkeypatch.setattr(ovp, "_NOMINATIM_MIN_INTERVAL", interval)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    lookups = []
+
+    def fake_get(url, params, **_):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        lookups.append((params["q"], time.monotonic()))
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        results = [{"osm_type": "relation", "osm_id": len(lookups)}]
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: results)
+
+    monkeypatch.setattr(ovp, "http_session", lambda: SimpleNamespace(get=fake_get))
+
+    def save_stub(data, city, out_path):
+        out_path.write_bytes(data)
+        return out_path
+
+    agent = make_agent(mem_fake, lambda query: PAYLOAD_OK, save_stub)
+    cities = ["Malmö", "Lund", "Malmö", "Umeå"]
+    inputs = [{"city": c, "overpass_dir": str(tmp_path)} for c in cities]
+    results = asyncio.run(agent.achieve_goal_many(inputs, max_concurrency=4))
+    ovp._cached_area_id.cache_clear()
+
+    assert all("error" not in r for r in results)
+    assert peak == 1
+    # a duplicate city is served from the area ID cache
+    assert sorted(q for q, _ in lookups) == ["Lund", "Malmö", "Umeå"]
+    starts = [t for _, t in lookups]
+    assert all(b - a >= interval for a, b in zip(starts, starts[1:]))
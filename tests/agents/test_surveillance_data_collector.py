@@ -0,0 +1,294 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from src.utils.db import file_hash, query_hash
+from src.agents.surveillance_data_collector import (
+    SurveillanceDataCollector,
+    scrape_many,
+)
+
+
+def make_collector(mem_fake, tmp_path, monkeypatch):
+    # The ReAct graph needs a real LLM; the executor is replaced below anyway
+    monkeypatch.setattr(
+        "src.agents.surveillance_data_collector.create_react_agent", Mock()
+    )
+    monkeypatch.setattr("src.agents.surveillance_data_collector.AgentExecutor", Mock())
+    monkeypatch.setattr(
+        "src.agents.surveillance_data_collector.build_query",
+        lambda city, country=None: f"query for {city}",
+    )
+    collector = SurveillanceDataCollector("ScraperAgent", mem_fake)
+    saved = tmp_path / "lund.json"
+    saved.write_text("{}")
+    observation = json.dumps(
+        {"filepath": str(saved), "elements_count": 2, "empty": False}
+    )
+    collector.executor = Mock()
+    collector.executor.invoke.return_value = {
+        "output": "done",
+        "intermediate_steps": [
+            (SimpleNamespace(tool="save_overpass_data"), observation)
+        ],
+    }
+    return collector, saved
+
+
+def test_agent_input_names_city_country_and_directory(mem_fake, tmp_path, monkeypatch):
+    collector, _ = make_collector(mem_fake, tmp_path, monkeypatch)
+
+    collector.scrape(
+        {"city": "Lund", "country": "Sweden", "overpass_dir": str(tmp_path)}
+    )
+
+    agent_input = collector.executor.invoke.call_args.args[0]["input"]
+    assert agent_input == (
+        "Collect surveillance camera data for Lund in Sweden. "
+        f"Save to directory: {tmp_path / 'lund'}"
+    )
+
+
+def test_repeated_scrape_is_served_from_cache(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+
+    first = collector.scrape({"city": "Lund", "overpass_dir": str(tmp_path)})
+    second = collector.scrape({"city": "  LUND ", "overpass_dir": str(tmp_path)})
+
+    assert collector.executor.invoke.call_count == 1
+    assert second == first
+    assert second["filepath"] == str(saved)
+
+
+def test_scrape_cache_misses_when_data_file_is_gone(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+
+    collector.scrape({"city": "Lund", "overpass_dir": str(tmp_path)})
+    saved.unlink()
+    collector.scrape({"city": "Lund", "overpass_dir": str(tmp_path)})
+
+    assert collector.executor.invoke.call_count == 2
+
+
+def test_scrape_served_from_stored_dump_without_agent(mem_fake, tmp_path, monkeypatch):
+    collector, _ = make_collector(mem_fake, tmp_path, monkeypatch)
+    dump = tmp_path / "stored.json"
+    dump.write_text(json.dumps({"elements": [{"id": 1}, {"id": 2}, {"id": 3}]}))
+    mem_fake.put_cache(
+        "ScraperAgent",
+        "cache",
+        query_hash("query for Lund"),
+        {"path": str(dump), "file_hash": file_hash(dump.read_bytes())},
+    )
+
+    response = collector.scrape({"city": "Lund", "overpass_dir": str(tmp_path)})
+
+    collector.executor.invoke.assert_not_called()
+    assert response["cache_hit"] is True
+    assert response["cached_path"] == str(dump)
+    assert response["elements_count"] == 3
+
+    # a dump whose bytes changed is not trusted
+    dump.write_text(json.dumps({"elements": []}))
+    response = collector.scrape({"city": "Lund", "overpass_dir": str(tmp_path / "x")})
+    collector.executor.invoke.assert_called_once()
+
+
+def test_collectors_share_pooled_executor(mem_fake, monkeypatch):
+    monkeypatch.setattr(
+        "src.agents.surveillance_data_collector.create_react_agent", Mock()
+    )
+    monkeypatch.setattr(
+        "src.agents.surveillance_data_collector.AgentExecutor",
+        Mock(side_effect=lambda **kwargs: Mock()),
+    )
+    other_memory = type(mem_fake)()
+
+    first = SurveillanceDataCollector("ScraperAgent", mem_fake)
+    second = SurveillanceDataCollector("ScraperAgent", mem_fake)
+    third = SurveillanceDataCollector("ScraperAgent", other_memory)
+
+    assert second.executor is first.executor
+    assert second.llm is first.llm
+    assert third.executor is not first.executor
+    assert third.llm is first.llm
+
+
+def test_scrape_batch_runs_cities_concurrently(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+    in_flight = max_in_flight = 0
+
+    async def ainvoke(agent_input):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return collector.executor.invoke.return_value
+
+    collector.executor.ainvoke = AsyncMock(side_effect=ainvoke)
+    inputs = [
+        {"city": city, "overpass_dir": str(tmp_path)}
+        for city in ("Lund", "Malmo", "Ystad")
+    ]
+
+    results = asyncio.run(collector.scrape_batch(inputs, max_concurrency=2))
+
+    assert [r["city"] for r in results] == ["Lund", "Malmo", "Ystad"]
+    assert all(r["filepath"] == str(saved) for r in results)
+    assert max_in_flight == 2
+
+
+def test_scrape_many_runs_batch_from_sync_code(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+    collector.executor.ainvoke = AsyncMock(
+        return_value=collector.executor.invoke.return_value
+    )
+    inputs = [
+        {"city": city, "overpass_dir": str(tmp_path)} for city in ("Lund", "Ystad")
+    ]
+
+    results = scrape_many(collector, inputs, max_concurrency=2)
+
+    assert [r["city"] for r in results] == ["Lund", "Ystad"]
+    assert collector.executor.ainvoke.await_count == 2
+    collector.executor.invoke.assert_not_called()
+
+
+def test_scrape_batch_resumes_from_checkpoint(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+    collector.executor.ainvoke = AsyncMock(
+        return_value=collector.executor.invoke.return_value
+    )
+    checkpoint = tmp_path / "batch.jsonl"
+    checkpoint.write_text(
+        json.dumps({"city": "Lund", "success": True, "filepath": "lund.json"})
+        + "\n"
+        + '{"city": "Mal'  # truncated by a crash
+    )
+    inputs = [
+        {"city": city, "overpass_dir": str(tmp_path)} for city in ("lund", "Malmo")
+    ]
+
+    results = asyncio.run(collector.scrape_batch(inputs, output_jsonl=checkpoint))
+
+    assert results[0]["filepath"] == "lund.json"
+    assert results[1]["filepath"] == str(saved)
+    assert collector.executor.ainvoke.await_count == 1
+    rows = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert [row["city"] for row in rows] == ["Lund", "Malmo"]
+
+
+def test_scrape_batch_checkpoint_keys_on_country(mem_fake, tmp_path, monkeypatch):
+    collector, saved = make_collector(mem_fake, tmp_path, monkeypatch)
+    collector.executor.ainvoke = AsyncMock(
+        return_value=collector.executor.invoke.return_value
+    )
+    checkpoint = tmp_path / "batch.jsonl"
+    checkpoint.write_text(
+        json.dumps(
+            {
+                "city": "Paris",
+                "country": "France",
+                "success": True,
+                "filepath": "paris.json",
+            }
+        )
+        + "\n"
+    )
+    inputs = [
+        {"city": "Paris", "country": country, "overpass_dir": str(tmp_path)}
+        for country in ("France", "USA")
+    ]
+
+    results = asyncio.run(collector.scrape_batch(inputs, output_jsonl=checkpoint))
+
+    assert results[0]["filepath"] == "paris.json"
+    assert results[1]["filepath"] == str(saved)
+    assert collector.executor.ainvoke.await_count == 1
+    rows = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert [row["country"] for row in rows] == ["France", "USA"]
+
+
+def test_prompt_template_is_built_once():
+    from src.agents.surveillance_data_collector import _get_prompt_template
+
+    template = _get_prompt_template()
+
+    assert _get_prompt_template() is template
+    assert set(template.input_variables) == {
+        "input",
+        "tools",
+        "tool_names",
+        "agent_scratchpad",
+    }
+
+
+def test_build_response_folds_tool_observations(tmp_path):
+    result = {
+        "output": "done",
+        "intermediate_steps": [
+            (SimpleNamespace(tool="build_overpass_query"), "QUERY"),
+            (
+                SimpleNamespace(tool="check_query_cache"),
+                json.dumps(
+                    {"cache_hit": True, "filepath": "a.json", "elements_count": 3}
+                ),
+            ),
+            (SimpleNamespace(tool="save_overpass_data"), "not json"),
+        ],
+    }
+
+    response = SurveillanceDataCollector._build_response("Lund", tmp_path, result)
+
+    assert response["cache_hit"] is True
+    assert response["cached_path"] == "a.json"
+    assert response["elements_count"] == 3
+    assert "filepath" not in response
+
+
+def test_build_response_decodes_bytes_observations(tmp_path):
+    result = {
+        "output": "done",
+        "intermediate_steps": [
+            (
+                SimpleNamespace(tool="save_overpass_data"),
+                json.dumps(
+                    {"filepath": "b.json", "elements_count": 5, "empty": False}
+                ).encode(),
+            ),
+        ],
+    }
+
+    response = SurveillanceDataCollector._build_response("Lund", tmp_path, result)
+
+    assert response["cache_hit"] is False
+    assert response["filepath"] == "b.json"
+    assert response["elements_count"] == 5
+
+
+def test_build_response_fans_out_batch_observations(tmp_path):
+    batch = {
+        "results": [
+            {"tool_name": "build_overpass_query", "result": "QUERY"},
+            {
+                "tool_name": "check_query_cache",
+                "result": {
+                    "cache_hit": True,
+                    "filepath": "c.json",
+                    "elements_count": 4,
+                },
+            },
+        ]
+    }
+    result = {
+        "output": "done",
+        "intermediate_steps": [(SimpleNamespace(tool="batch"), json.dumps(batch))],
+    }
+
+    response = SurveillanceDataCollector._build_response("Lund", tmp_path, result)
+
+    assert response["cache_hit"] is True
+    assert response["cached_path"] == "c.json"
+    assert response["elements_count"] == 4
@@ -66,3 +66,12 @@ def test_docs_endpoints_accessible():
     # ReDoc
     response = client.get("/redoc")
     assert response.status_code == 200
+
+
+def test_openapi_schema_built_at_startup(monkeypatch):
+    """Test that the OpenAPI schema is built during startup, not on first request."""
+    monkeypatch.setattr(app, "openapi_schema", None)
+
+    with TestClient(app):
+        assert app.openapi_schema is not None
+        assert "PipelineRequest" in app.openapi_schema["components"]["schemas"]
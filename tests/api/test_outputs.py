@@ -244,6 +244,11 @@ def test_mime_type_detection():
     assert get_mime_type(Path("file.jpg")) == "image/jpeg"
     assert get_mime_type(Path("file.csv")) == "text/csv"
     assert get_mime_type(Path("file.unknown")) == "application/octet-stream"
+    assert get_mime_type(Path("FILE.GeoJSON")) == "application/geo+json"
+    assert get_mime_type("lund_enriched.geojson") == "application/geo+json"
+    assert get_mime_type("archive.tar.csv") == "text/csv"
+    assert get_mime_type(".json") == "application/octet-stream"
+    assert get_mime_type("README") == "application/octet-stream"
 
 
 def test_validate_path_security(tmp_path, monkeypatch):
@@ -268,6 +273,68 @@ def test_validate_path_security(tmp_path, monkeypatch):
     assert "directory traversal" in exc_info.value.detail.lower()
 
 
+def test_validate_path_rejects_sibling_with_same_prefix(tmp_path, monkeypatch):
+    """Test that a directory sharing the base name prefix is not accepted."""
+    from src.api.routes import outputs
+    from fastapi import HTTPException
+
+    output_dir = tmp_path / "overpass_data"
+    output_dir.mkdir()
+    sibling = tmp_path / "overpass_data_private"
+    sibling.mkdir()
+    (sibling / "secret.json").write_text("{}")
+
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", output_dir)
+
+    with pytest.raises(HTTPException) as exc_info:
+        outputs.validate_path(sibling / "secret.json")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_resolve_city_base_sees_new_city_directory(tmp_path, monkeypatch):
+    """Test that a city directory created after a lookup is found right away."""
+    from src.api.routes import outputs
+
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+
+    assert outputs.resolve_city_base("lund") == tmp_path
+    (tmp_path / "lund").mkdir()
+    assert outputs.resolve_city_base("lund") == tmp_path / "lund"
+    assert outputs.resolve_city_base("lund") == tmp_path / "lund"
+
+
+def test_validate_path_returns_stat_result(tmp_path, monkeypatch):
+    """Test that validate_path hands back the stat it already made."""
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund.json"
+    file_path.write_text("{}")
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+
+    resolved, st = outputs.validate_path(file_path)
+
+    assert resolved == file_path.resolve()
+    assert st.st_size == 2
+    response = outputs.file_response(resolved, "application/json", stat_result=st)
+    assert response.headers["content-length"] == "2"
+
+
+def test_validate_path_returns_symlink_target(tmp_path, monkeypatch):
+    """Test that the checked, resolved target is what gets served."""
+    from src.api.routes import outputs
+
+    target = tmp_path / "lund_enriched.geojson"
+    target.write_text("{}")
+    link = tmp_path / "latest.geojson"
+    link.symlink_to(target)
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+
+    resolved, _ = outputs.validate_path(link)
+
+    assert resolved == target.resolve()
+
+
 def test_validate_path_directory(tmp_path, monkeypatch):
     """Test that validate_path rejects directories."""
     from src.api.routes import outputs
@@ -284,3 +351,326 @@ def test_validate_path_directory(tmp_path, monkeypatch):
 
     assert exc_info.value.status_code == 400
     assert "not a file" in exc_info.value.detail.lower()
+
+
+def test_list_city_files_serializes_through_response_model(tmp_path, monkeypatch):
+    """Test the listing is built as a CityFilesResponse, newest file first."""
+    import asyncio
+    import os
+
+    from src.api.models.responses import CityFilesResponse
+    from src.api.routes import outputs
+
+    (tmp_path / "lund_a.json").write_text("{}")
+    (tmp_path / "lund_b.geojson").write_text("{}")
+    (tmp_path / "lund_dir").mkdir()
+    (tmp_path / "malmo.json").write_text("{}")
+    os.utime(tmp_path / "lund_a.json", (1, 1))
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+
+    result = asyncio.run(outputs.list_city_files("Lund"))
+
+    assert isinstance(result, CityFilesResponse)
+    assert result.file_count == 2
+    assert [f.name for f in result.files] == ["lund_b.geojson", "lund_a.json"]
+    assert result.files[1].type == "application/json"
+
+
+def test_list_city_files_skips_symlinks(tmp_path, monkeypatch):
+    """Test that symlinks in the output directory are not listed."""
+    import asyncio
+
+    from src.api.routes import outputs
+
+    outside = tmp_path / "outside.json"
+    outside.write_text("{}")
+    base = tmp_path / "out"
+    base.mkdir()
+    (base / "lund.json").write_text("{}")
+    (base / "lund_link.json").symlink_to(outside)
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", base)
+
+    result = asyncio.run(outputs.list_city_files("lund"))
+
+    assert [f.name for f in result.files] == ["lund.json"]
+
+
+def test_file_response_delegates_to_nginx_when_xaccel_enabled(tmp_path, monkeypatch):
+    """Test that X-Accel mode returns an empty body and the internal location."""
+    from src.api.routes import outputs
+
+    (tmp_path / "lund").mkdir()
+    file_path = tmp_path / "lund" / "Lund map.html"
+    file_path.write_text("<html></html>")
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+    monkeypatch.setattr(outputs, "USE_XACCEL", True)
+
+    response = outputs.file_response(file_path, "text/html", filename=file_path.name)
+
+    assert response.body == b""
+    assert response.headers["x-accel-redirect"] == "/_internal/lund/Lund%20map.html"
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["content-disposition"] == (
+        "attachment; filename*=utf-8''Lund%20map.html"
+    )
+
+
+def test_file_response_leaves_gzip_companion_to_nginx(tmp_path, monkeypatch):
+    """Test that X-Accel mode points at the plain file even if a .gz exists."""
+    from src.api.routes import outputs
+    from src.tools.io_tools import write_gzip_companion
+
+    file_path = tmp_path / "lund_enriched.geojson"
+    file_path.write_text("{}")
+    write_gzip_companion(file_path)
+    monkeypatch.setattr(outputs, "OUTPUT_BASE_DIR", tmp_path)
+    monkeypatch.setattr(outputs, "USE_XACCEL", True)
+    monkeypatch.setattr(outputs, "XACCEL_PREFIX", "/_internal_outputs/")
+
+    response = outputs.file_response(
+        file_path, "application/geo+json", request_headers={"accept-encoding": "gzip"}
+    )
+
+    assert response.headers["x-accel-redirect"] == (
+        "/_internal_outputs/lund_enriched.geojson"
+    )
+    assert "content-encoding" not in response.headers
+
+
+def test_file_response_streams_large_files_in_bigger_chunks(tmp_path, monkeypatch):
+    """Test that files above the size threshold use the 1 MiB chunk response."""
+    from fastapi.responses import FileResponse
+
+    from src.api.routes import outputs
+
+    small = tmp_path / "small.geojson"
+    small.write_text("{}")
+    large = tmp_path / "large.geojson"
+    large.write_bytes(b" " * 2048)
+    monkeypatch.setattr(outputs, "_LARGE_FILE_BYTES", 1024)
+
+    small_response = outputs.file_response(small, "application/geo+json")
+    large_response = outputs.file_response(large, "application/geo+json")
+
+    assert isinstance(small_response, FileResponse)
+    assert small_response.chunk_size == FileResponse.chunk_size
+    assert large_response.chunk_size == 1024 * 1024
+    assert large_response.headers["content-length"] == "2048"
+
+
+def test_file_response_answers_matching_if_none_match_with_304(tmp_path):
+    """Test ETag revalidation: matching tag gives 304, stale tag the file."""
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund.geojson"
+    file_path.write_text("{}")
+
+    first = outputs.file_response(file_path, "application/geo+json")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "public, max-age=60"
+
+    cached = outputs.file_response(
+        file_path,
+        "application/geo+json",
+        request_headers={"if-none-match": f'"other", {etag}'},
+    )
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == etag
+
+    file_path.write_text('{"type": "FeatureCollection"}')
+    changed = outputs.file_response(
+        file_path, "application/geo+json", request_headers={"if-none-match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_file_response_answers_if_modified_since(tmp_path):
+    """Test Last-Modified revalidation, and that If-None-Match takes precedence."""
+    import os
+    from email.utils import formatdate
+
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund_enriched.html"
+    file_path.write_text("<html></html>")
+    os.utime(file_path, (1_700_000_000, 1_700_000_000))
+
+    first = outputs.file_response(file_path, "text/html")
+    last_modified = first.headers["last-modified"]
+    assert last_modified == formatdate(1_700_000_000, usegmt=True)
+
+    cached = outputs.file_response(
+        file_path, "text/html", request_headers={"if-modified-since": last_modified}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["last-modified"] == last_modified
+
+    older = formatdate(1_600_000_000, usegmt=True)
+    assert (
+        outputs.file_response(
+            file_path, "text/html", request_headers={"if-modified-since": older}
+        ).status_code
+        == 200
+    )
+    assert (
+        outputs.file_response(
+            file_path, "text/html", request_headers={"if-modified-since": "not a date"}
+        ).status_code
+        == 200
+    )
+    assert (
+        outputs.file_response(
+            file_path,
+            "text/html",
+            request_headers={
+                "if-none-match": '"stale"',
+                "if-modified-since": last_modified,
+            },
+        ).status_code
+        == 200
+    )
+
+
+def test_file_response_serves_gzip_companion_when_accepted(tmp_path):
+    """Test that an up-to-date .gz companion is sent to gzip clients only."""
+    import gzip
+
+    from src.api.routes import outputs
+    from src.tools.io_tools import write_gzip_companion
+
+    file_path = tmp_path / "lund_enriched.geojson"
+    file_path.write_text('{"type": "FeatureCollection", "features": []}')
+    gz_path = write_gzip_companion(file_path)
+    assert gzip.decompress(gz_path.read_bytes()) == file_path.read_bytes()
+
+    plain = outputs.file_response(file_path, "application/geo+json")
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    encoded = outputs.file_response(
+        file_path,
+        "application/geo+json",
+        filename=file_path.name,
+        request_headers={"accept-encoding": "br, gzip;q=0.8"},
+    )
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.headers["content-length"] == str(gz_path.stat().st_size)
+    assert encoded.headers["content-type"].startswith("application/geo+json")
+    assert encoded.headers["etag"] != plain.headers["etag"]
+    assert file_path.name in encoded.headers["content-disposition"]
+
+    refused = outputs.file_response(
+        file_path,
+        "application/geo+json",
+        request_headers={"accept-encoding": "gzip;q=0"},
+    )
+    assert "content-encoding" not in refused.headers
+
+
+def _run_asgi(response, headers=(), extensions=None):
+    """Run a response against a minimal ASGI scope and collect the messages."""
+    import asyncio
+
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message["file"].seek(message.get("offset", 0))
+            data = message["file"].read(message.get("count", -1))
+            message = {**message, "data": data}
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "asgi": {"spec_version": "2.4"},
+        "extensions": extensions or {},
+    }
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def test_file_response_uses_zerocopysend_when_server_supports_it(tmp_path):
+    """Test that the file is handed to the server via zerocopysend."""
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund_enriched.geojson"
+    file_path.write_bytes(b'{"type": "FeatureCollection"}')
+    response = outputs.file_response(file_path, "application/geo+json")
+
+    messages = _run_asgi(response, extensions={"http.response.zerocopysend": {}})
+
+    assert [m["type"] for m in messages] == [
+        "http.response.start",
+        "http.response.zerocopysend",
+    ]
+    assert messages[1]["data"] == file_path.read_bytes()
+    assert messages[1]["count"] == file_path.stat().st_size
+
+
+@pytest.mark.parametrize("zerocopy", [False, True])
+def test_file_response_serves_byte_ranges(tmp_path, zerocopy):
+    """Test 206 Partial Content for a range, and If-Range revalidation."""
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund_enriched.geojson"
+    file_path.write_bytes(bytes(range(256)) * 4)
+    extensions = {"http.response.zerocopysend": {}} if zerocopy else {}
+
+    response = outputs.file_response(file_path, "application/geo+json")
+    assert response.headers["accept-ranges"] == "bytes"
+    messages = _run_asgi(
+        response, headers=[("range", "bytes=100-199")], extensions=extensions
+    )
+    start = messages[0]
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    assert start["status"] == 206
+    assert headers["content-range"] == "bytes 100-199/1024"
+    assert headers["content-length"] == "100"
+    body = b"".join(m.get("data", m.get("body", b"")) for m in messages[1:])
+    assert body == file_path.read_bytes()[100:200]
+
+    # A resume against an outdated copy gets the whole file instead
+    response = outputs.file_response(file_path, "application/geo+json")
+    messages = _run_asgi(
+        response,
+        headers=[
+            ("range", "bytes=100-199"),
+            ("if-range", "Thu, 01 Jan 1970 00:00:00 GMT"),
+        ],
+        extensions=extensions,
+    )
+    assert messages[0]["status"] == 200
+
+
+def test_zerocopy_suffix_range_and_multirange_fallback(tmp_path):
+    """Test suffix ranges via zerocopysend and multi-range via FileResponse."""
+    from src.api.routes import outputs
+
+    file_path = tmp_path / "lund_enriched.geojson"
+    file_path.write_bytes(bytes(range(256)) * 4)
+    extensions = {"http.response.zerocopysend": {}}
+
+    response = outputs.file_response(file_path, "application/geo+json")
+    messages = _run_asgi(
+        response, headers=[("range", "bytes=-24")], extensions=extensions
+    )
+    headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    assert messages[0]["status"] == 206
+    assert headers["content-range"] == "bytes 1000-1023/1024"
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["data"] == file_path.read_bytes()[-24:]
+
+    response = outputs.file_response(file_path, "application/geo+json")
+    messages = _run_asgi(
+        response, headers=[("range", "bytes=0-9, 20-29")], extensions=extensions
+    )
+    assert messages[0]["status"] == 206
+    assert all(m["type"] != "http.response.zerocopysend" for m in messages)
@@ -6,6 +6,7 @@ including task creation, status retrieval, and lifecycle management.
 """
 
 import time
+from datetime import datetime
 
 from fastapi.testclient import TestClient
 
@@ -84,6 +85,25 @@ def test_get_pipeline_status():
     assert "progress" in data
     assert "created_at" in data
     assert "metadata" in data
+    # Stored as epoch seconds, sent as ISO 8601
+    assert datetime.fromisoformat(data["created_at"]).tzinfo is not None
+
+
+def test_pipeline_status_omits_null_fields():
+    """Test that unset optional fields are left out of status responses."""
+    from src.api.services.task_manager import task_manager
+
+    task_id = task_manager.create_task("pipeline", metadata={"city": "TestCity"})
+    try:
+        response = client.get(f"/api/v1/pipeline/{task_id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "pending"
+        for key in ("result", "error", "started_at", "completed_at"):
+            assert key not in data
+    finally:
+        task_manager.delete_task(task_id)
 
 
 def test_get_nonexistent_pipeline():
@@ -184,3 +204,101 @@ def test_pipeline_task_metadata():
     assert data["metadata"]["city"] == "Berlin"
     assert data["metadata"]["country"] == "DE"
     assert data["metadata"]["scenario"] == "full"
+
+
+def test_pipeline_run_batch_runs_cities_concurrently(monkeypatch):
+    """Test that POST /run_batch creates one task per city and gathers them."""
+    import asyncio
+
+    from src.api.routes import pipeline
+
+    in_flight = max_in_flight = 0
+    started = []
+
+    async def fake_execute(task_id, request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        started.append((task_id, request.city))
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    monkeypatch.setattr(pipeline, "execute_pipeline_task", fake_execute)
+
+    response = client.post(
+        "/api/v1/pipeline/run_batch",
+        json={"items": [{"city": "Lund"}, {"city": "Malmö", "scenario": "full"}]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["status"] for d in data] == ["pending", "pending"]
+    assert [city for _, city in started] == ["Lund", "Malmö"]
+    assert [task_id for task_id, _ in started] == [d["task_id"] for d in data]
+    assert max_in_flight == 2
+
+
+def test_pipeline_run_batch_rejects_empty_batch():
+    """Test that an empty batch is a validation error."""
+    response = client.post("/api/v1/pipeline/run_batch", json={"items": []})
+    assert response.status_code == 422
+
+
+def test_broadcast_only_builds_messages_for_watched_tasks(monkeypatch):
+    """Test that stage messages carry UTC timestamps and skip unwatched tasks."""
+    import asyncio
+
+    from src.api.routes import pipeline
+
+    sent = []
+
+    async def fake_broadcast(task_id, data):
+        sent.append((task_id, data))
+
+    monkeypatch.setattr(pipeline.ws_manager, "broadcast_progress", fake_broadcast)
+    monkeypatch.setattr(
+        pipeline.ws_manager,
+        "get_connection_count",
+        lambda task_id: 1 if task_id == "watched" else 0,
+    )
+
+    asyncio.run(pipeline._broadcast("unwatched", "progress", "scraping", 20, "x"))
+    asyncio.run(pipeline._broadcast("watched", "progress", "scraping", 20, "x"))
+
+    assert [task_id for task_id, _ in sent] == ["watched"]
+    data = sent[0][1]
+    assert data["stage"] == "scraping" and data["progress"] == 20
+    assert datetime.fromisoformat(data["timestamp"]).utcoffset().total_seconds() == 0
+
+
+def test_pipeline_runs_on_dedicated_thread_pool(monkeypatch):
+    """Test that pipeline.run executes on the pipeline pool, off the loop."""
+    import asyncio
+    import threading
+
+    from src.api.models.requests import PipelineRequest
+    from src.api.routes import pipeline
+    from src.api.services.task_manager import task_manager
+
+    threads = []
+
+    class FakePipeline:
+        cancellation_check = None
+
+        def run(self, city, **kwargs):
+            threads.append(threading.current_thread().name)
+            return {"status": "completed", "city": city}
+
+    monkeypatch.setattr(pipeline, "create_pipeline", lambda *a, **k: FakePipeline())
+
+    request = PipelineRequest(city="TestCity", scenario="basic")
+    task_id, _ = pipeline._create_pipeline_task(request)
+    try:
+        asyncio.run(pipeline.execute_pipeline_task(task_id, request))
+
+        assert threads and threads[0].startswith("pipeline")
+        task = task_manager.get_task(task_id)
+        assert task.status == "completed"
+        assert task.result["city"] == "TestCity"
+    finally:
+        task_manager.delete_task(task_id)
@@ -1,19 +1,28 @@
 """
 Tests for TaskManager service.
 
-These tests verify the in-memory task management functionality.
+These tests verify the task management functionality on both the in-memory
+and the database task store.
 """
 
 import pytest
+from sqlmodel import create_engine
 
-from src.api.services.task_manager import TaskManager
+from src.api.services.task_manager import (
+    DatabaseTaskStore,
+    InMemoryTaskStore,
+    TaskManager,
+)
 from src.api.models.responses import TaskStatus
 
 
-@pytest.fixture
-def task_manager():
+@pytest.fixture(params=["memory", "database"])
+def task_manager(request, tmp_path):
     """Create a fresh TaskManager instance for each test."""
-    return TaskManager()
+    if request.param == "memory":
+        return TaskManager(InMemoryTaskStore())
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    return TaskManager(DatabaseTaskStore(engine))
 
 
 def test_create_task(task_manager):
@@ -145,7 +154,7 @@ def test_task_to_dict(task_manager):
     assert task_dict["type"] == "pipeline"
     assert task_dict["status"] == "pending"
     assert task_dict["progress"] == 0
-    assert "created_at" in task_dict
+    assert isinstance(task_dict["created_at"], float)
     assert task_dict["metadata"]["city"] == "Berlin"
 
 
@@ -164,3 +173,49 @@ def test_multiple_tasks(task_manager):
     assert task_2.status == TaskStatus.COMPLETED
     assert task_1.metadata["city"] == "Berlin"
     assert task_2.metadata["city"] == "Athens"
+
+
+def test_database_store_shares_tasks_between_managers(tmp_path):
+    """Test that two managers on one database (two workers) see the same task."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    worker_a = TaskManager(DatabaseTaskStore(engine))
+    worker_b = TaskManager(DatabaseTaskStore(engine))
+
+    task_id = worker_a.create_task("pipeline", metadata={"city": "Lund"})
+    worker_a.mark_running(task_id)
+    worker_a.update_progress(task_id, 40, "Scraping")
+    worker_b.mark_cancelled(task_id)
+
+    task = worker_a.get_task(task_id)
+    assert task.status == TaskStatus.CANCELLED
+    assert task.progress == 40
+    assert task.metadata == {"city": "Lund", "last_message": "Scraping"}
+    assert worker_a.is_cancelled(task_id)
+
+    worker_b.mark_completed(task_id, {"routing": {"length_m": 1523.4}})
+    assert worker_a.get_task(task_id).result == {"routing": {"length_m": 1523.4}}
+    assert worker_b.delete_task(task_id)
+    assert worker_a.get_task(task_id) is None
+
+
+def test_database_store_keeps_progress_message_in_its_own_column(tmp_path):
+    """Test that progress updates leave the stored metadata untouched."""
+    from sqlmodel import Session
+
+    from src.memory.models import TaskRecord
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    manager = TaskManager(DatabaseTaskStore(engine))
+
+    task_id = manager.create_task("pipeline", metadata={"city": "Lund"})
+    manager.update_progress(task_id, 20, "Scraping")
+    manager.update_progress(task_id, 50, "Analyzing")
+
+    with Session(engine) as session:
+        record = session.get(TaskRecord, task_id)
+    assert record.metadata_json == '{"city":"Lund"}'
+    assert record.last_message == "Analyzing"
+    assert manager.get_task(task_id).metadata == {
+        "city": "Lund",
+        "last_message": "Analyzing",
+    }
@@ -110,6 +110,26 @@ def test_websocket_manager_disconnect(ws_manager):
     assert task_id not in ws_manager.active_connections
 
 
+def test_websocket_manager_broadcast_serializes_once(ws_manager):
+    """Test that a broadcast sends one JSON text to all and drops dead sockets."""
+    import asyncio
+    import json
+    from unittest.mock import AsyncMock, Mock
+
+    task_id = "test-task"
+    alive = [Mock(send_text=AsyncMock()) for _ in range(3)]
+    dead = Mock(send_text=AsyncMock(side_effect=RuntimeError("closed")))
+    ws_manager.active_connections[task_id] = [alive[0], dead, *alive[1:]]
+
+    data = {"type": "progress", "progress": 50, "message": "Analyzing"}
+    asyncio.run(ws_manager.broadcast_progress(task_id, data))
+
+    payloads = [ws.send_text.await_args.args[0] for ws in alive]
+    assert len(set(payloads)) == 1
+    assert json.loads(payloads[0]) == data
+    assert ws_manager.active_connections[task_id] == alive
+
+
 def test_task_progress_updates():
     """Test that task manager correctly updates progress."""
     task_manager = TaskManager()
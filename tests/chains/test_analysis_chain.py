@@ -0,0 +1,269 @@
+import asyncio
+import json
+
+from src.chains.analysis_chain import AnalysisChain
+from src.config.models.surveillance_metadata import SurveillanceMetadata
+from src.memory.enrich_cache import EnrichmentCache
+from src.utils.db import get_engine, tags_hash
+from tests.conftest import make_raw_dump
+
+
+class FakeAsyncLLM:
+    """LLM double exposing only the async analysis entry point."""
+
+    def __init__(self, delays=None, fail_ids=()):
+        self.delays = delays or {}
+        self.fail_ids = set(fail_ids)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aanalyze_surveillance_element(self, element):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(element["id"], 0))
+            if element["id"] in self.fail_ids:
+                raise RuntimeError("boom")
+            return SurveillanceMetadata.from_raw(element, {"public": True})
+        finally:
+            self.in_flight -= 1
+
+
+class CountingLLM(FakeAsyncLLM):
+    """LLM double that counts analysis requests."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def aanalyze_surveillance_element(self, element):
+        self.calls += 1
+        return await super().aanalyze_surveillance_element(element)
+
+
+def _elements(n):
+    return [
+        {"type": "node", "id": i, "lat": 55.0, "lon": 13.0, "tags": {"n": str(i)}}
+        for i in range(n)
+    ]
+
+
+def test_enrich_batch_preserves_input_order(mem_fake):
+    # Later elements finish first
+    llm = FakeAsyncLLM(delays={0: 0.03, 1: 0.02, 2: 0.01})
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent")
+
+    enriched = asyncio.run(chain._enrich_batch(_elements(3)))
+
+    assert [e["id"] for e in enriched] == [0, 1, 2]
+    assert all(e["analysis"]["public"] is True for e in enriched)
+
+
+def test_enrich_batch_bounds_concurrency(mem_fake):
+    llm = FakeAsyncLLM(delays={i: 0.01 for i in range(20)})
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent", concurrency=4)
+
+    asyncio.run(chain._enrich_batch(_elements(20)))
+
+    assert llm.max_in_flight == 4
+
+
+def test_enrich_batch_annotates_failures(mem_fake):
+    llm = FakeAsyncLLM(fail_ids={1})
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent")
+
+    enriched = asyncio.run(chain._enrich_batch(_elements(3)))
+
+    assert enriched[1]["analysis"] == {"error": "boom"}
+    assert "error" not in enriched[0]["analysis"]
+
+
+def test_invoke_writes_enriched_outputs(tmp_path, mem_fake):
+    raw_path, _ = make_raw_dump(tmp_path)
+    chain = AnalysisChain(FakeAsyncLLM(), mem_fake, "AnalyzerAgent")
+
+    result = chain.invoke({"path": str(raw_path)})
+
+    assert result["success"] is True
+    enriched = json.loads((tmp_path / "lund_enriched.json").read_text())
+    assert enriched["elements"][0]["analysis"]["public"] is True
+    assert (tmp_path / "lund_enriched.geojson").exists()
+    assert [r.step for r in mem_fake.rows] == ["enriched_cache"]
+
+
+def test_second_invoke_hits_cache(tmp_path, mem_fake):
+    raw_path, _ = make_raw_dump(tmp_path)
+    chain = AnalysisChain(FakeAsyncLLM(), mem_fake, "AnalyzerAgent")
+
+    chain.invoke({"path": str(raw_path)})
+    result = chain.invoke({"path": str(raw_path)})
+
+    assert result["cache_hit"] is True
+    assert result["enriched"][0]["analysis"]["public"] is True
+
+
+def test_batch_isolates_failing_inputs(tmp_path, mem_fake):
+    raw_path, _ = make_raw_dump(tmp_path)
+    chain = AnalysisChain(FakeAsyncLLM(), mem_fake, "AnalyzerAgent")
+    missing = {"path": str(tmp_path / "missing.json")}
+
+    results = chain.batch([{"path": str(raw_path)}, missing], max_concurrency=2)
+
+    assert results[0]["success"] is True
+    assert results[0]["enriched"][0]["analysis"]["public"] is True
+    assert results[1]["success"] is False
+    assert results[1]["path"] == missing["path"]
+
+
+def test_visualizations_skip_dependents_of_failed_step(tmp_path, monkeypatch):
+    def failing_hotspots(*_args, **_kwargs):
+        raise RuntimeError("no clusters")
+
+    monkeypatch.setattr("src.tools.mapping_tools.to_hotspots", failing_hotspots)
+    context = {
+        "path": str(tmp_path / "lund.json"),
+        "geojson_path": str(tmp_path / "lund_enriched.geojson"),
+        "enriched": [{"id": 1, "analysis": {"public": True, "zone": "town"}}],
+    }
+    options = {"generate_hotspots": True, "plot_hotspots": True}
+
+    result = AnalysisChain.generate_visualizations(context, options)
+
+    assert result["visualization_errors"] == ["Hotspots generation failed: no clusters"]
+    assert result["stats"]["total"] == 1
+    assert "hotspots_chart" not in result
+
+
+class FakeBatchLLM(FakeAsyncLLM):
+    """LLM double that also supports batched analysis."""
+
+    def __init__(self, broken_batches=False):
+        super().__init__()
+        self.broken_batches = broken_batches
+        self.batch_sizes = []
+
+    async def aanalyze_surveillance_batch(self, elements):
+        self.batch_sizes.append(len(elements))
+        if self.broken_batches:
+            raise ValueError("Expected a JSON array")
+        return [SurveillanceMetadata.from_raw(el, {"zone": "town"}) for el in elements]
+
+
+def test_enrich_batch_packs_elements_into_chunks(mem_fake):
+    llm = FakeBatchLLM()
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent", batch_size=4)
+
+    enriched = asyncio.run(chain._enrich_batch(_elements(10)))
+
+    assert sorted(llm.batch_sizes) == [2, 4, 4]
+    assert [e["id"] for e in enriched] == list(range(10))
+    assert all(e["analysis"]["zone"] == "town" for e in enriched)
+
+
+def test_enrich_batch_falls_back_to_single_requests(mem_fake):
+    llm = FakeBatchLLM(broken_batches=True)
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent", batch_size=4)
+
+    enriched = asyncio.run(chain._enrich_batch(_elements(5)))
+
+    assert [e["id"] for e in enriched] == list(range(5))
+    assert all(e["analysis"]["public"] is True for e in enriched)
+
+
+def test_enrich_cache_skips_llm_for_known_tags(tmp_path, mem_fake, db_settings):
+    cache = EnrichmentCache(get_engine(db_settings))
+    first = _elements(3)
+    # Same tags as element 1 plus one unseen tag set
+    second = [
+        {**first[1], "id": 10},
+        {"type": "node", "id": 11, "lat": 1.0, "lon": 2.0, "tags": {"n": "new"}},
+    ]
+    llm = CountingLLM()
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent", enrich_cache=cache)
+
+    chain._enrich_elements(first)
+    enriched = chain._enrich_elements(second)
+
+    assert llm.calls == 4
+    assert [e["id"] for e in enriched] == [10, 11]
+    assert enriched[0]["analysis"]["public"] is True
+
+
+def test_enrich_cache_does_not_store_failures(mem_fake, db_settings):
+    cache = EnrichmentCache(get_engine(db_settings))
+    chain = AnalysisChain(
+        FakeAsyncLLM(fail_ids={0}), mem_fake, "AnalyzerAgent", enrich_cache=cache
+    )
+
+    chain._enrich_elements(_elements(1))
+
+    assert cache.get_many([tags_hash({"n": "0"})]) == {}
+
+
+def test_load_data_hash_tracks_element_content(tmp_path):
+    raw_path, raw = make_raw_dump(tmp_path)
+    first = AnalysisChain._load_data({"path": str(raw_path)})
+
+    raw["elements"][0]["tags"]["operator"] = "Police"
+    raw_path.write_text(json.dumps(raw), encoding="utf-8")
+    second = AnalysisChain._load_data({"path": str(raw_path)})
+
+    assert first["element_count"] == 1
+    assert first["elements"] == [
+        {**raw["elements"][0], "tags": {"man_made": "surveillance"}}
+    ]
+    assert first["raw_hash"] != second["raw_hash"]
+    # Formatting of the dump does not affect the hash
+    raw_path.write_text(json.dumps(raw, indent=4), encoding="utf-8")
+    assert (
+        AnalysisChain._load_data({"path": str(raw_path)})["raw_hash"]
+        == (second["raw_hash"])
+    )
+
+
+def test_identical_tags_are_enriched_once(mem_fake):
+    elements = [
+        {"type": "node", "id": i, "lat": 55.0, "lon": 13.0, "tags": dict(tags)}
+        for i, tags in enumerate(
+            [{"a": "1"}, {"b": "2"}, {"a": "1"}, {"a": "1"}, {"b": "2"}]
+        )
+    ]
+    llm = CountingLLM()
+    chain = AnalysisChain(llm, mem_fake, "AnalyzerAgent")
+
+    enriched = chain._enrich_elements(elements)
+
+    assert llm.calls == 2
+    assert [e["id"] for e in enriched] == [0, 1, 2, 3, 4]
+    assert all(e["analysis"]["public"] is True for e in enriched)
+    # Duplicates get their own analysis dicts
+    assert enriched[0]["analysis"] is not enriched[2]["analysis"]
+
+
+def test_enrich_elements_streams_to_destination(tmp_path, mem_fake):
+    elements = _elements(40)
+    destination = tmp_path / "city_enriched.json"
+    chain = AnalysisChain(
+        FakeAsyncLLM(delays={0: 0.02, 7: 0.01}),
+        mem_fake,
+        "AnalyzerAgent",
+        concurrency=4,
+    )
+
+    enriched = chain._enrich_elements(elements, destination=destination)
+
+    assert json.loads(destination.read_text()) == {"elements": enriched}
+    assert [el["id"] for el in enriched] == list(range(40))
+
+
+def test_check_cache_ignores_rows_for_deleted_outputs(tmp_path, mem_fake):
+    raw_path, _ = make_raw_dump(tmp_path)
+    chain = AnalysisChain(FakeAsyncLLM(), mem_fake, "AnalyzerAgent")
+    chain.invoke({"path": str(raw_path)})
+    (tmp_path / "lund_enriched.geojson").unlink()
+
+    context = chain._check_cache(chain._load_data({"path": str(raw_path)}))
+
+    assert context["enriched_exists"] is True
+    assert context["geojson_exists"] is False
+    assert context["cache_hit"] is False
@@ -1,5 +1,6 @@
 import json
 from collections import Counter
+from datetime import datetime, timezone
 from types import SimpleNamespace
 
 import pytest
@@ -34,6 +35,12 @@ def patch_client(monkeypatch):
     )
 
 
+@pytest.fixture(autouse=True)
+def reset_nominatim_throttle(monkeypatch):
+    # Tests must not wait out the Nominatim interval left by an earlier test
+    monkeypatch.setattr("src.utils.overpass._nominatim_next_at", 0.0)
+
+
 class StubClient:
     def __init__(self, settings):
         pass
@@ -92,6 +99,17 @@ class _DummyResp(SimpleNamespace):
 
     text = property(lambda self: self._text)
 
+    def iter_content(self, chunk_size=1):
+        raw = self._text.encode("utf-8")
+        for i in range(0, len(raw), chunk_size):
+            yield raw[i : i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
 
 @pytest.fixture
 def patch_requests(monkeypatch):
@@ -111,21 +129,50 @@ def patch_requests(monkeypatch):
 
     monkeypatch.setattr(requests, "get", fake_get)
     monkeypatch.setattr(requests, "post", fake_post)
+    # Overpass/Nominatim calls go through the shared session
+    monkeypatch.setattr(requests.Session, "get", lambda self, *a, **k: fake_get())
+    monkeypatch.setattr(requests.Session, "post", lambda self, *a, **k: fake_post())
     return store
 
 
 class MemoryStoreFake:
     def __init__(self):
         self.rows = []
+        self.cache = {}
 
     def store(self, agent_id: str, step: str, content: str):
         row = SimpleNamespace(agent_id=agent_id, step=step, content=content)
         self.rows.append(row)
         return row
 
+    def store_many(self, records):
+        return [self.store(*record) for record in records]
+
     def load(self, agent_id: str):
         return [r for r in self.rows if r.agent_id == agent_id]
 
+    def find_cache(self, agent_id: str, step: str, content_prefix: str):
+        for r in reversed(self.rows):
+            if (
+                r.agent_id == agent_id
+                and r.step == step
+                and r.content.startswith(content_prefix)
+            ):
+                return r.content
+        return None
+
+    def get_cache(self, agent_id: str, step: str, key: str, max_age=None):
+        entry = self.cache.get((agent_id, step, key))
+        if entry is None:
+            return None
+        value, written = entry
+        if max_age is not None and datetime.now(timezone.utc) - written > max_age:
+            return None
+        return value
+
+    def put_cache(self, agent_id: str, step: str, key: str, value):
+        self.cache[(agent_id, step, key)] = (value, datetime.now(timezone.utc))
+
 
 @pytest.fixture
 def mem_fake():
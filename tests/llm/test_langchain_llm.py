@@ -1,5 +1,10 @@
+import asyncio
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.outputs import Generation
 
 from src.llm.surveillance_llm import SurveillanceLLM
 from src.config.settings import LangChainSettings
@@ -103,6 +108,39 @@ class TestSurveillanceLLM:
         assert temp_call_args[1]["temperature"] == 0.9
         assert temp_call_args[1]["custom_param"] == "test"
 
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_override_client_is_reused(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that repeated calls with the same kwargs share one client."""
+        mock_ollama_class.return_value.invoke.return_value = "response"
+
+        llm = SurveillanceLLM(mock_settings)
+        llm.generate_response("Prompt 1", temperature=0.9)
+        llm.generate_response("Prompt 2", temperature=0.9)
+        assert mock_ollama_class.call_count == 2
+
+        llm.generate_response("Prompt 3", temperature=0.1)
+        assert mock_ollama_class.call_count == 3
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_override_client_is_shared_between_threads(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that concurrent callers with the same kwargs get one client."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        mock_ollama_class.side_effect = lambda **_: Mock()
+        llm = SurveillanceLLM(mock_settings)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(
+                pool.map(lambda _: llm._llm_with({"temperature": 0.9}), range(32))
+            )
+
+        assert len({id(client) for client in clients}) == 1
+        assert len(llm._override_llms) == 1
+
     @patch("src.llm.surveillance_llm.OllamaLLM")
     def test_generate_response_empty_response(
         self, mock_ollama_class: Mock, mock_settings: LangChainSettings
@@ -268,3 +306,163 @@ class TestSurveillanceLLM:
             or call[0][0].startswith("Successfully generated")
         ]
         assert len(debug_calls) >= 2  # At least initialization and response logging
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_aanalyze_surveillance_element(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that the async analysis path awaits the chain and builds metadata."""
+        mock_ollama_class.return_value = Mock()
+        llm = SurveillanceLLM(mock_settings)
+        llm._ensure_chain_initialized()
+
+        llm.raw_chain = Mock()
+        llm.raw_chain.ainvoke = AsyncMock(
+            return_value='{"public": true, "zone": "town"}'
+        )
+
+        element = {"id": 7, "lat": 55.0, "lon": 13.0, "tags": {"man_made": "x"}}
+        metadata = asyncio.run(llm.aanalyze_surveillance_element(element))
+
+        assert metadata.public is True
+        assert metadata.zone == "town"
+        llm.raw_chain.ainvoke.assert_awaited_once()
+        assert '"man_made"' in llm.raw_chain.ainvoke.await_args[0][0]["tags"]
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_aanalyze_surveillance_batch(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that one request covers the whole batch and keeps input order."""
+        mock_client = Mock()
+        mock_client.ainvoke = AsyncMock(
+            return_value='{"results": [{"zone": "town", "public": true}, {"zone": "shop"}]}'
+        )
+        mock_ollama_class.return_value = mock_client
+        llm = SurveillanceLLM(mock_settings)
+
+        elements = [{"id": 1, "tags": {"a": "1"}}, {"id": 2, "tags": {"b": "2"}}]
+        results = asyncio.run(llm.aanalyze_surveillance_batch(elements))
+
+        assert [r.zone for r in results] == ["town", "shop"]
+        assert results[0].public is True
+        mock_client.ainvoke.assert_awaited_once()
+        prompt = mock_client.ainvoke.await_args[0][0]
+        assert "exactly 2 objects" in prompt
+        assert '"a": "1"' in prompt and '"b": "2"' in prompt
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_aanalyze_surveillance_batch_length_mismatch(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that a response with the wrong number of objects is rejected."""
+        mock_client = Mock()
+        mock_client.ainvoke = AsyncMock(return_value='[{"zone": "town"}]')
+        mock_ollama_class.return_value = mock_client
+        llm = SurveillanceLLM(mock_settings)
+
+        elements = [{"id": 1, "tags": {}}, {"id": 2, "tags": {}}]
+        with pytest.raises(ValueError, match="Expected 2 result objects"):
+            asyncio.run(llm.aanalyze_surveillance_batch(elements))
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_format_instructions_rendered_once(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that the schema text is baked into the templates at init."""
+        mock_ollama_class.return_value = Mock()
+        llm = SurveillanceLLM(mock_settings)
+
+        chain_input = llm._chain_input({"tags": {"operator": "Polisen"}})
+
+        assert chain_input == {"tags": '{\n  "operator": "Polisen"\n}'}
+        prompt = llm.prompt_template.format(**chain_input)
+        assert '"sensitive_reason"' in prompt
+        assert "{format_instructions}" not in llm.batch_template
+        assert '"sensitive_reason"' in llm.batch_template.format_map(
+            {"count": 1, "tags_list": "[]"}
+        )
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_parse_analysis_rejects_unparsable_output(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that unparsable output raises so the caller's retry kicks in."""
+        mock_ollama_class.return_value = Mock()
+        llm = SurveillanceLLM(mock_settings)
+
+        with pytest.raises(OutputParserException):
+            llm.parse_analysis({"id": 1}, "not json at all")
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_analysis_uses_json_mode(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that analysis decodes in JSON mode without touching the base LLM."""
+        base_client, json_client = Mock(), Mock()
+        json_client.invoke.return_value = '{"zone": "town"}'
+        mock_ollama_class.side_effect = [base_client, json_client]
+
+        llm = SurveillanceLLM(mock_settings)
+        result = llm.generate_response("Describe as JSON", expect_json=True)
+
+        assert result == '{"zone": "town"}'
+        assert llm.llm is base_client
+        assert mock_ollama_class.call_args_list[1][1]["format"] == "json"
+        base_client.invoke.assert_not_called()
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_awarm_up_primes_prompt_once(
+        self, mock_ollama_class: Mock, mock_settings: LangChainSettings
+    ) -> None:
+        """Test that warm-up sends the static prompt once and tolerates failure."""
+        mock_client = Mock()
+        mock_client.ainvoke = AsyncMock(side_effect=ConnectionError("down"))
+        mock_ollama_class.return_value = mock_client
+        llm = SurveillanceLLM(mock_settings)
+
+        asyncio.run(llm.awarm_up())
+        asyncio.run(llm.awarm_up())
+
+        mock_client.ainvoke.assert_awaited_once()
+        assert mock_client.ainvoke.await_args.kwargs["options"]["num_predict"] == 1
+        assert mock_ollama_class.call_args.kwargs["keep_alive"] == "1h"
+
+    @patch("src.llm.surveillance_llm.OllamaLLM")
+    def test_llm_cache_attached_to_json_client(self, mock_ollama_class: Mock) -> None:
+        """Test that the response cache is only attached to the analysis client."""
+        llm = SurveillanceLLM(LangChainSettings(llm_cache_enabled=True))
+        llm._ensure_chain_initialized()
+
+        cache = llm.response_cache
+        assert cache is not None
+        assert "cache" not in mock_ollama_class.call_args_list[0].kwargs
+        assert mock_ollama_class.call_args_list[1].kwargs["cache"] is cache
+
+        valid = '{"camera_type": "dome", "public": true}'
+        cache.update("prompt\n", "llm", [Generation(text=valid)])
+        assert cache.lookup("prompt", "llm")[0].text == valid
+        assert cache.lookup("prompt", "other-llm") is None
+
+    def test_llm_cache_skips_invalid_responses(self) -> None:
+        """Test that malformed or invalid responses are never cached."""
+        llm = SurveillanceLLM(LangChainSettings(llm_cache_enabled=True))
+        cache = llm.response_cache
+
+        cache.update("bad-json", "llm", [Generation(text="not json")])
+        cache.update("bad-field", "llm", [Generation(text='{"public": "maybe"}')])
+        cache.update(
+            "bad-batch",
+            "llm",
+            [Generation(text='{"results": [{"public": true}, {"public": []}]}')],
+        )
+
+        assert cache.lookup("bad-json", "llm") is None
+        assert cache.lookup("bad-field", "llm") is None
+        assert cache.lookup("bad-batch", "llm") is None
+
+    def test_llm_cache_disabled_by_default(self) -> None:
+        """Test that no cache is created unless enabled in settings."""
+        llm = SurveillanceLLM(LangChainSettings())
+
+        assert llm.response_cache is None
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+from src.memory.enrich_cache import EnrichmentCache
+from src.utils.db import get_engine
+
+
+def test_put_and_get_many_roundtrip(db_settings):
+    cache = EnrichmentCache(get_engine(db_settings))
+    cache.put_many({"a": {"zone": "town"}, "b": {"public": True}})
+
+    hits = cache.get_many(["a", "b", "missing"])
+
+    assert hits == {"a": {"zone": "town"}, "b": {"public": True}}
+
+
+def test_put_many_keeps_existing_entries(db_settings):
+    cache = EnrichmentCache(get_engine(db_settings))
+    cache.put_many({"a": {"zone": "town"}})
+    cache.put_many({"a": {"zone": "shop"}, "b": {"zone": "bank"}})
+
+    assert cache.get_many(["a", "b"]) == {
+        "a": {"zone": "town"},
+        "b": {"zone": "bank"},
+    }
+
+
+def test_large_batches_are_chunked(db_settings):
+    cache = EnrichmentCache(get_engine(db_settings))
+    entries = {f"k{i}": {"i": i} for i in range(1200)}
+    cache.put_many(entries)
+
+    assert cache.get_many(entries) == entries
+
+
+def test_uses_wal_journal(db_settings):
+    engine = get_engine(db_settings)
+    EnrichmentCache(engine)
+
+    with engine.connect() as connection:
+        mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+
+    assert mode == "wal"
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from src.memory.store import MemoryStore
 from src.memory.models import Memory
 
@@ -27,3 +29,73 @@ def test_isolated_databases(tmp_path):
     st1.store("X", "s", "d")
     assert len(st1.load("X")) == 1
     assert st2.load("X") == []
+
+
+def test_find_cache_returns_newest_prefix_match(db_settings):
+    store = MemoryStore(db_settings)
+    store.store("AgentA", "enriched_cache", "abc|old.json|old.geojson")
+    store.store("AgentA", "enriched_cache", "abc|new.json|new.geojson")
+    store.store("AgentA", "other_step", "abc|x|y")
+    store.store("AgentB", "enriched_cache", "abc|b.json|b.geojson")
+
+    assert store.find_cache("AgentA", "enriched_cache", "abc") == (
+        "abc|new.json|new.geojson"
+    )
+    assert store.find_cache("AgentA", "enriched_cache", "abd") is None
+
+
+def test_find_cache_treats_prefix_literally(db_settings):
+    store = MemoryStore(db_settings)
+    store.store("AgentA", "cache", "a1b|path")
+
+    # LIKE wildcards in the prefix must not match arbitrary characters
+    assert store.find_cache("AgentA", "cache", "a_b") is None
+    assert store.find_cache("AgentA", "cache", "a%") is None
+
+
+def test_memory_index_created_on_existing_table(db_settings):
+    from sqlalchemy import inspect
+
+    store = MemoryStore(db_settings)
+    with store.engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_memory_agent_step")
+
+    reopened = MemoryStore(db_settings)
+
+    names = {ix["name"] for ix in inspect(reopened.engine).get_indexes("memory")}
+    assert "ix_memory_agent_step" in names
+
+
+def test_store_many_persists_batch(db_settings):
+    store = MemoryStore(db_settings)
+
+    memories = store.store_many(
+        [("AgentA", "step1", "data1"), ("AgentA", "step2", "data2")]
+    )
+
+    assert [m.content for m in memories] == ["data1", "data2"]
+    assert all(m.id is not None for m in memories)
+    assert {r.content for r in store.load("AgentA")} == {"data1", "data2"}
+    assert store.store_many([]) == []
+
+
+def test_put_cache_replaces_entry_for_key(db_settings):
+    store = MemoryStore(db_settings)
+    store.put_cache("AgentA", "route_cache", "k1", {"path": "old.geojson"})
+    store.put_cache("AgentA", "route_cache", "k1", {"path": "new.geojson"})
+    store.put_cache("AgentA", "other_step", "k1", {"path": "other.geojson"})
+
+    assert store.get_cache("AgentA", "route_cache", "k1") == {"path": "new.geojson"}
+    assert store.get_cache("AgentA", "other_step", "k1") == {"path": "other.geojson"}
+    assert store.get_cache("AgentB", "route_cache", "k1") is None
+    assert store.get_cache("AgentA", "route_cache", "k2") is None
+
+
+def test_get_cache_ignores_stale_entries(db_settings):
+    store = MemoryStore(db_settings)
+    store.put_cache("AgentA", "empty", "k1", {"city": "Nowhere"})
+
+    assert store.get_cache("AgentA", "empty", "k1", max_age=timedelta(hours=1)) == {
+        "city": "Nowhere"
+    }
+    assert store.get_cache("AgentA", "empty", "k1", max_age=timedelta(0)) is None
@@ -1,7 +1,13 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from src.tools.io_tools import (
+    EnrichedElementsWriter,
+    iter_overpass_elements,
+    load_json_file,
+    resolve_path,
     load_overpass_elements,
     save_enriched_elements,
     to_geojson,
@@ -41,6 +47,28 @@ def test_save_enriched_elements(tmp_path):
     assert parsed == {"elements": enriched}
 
 
+def test_enriched_writer_streams_elements(tmp_path):
+    destination = tmp_path / "city_enriched.json"
+
+    with EnrichedElementsWriter(destination) as sink:
+        for element in ELEMENTS:
+            sink.write(element)
+
+    assert json.loads(destination.read_text()) == {"elements": ELEMENTS}
+    assert not (tmp_path / "city_enriched.json.tmp").exists()
+
+
+def test_enriched_writer_discards_partial_file(tmp_path):
+    destination = tmp_path / "city_enriched.json"
+
+    with pytest.raises(RuntimeError):
+        with EnrichedElementsWriter(destination) as sink:
+            sink.write(ELEMENTS[0])
+            raise RuntimeError("boom")
+
+    assert list(tmp_path.iterdir()) == []
+
+
 def test_to_geojson_without_writing(tmp_path):
     # write an enriched JSON file with ELEMENTS
     enriched = {"elements": ELEMENTS}
@@ -61,6 +89,13 @@ def test_to_geojson_without_writing(tmp_path):
     assert feat["properties"]["a"] == 1
 
 
+def test_to_geojson_accepts_elements_in_memory(tmp_path):
+    enriched_path = tmp_path / "enriched.json"
+    enriched_path.write_text(json.dumps({"elements": ELEMENTS}), encoding="utf-8")
+
+    assert to_geojson(ELEMENTS) == to_geojson(enriched_path)
+
+
 def test_to_geojson_with_writing(tmp_path):
     enriched = {"elements": ELEMENTS}
     enriched_path = tmp_path / "data.json"
@@ -74,3 +109,50 @@ def test_to_geojson_with_writing(tmp_path):
     written = json.loads(out_geojson.read_text(encoding="utf-8"))
     assert written == geo
     assert written["type"] == "FeatureCollection"
+
+
+def test_iter_overpass_elements_streams_elements(tmp_path):
+    dump = {
+        "version": 0.6,
+        "elements": [{"id": 1, "lat": 55.5, "lon": 13.1}, {"id": 2}],
+        "remark": "trailing keys are ignored",
+    }
+    dump_path = tmp_path / "dump.json"
+    dump_path.write_text(json.dumps(dump), encoding="utf-8")
+
+    stream = iter_overpass_elements(dump_path)
+
+    first = next(stream)
+    assert first == {"id": 1, "lat": 55.5, "lon": 13.1}
+    assert isinstance(first["lat"], float)
+    assert list(stream) == [{"id": 2}]
+
+
+def test_load_overpass_elements_without_elements_key(tmp_path):
+    dump_path = tmp_path / "empty.json"
+    dump_path.write_text("{}", encoding="utf-8")
+
+    assert load_overpass_elements(dump_path) == []
+
+
+def test_resolve_path_expands_and_resolves(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+
+    assert resolve_path("~/dump.json") == tmp_path.resolve() / "dump.json"
+    assert resolve_path(Path("rel.json")) == tmp_path.resolve() / "rel.json"
+
+
+def test_load_json_file_parses_document(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"elements": ELEMENTS}), encoding="utf-8")
+
+    assert load_json_file(path) == {"elements": ELEMENTS}
+
+
+def test_load_json_file_rejects_empty_file(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+
+    with pytest.raises(json.JSONDecodeError):
+        load_json_file(path)
@@ -107,3 +107,28 @@ def test_to_hotspots_custom_parameters(geojson_file, tmp_path):
     content = json.loads(output_path.read_text(encoding="utf-8"))
     # With high min_samples, we expect no clusters
     assert len(content["features"]) == 0
+
+
+def test_to_hotspots_centroids_skip_noise(tmp_path):
+    """Test that hotspot centroids average their cluster and ignore noise"""
+    coords = [[13.0, 55.0], [13.0002, 55.0002], [13.0001, 55.0001], [14.0, 56.0]]
+    input_path = tmp_path / "points.geojson"
+    input_path.write_text(
+        json.dumps(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    {"type": "Feature", "geometry": {"type": "Point", "coordinates": c}}
+                    for c in coords
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    result = to_hotspots(input_path, tmp_path / "out.geojson", eps=1e-5, min_samples=2)
+
+    features = json.loads(result.read_text(encoding="utf-8"))["features"]
+    assert len(features) == 1
+    assert features[0]["properties"] == {"cluster_id": 0, "count": 3}
+    assert features[0]["geometry"]["coordinates"] == pytest.approx([13.0001, 55.0001])
@@ -10,13 +10,16 @@ import pytest
 from src.config.settings import RouteSettings
 from src.tools.routing_tools import (
     load_camera_points,
+    build_camera_index,
     build_pedestrian_graph,
     snap_to_graph,
     compute_shortest_path,
     generate_candidate_paths,
     compute_exposure_for_path,
+    compute_exposure_for_paths,
     build_route_geojson,
     render_route_map,
+    _calculate_path_length,
 )
 from src.config.models.route_models import RouteMetrics
 
@@ -351,6 +354,30 @@ def test_generate_candidate_paths_single_path(synthetic_graph):
     assert paths[0] == [0, 1]
 
 
+def test_generate_candidate_paths_single_candidate_is_shortest():
+    """Test that k=1 returns the shortest path, using the shortest parallel edge."""
+    G = nx.MultiDiGraph()
+    G.add_edge(0, 1, length=10.0)
+    G.add_edge(0, 1, length=1.0)
+    G.add_edge(1, 2, length=1.0)
+    G.add_edge(0, 2, length=5.0)
+
+    assert generate_candidate_paths(G, 0, 2, k=1) == [[0, 1, 2]]
+
+
+def test_generate_candidate_paths_carry_their_length(synthetic_graph, route_settings):
+    """Test that candidate paths carry the length used to score them."""
+    for k in (1, 3):
+        for path in generate_candidate_paths(synthetic_graph, 0, 8, k=k):
+            assert path.length_m == pytest.approx(
+                _calculate_path_length(synthetic_graph, path)
+            )
+            metrics = compute_exposure_for_path(
+                synthetic_graph, path, [], route_settings
+            )
+            assert metrics.length_m == path.length_m
+
+
 def test_generate_candidate_paths_more_than_available(synthetic_graph):
     """Test requesting more paths than exist."""
     # Request many paths - should return all available without error
@@ -373,6 +400,27 @@ def test_generate_candidate_paths_no_path():
         generate_candidate_paths(G, 1, 2, k=5)
 
 
+def test_generate_candidate_paths_matches_networkx_order():
+    """Candidate path weights match networkx's k-shortest simple paths."""
+    import itertools
+
+    G = nx.grid_2d_graph(4, 4).to_directed()
+    G = nx.convert_node_labels_to_integers(G)
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]["length"] = float(1 + (u * 7 + v * 3 + i) % 5)
+
+    paths = generate_candidate_paths(nx.MultiDiGraph(G), 0, 15, k=6)
+    expected = list(
+        itertools.islice(nx.shortest_simple_paths(G, 0, 15, weight="length"), 6)
+    )
+
+    def weight(path):
+        return sum(G[u][v]["length"] for u, v in zip(path, path[1:]))
+
+    assert [weight(p) for p in paths] == [weight(p) for p in expected]
+    assert len({tuple(p) for p in paths}) == len(paths)
+
+
 # Tests for compute_exposure_for_path
 
 
@@ -456,6 +504,60 @@ def test_compute_exposure_for_path_single_node(synthetic_graph, route_settings):
     assert metrics.exposure_score == 0.0
 
 
+def test_compute_exposure_for_path_uses_distance_to_segments(
+    synthetic_graph, route_settings
+):
+    """Cameras beside a segment count; cameras just past the radius do not."""
+    path = [0, 1, 2]
+    radius_deg = route_settings.buffer_radius_m / 111000.0
+    cameras = [
+        (radius_deg * 0.9, 0.005),  # Beside the middle of the first segment
+        (radius_deg * 1.1, 0.015),  # Just outside the buffer
+        (0.0, 0.02 + radius_deg * 1.1),  # Past the end of the path
+    ]
+    camera_index = build_camera_index(cameras)
+
+    metrics = compute_exposure_for_path(
+        synthetic_graph, path, cameras, route_settings, camera_index
+    )
+
+    assert len(camera_index) == 3
+    assert metrics.camera_count_near_route == 1
+
+
+def test_compute_exposure_for_paths_matches_single_path(
+    synthetic_graph, route_settings
+):
+    """Batch scoring returns the per-path metrics in input order."""
+    paths = [[0, 1, 2], [0, 3, 6], [0, 1]]
+    cameras = [(0.00, 0.00), (0.00, 0.01), (0.02, 0.00)]
+
+    batch = compute_exposure_for_paths(synthetic_graph, paths, cameras, route_settings)
+
+    assert batch == [
+        compute_exposure_for_path(synthetic_graph, path, cameras, route_settings)
+        for path in paths
+    ]
+
+
+def test_min_segment_dist_sq_is_independent_of_chunking(monkeypatch):
+    """Chunked distances match a single pass over all points."""
+    import numpy as np
+
+    from src.tools import routing_tools
+
+    rng = np.random.default_rng(0)
+    path_coords = np.cumsum(rng.normal(0, 0.001, (12, 2)), axis=0)
+    path_coords[5] = path_coords[4]  # Zero-length segment
+    points = rng.uniform(path_coords.min(0), path_coords.max(0), (101, 2))
+
+    expected = routing_tools._min_segment_dist_sq(points, path_coords)
+    monkeypatch.setattr(routing_tools, "_EXPOSURE_CHUNK_PAIRS", 30)
+    chunked = routing_tools._min_segment_dist_sq(points, path_coords)
+
+    np.testing.assert_allclose(chunked, expected)
+
+
 # Tests for build_route_geojson
 
 
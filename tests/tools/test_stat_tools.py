@@ -0,0 +1,51 @@
+import json
+from collections import Counter
+
+from src.tools.stat_tools import compute_statistics
+
+
+def _el(**analysis):
+    return {"id": 0, "analysis": analysis}
+
+
+def test_compute_statistics_counts():
+    elements = [
+        _el(public=True, sensitive=True, zone="town", operator="Police"),
+        _el(public=False, zone="shop", camera_type="dome"),
+        _el(public=True, sensitive=True, zone="town", operator="Police"),
+        _el(camera_type="dome", zone=None),
+        _el(error="LLM failed"),
+    ]
+
+    stats = compute_statistics(elements)
+
+    assert stats["total"] == 5
+    assert stats["sensitive_count"] == 2
+    assert stats["public_count"] == 2
+    assert stats["private_count"] == 1
+    assert stats["zone_counts"] == Counter({"town": 2, "shop": 1, "unknown": 2})
+    assert stats["zone_sensitivity_counts"] == Counter({"town": 2})
+    assert stats["camera_type_counts"] == Counter({"dome": 2})
+    assert stats["operator_counts"].most_common(1) == [("Police", 2)]
+
+
+def test_compute_statistics_is_json_serializable():
+    stats = compute_statistics([_el(zone="town", sensitive=True)])
+    assert json.loads(json.dumps(stats))["zone_counts"] == {"town": 1}
+
+
+def test_compute_statistics_empty():
+    stats = compute_statistics([])
+
+    assert stats["total"] == 0
+    assert stats["sensitive_count"] == 0
+    assert stats["zone_counts"] == Counter()
+    assert stats["operator_counts"] == Counter()
+
+
+def test_compute_statistics_mixed_label_types():
+    elements = [_el(operator="Police"), _el(operator=42), _el(operator="Police")]
+
+    stats = compute_statistics(elements)
+
+    assert stats["operator_counts"] == Counter({"Police": 2, 42: 1})
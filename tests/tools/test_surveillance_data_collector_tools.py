@@ -0,0 +1,99 @@
+import json
+
+import threading
+
+from langchain_core.tools import tool
+
+from src.tools.surveillance_data_collector_tools import (
+    create_batch_tool,
+    create_check_cache_tool,
+    create_save_data_tool,
+)
+from src.utils.elements import Elements
+
+
+def _save(tool, **params):
+    base = {"city": "Lund", "query": "Q", "agent_name": "ScraperAgent"}
+    return json.loads(tool.func({**base, **params}))
+
+
+def test_save_tool_writes_elements_sidecar(mem_fake, tmp_path):
+    tool = create_save_data_tool(mem_fake)
+    data = {"elements": [{"id": 1, "lat": 55.0, "lon": 13.0, "tags": {}}]}
+
+    result = _save(tool, output_dir=str(tmp_path), data_json=json.dumps(data))
+
+    assert result["elements_npz"] == str(tmp_path / "lund.npz")
+    assert Elements.load(result["elements_npz"]).ids.tolist() == [1]
+
+
+def test_save_tool_counts_cached_dump_from_sidecar(mem_fake, tmp_path):
+    tool = create_save_data_tool(mem_fake)
+    data = {"elements": [{"id": i, "lat": 55.0, "lon": 13.0} for i in range(3)]}
+    saved = _save(tool, output_dir=str(tmp_path), data_json=json.dumps(data))
+    # A dump that no longer parses proves the count came from the sidecar
+    (tmp_path / "lund.json").write_text("not json")
+
+    result = _save(tool, output_dir=str(tmp_path), filepath=saved["filepath"])
+
+    assert result["from_cache"] is True
+    assert result["elements_count"] == 3
+    assert result["elements_npz"] == saved["elements_npz"]
+
+
+def test_check_cache_tool_finds_saved_dump(mem_fake, tmp_path):
+    data = {"elements": [{"id": 1, "lat": 55.0, "lon": 13.0}]}
+    saved = _save(
+        create_save_data_tool(mem_fake),
+        output_dir=str(tmp_path),
+        data_json=json.dumps(data),
+    )
+    check = create_check_cache_tool(mem_fake)
+
+    hit = json.loads(check.func({"query": "Q", "agent_name": "ScraperAgent"}))
+    miss = json.loads(check.func({"query": "R", "agent_name": "ScraperAgent"}))
+
+    assert hit["cache_hit"] is True
+    assert hit["filepath"] == saved["filepath"]
+    assert hit["elements_count"] == 1
+    assert miss["cache_hit"] is False
+
+
+def test_batch_tool_chains_references_and_runs_independent_calls_together():
+    both_started = threading.Barrier(2, timeout=5)
+
+    @tool("first")
+    def first(tool_input):
+        """First."""
+        both_started.wait()
+        return json.dumps({"temp_file": "/tmp/x.json"})
+
+    @tool("second")
+    def second(tool_input):
+        """Second."""
+        both_started.wait()
+        return "QUERY"
+
+    @tool("echo")
+    def echo(tool_input):
+        """Echo."""
+        return json.dumps(tool_input)
+
+    batch = create_batch_tool([first, second, echo])
+    invocations = [
+        {"tool_name": "first", "arguments": {}},
+        {"tool_name": "second", "arguments": {}},
+        {"tool_name": "echo", "arguments": {"f": "$0.temp_file", "q": "$1", "x": 1}},
+        {"tool_name": "missing", "arguments": {}},
+        {"tool_name": "echo", "arguments": {"q": "$3"}},
+    ]
+
+    results = json.loads(batch.func({"invocations": invocations}))["results"]
+
+    assert results[2] == {
+        "tool_name": "echo",
+        "result": {"f": "/tmp/x.json", "q": "QUERY", "x": 1},
+    }
+    assert results[1]["result"] == "QUERY"
+    assert "Unknown tool" in results[3]["result"]["error"]
+    assert "Skipped" in results[4]["result"]["error"]
@@ -1,9 +1,8 @@
 import re
-import json
 from pathlib import Path
 
 from sqlalchemy.engine import Engine
-from src.utils.db import get_engine, summarize, query_hash, payload_hash
+from src.utils.db import get_engine, summarize, query_hash, tags_hash
 
 
 def test_get_engine_sqlite(db_settings, tmp_path):
@@ -42,14 +41,23 @@ def test_query_hash_stable_unique():
     assert re.fullmatch(r"[0-9a-f]{8}", h1a)  # 8‑char hex
 
 
-def test_payload_hash_changes_with_data():
-    d1 = {"a": 1, "b": 2}
-    d2 = {"a": 1, "b": 3}  # slight change
+def test_tags_hash_is_order_independent():
+    a = tags_hash({"man_made": "surveillance", "operator": "Police"})
+    b = tags_hash({"operator": "Police", "man_made": "surveillance"})
+    assert a == b
+    assert re.fullmatch(r"[0-9a-f]{32}", a)
+    assert tags_hash({"operator": "Other"}) != a
 
-    h1a = payload_hash(d1)
-    h1b = payload_hash(json.loads(json.dumps(d1)))  # same semantics
-    h2 = payload_hash(d2)
 
-    assert h1a == h1b  # deterministic
-    assert h1a != h2  # reflects data change
-    assert len(h1a) == 64  # full SHA‑256 hex
+def test_get_engine_only_passes_sqlite_connect_args(monkeypatch):
+    from src.config.settings import DatabaseSettings
+    from src.utils import db
+
+    calls = []
+    monkeypatch.setattr(db, "create_engine", lambda url, **kw: calls.append(kw))
+
+    db.get_engine(DatabaseSettings(url="sqlite:///memory.db"))
+    db.get_engine(DatabaseSettings(url="postgresql://user@localhost/tasks"))
+
+    assert calls[0]["connect_args"] == {"check_same_thread": False}
+    assert calls[1]["connect_args"] == {}
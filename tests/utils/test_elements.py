@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.utils.elements import Elements
+
+
+def test_from_overpass_builds_columns():
+    data = {
+        "elements": [
+            {"id": 1, "lat": 55.0, "lon": 13.0, "tags": {"man_made": "surveillance"}},
+            {"id": 2, "tags": {}},
+            {"id": 3, "lat": 56.0, "lon": 14.0, "tags": {"man_made": "surveillance"}},
+        ]
+    }
+
+    cols = Elements.from_overpass(data)
+
+    assert len(cols) == 3
+    assert cols.ids.tolist() == [1, 2, 3]
+    assert cols.has_coords.tolist() == [True, False, True]
+    assert np.isnan(cols.lat[1])
+    assert cols.kinds == ("", "surveillance")
+    assert cols.kind_names() == ["surveillance", "", "surveillance"]
+
+
+def test_from_elements_handles_empty_input():
+    cols = Elements.from_elements([])
+
+    assert len(cols) == 0
+    assert cols.has_coords.tolist() == []
@@ -8,6 +8,7 @@ from src.utils.overpass import (
     nominatim_city,
 )
 from src.tools.io_tools import save_overpass_dump
+from src.utils.db import file_hash
 from tests.conftest import _DummyResp
 
 
@@ -54,6 +55,23 @@ def test_build_query_contains_area(monkeypatch, ovp_settings):
     assert '"man_made"="surveillance"' in q
 
 
+def test_build_query_resolves_city_once(monkeypatch, ovp_settings):
+    import src.utils.overpass as ovp
+
+    calls = []
+    ovp._cached_area_id.cache_clear()
+    monkeypatch.setattr(
+        ovp, "nominatim_city", lambda *a, **k: calls.append(a) or (7, "relation")
+    )
+
+    first = build_query("Baz", country="SE", settings=ovp_settings)
+    second = build_query("Baz", country="SE", settings=ovp_settings)
+    build_query("Baz", country="NO", settings=ovp_settings)
+
+    assert first == second
+    assert len(calls) == 2
+
+
 def test_run_query_success(patch_requests, ovp_settings):
     patch_requests["post"] = _DummyResp(
         status_code=200, _text='{"elements": [{"id": 1}]}'
@@ -66,7 +84,52 @@ def test_run_query_success(patch_requests, ovp_settings):
     assert data == {"elements": [{"id": 1}]}
 
 
+def test_stream_query_to_file_writes_and_hashes(
+    monkeypatch, patch_requests, ovp_settings, tmp_path
+):
+    body = '{"elements": [{"id": 1}, {"id": 2}]}'
+    patch_requests["post"] = _DummyResp(status_code=200, _text=body)
+
+    import src.utils.overpass as ovp
+
+    monkeypatch.setattr(ovp, "_STREAM_CHUNK_SIZE", 8)
+    path, digest = ovp.stream_query_to_file(
+        "dummy", tmp_path / "out" / "dump.json.part", settings=ovp_settings
+    )
+
+    assert path.read_text() == body
+    assert digest == file_hash(body.encode("utf-8"))
+
+
 def test_save_json_roundtrip(tmp_path):
     fp = save_overpass_dump({"foo": 1}, "Foo City", tmp_path)
     assert fp.exists()
     assert fp.read_text() == json.dumps({"foo": 1}, indent=2)
+
+
+def test_http_session_is_shared():
+    """Every Overpass request goes through one pooled session."""
+    from src.utils.overpass import http_session
+
+    session = http_session()
+    assert http_session() is session
+    assert session.get_adapter("https://overpass-api.de")._pool_maxsize == 20
+
+
+def test_build_query_does_not_cache_failed_lookups(monkeypatch, ovp_settings):
+    import src.utils.overpass as ovp
+
+    results = iter([RuntimeError("Nominatim down"), (8, "relation")])
+
+    def flaky(*_a, **_k):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    ovp._cached_area_id.cache_clear()
+    monkeypatch.setattr(ovp, "nominatim_city", flaky)
+
+    with pytest.raises(RuntimeError, match="Failed to construct query"):
+        build_query("Qux", settings=ovp_settings)
+    assert "area(3600000008)" in build_query("Qux", settings=ovp_settings)
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from src.utils.scheduler import run_step_graph
+
+
+def test_independent_steps_run_concurrently():
+    # Both steps must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=2)
+    steps = {"a": barrier.wait, "b": barrier.wait}
+
+    outcomes = run_step_graph(steps, {})
+
+    assert outcomes == {"a": None, "b": None}
+
+
+def test_dependencies_run_in_order():
+    order = []
+    steps = {name: (lambda n=name: order.append(n)) for name in "abc"}
+
+    run_step_graph(steps, {"b": {"a"}, "c": {"b"}})
+
+    assert order == ["a", "b", "c"]
+
+
+def test_failed_step_skips_dependents():
+    ran = []
+
+    def boom():
+        raise ValueError("nope")
+
+    steps = {
+        "a": boom,
+        "b": lambda: ran.append("b"),
+        "c": lambda: ran.append("c"),
+        "d": lambda: ran.append("d"),
+    }
+
+    outcomes = run_step_graph(steps, {"b": {"a"}, "c": {"b"}})
+
+    assert isinstance(outcomes["a"], ValueError)
+    assert "b" not in outcomes and "c" not in outcomes
+    assert ran == ["d"]
+
+
+@pytest.mark.parametrize("deps", [{"b": {"missing"}}, {"b": {"a", "missing"}}])
+def test_missing_dependency_skips_step(deps):
+    ran = []
+    steps = {"a": lambda: ran.append("a"), "b": lambda: ran.append("b")}
+
+    outcomes = run_step_graph(steps, deps)
+
+    assert ran == ["a"]
+    assert "b" not in outcomes